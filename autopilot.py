@@ -14,6 +14,7 @@ from modules.topic_generator import topic_generator
 from modules.budget_controller import budget
 from modules.humanizer import humanizer
 from modules.metadata_optimizer import metadata_optimizer
+from modules.script_generator import script_generator
 from generate_video import generate_video
 
 try:
@@ -21,7 +22,16 @@ try:
 except:
     thumbnail_creator = None
 
-def create_and_publish_video():
+# Topics whose scripts were generated ahead of time: (topic_data, script)
+script_backlog = []
+
+def fill_script_backlog(count: int):
+    """Reserve the next topics and generate their scripts in one batch."""
+    topics = [topic_generator.get_next_topic() for _ in range(count)]
+    scripts = script_generator.generate_many([topic["title"] for topic in topics])
+    script_backlog.extend(zip(topics, scripts))
+
+def create_and_publish_video(batch_size: int = 1):
     """Create and potentially publish a video automatically."""
     
     print("\n" + "=" * 60)
@@ -44,15 +54,21 @@ def create_and_publish_video():
         return True
     
     try:
-        # Get next topic
-        topic_data = topic_generator.get_next_topic()
+        # Get next topic (scripts for upcoming runs are generated in one batch)
+        if not script_backlog and batch_size > 1:
+            fill_script_backlog(batch_size)
+        
+        if script_backlog:
+            topic_data, script = script_backlog.pop(0)
+        else:
+            topic_data, script = topic_generator.get_next_topic(), None
         topic = topic_data["title"]
         
         print(f"\n🎯 Tópico selecionado: {topic}")
         print(f"   Categoria: {topic_data.get('category', 'N/A')}")
         
         # Generate video
-        video_path = generate_video(topic)
+        video_path = generate_video(topic, script=script)
         
         if not video_path:
             print("\n⚠️  Vídeo não gerado completamente (falta MoviePy)")
@@ -115,7 +131,7 @@ def run_autopilot(videos_per_day: int = 2, post_times: list = None):
     for post_time in post_times[:videos_per_day]:
         # Apply humanization to post time
         randomized_time = humanizer.get_random_post_time(post_time)
-        schedule.every().day.at(randomized_time).do(create_and_publish_video)
+        schedule.every().day.at(randomized_time).do(create_and_publish_video, batch_size=videos_per_day)
         print(f"   ✓ Agendado para {randomized_time}")
     
     # Check topics and generate if needed
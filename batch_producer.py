@@ -10,32 +10,11 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from generate_video import generate_video
 from modules.budget_controller import budget
+from modules.script_generator import script_generator
 from modules.humanizer import humanizer
+from config.topics import TOPIC_IDEAS
 import time
 
-# Topic ideas for curiosidades obscuras
-TOPIC_IDEAS = [
-    "Por que o céu é azul durante o dia mas vermelho no pôr do sol",
-    "A verdade sobre beber 8 copos de água por dia",
-    "Como os gatos sempre caem de pé",
-    "Por que o sal derrete o gelo",
-    "O mistério da zona morta do oceano",
-    "Como funcionam os sonhos lúcidos",
-    "O que causa a aurora boreal",
-    "Por que temos impressões digitais únicas",
-    "Como as abelhas fazem mel",
-    "O segredo das pirâmides do Egito",
-    "Por que ficamos com soluço",
-    "Como funciona a memória fotográfica",
-    "O mistério do Triângulo das Bermudas",
-    "Por que sentimos calafrios ao ouvir música",
-    "Como os camaleões mudam de cor",
-    "O que acontece quando desmaiamos",
-    "Por que o espaço é silencioso",
-    "Como as plantas carnívoras capturam presas",
-    "O fenômeno da déjà vu",
-    "Por que choramos quando cortamos cebola"
-]
 
 def batch_produce(count: int, delay_between: bool = True):
     """
@@ -52,10 +31,13 @@ def batch_produce(count: int, delay_between: bool = True):
     # Shuffle topics
     topics = random.sample(TOPIC_IDEAS, min(count, len(TOPIC_IDEAS)))
     
+    # Scripts for the whole batch up front (several topics per LLM request)
+    scripts = script_generator.generate_many(topics) if len(topics) > 1 else [None] * len(topics)
+    
     generated = []
     failed = []
     
-    for i, topic in enumerate(topics, 1):
+    for i, (topic, script) in enumerate(zip(topics, scripts), 1):
         print(f"\n\n{'='*60}")
         print(f"📹 VÍDEO {i}/{count}")
         print(f"{'='*60}\n")
@@ -77,7 +59,7 @@ def batch_produce(count: int, delay_between: bool = True):
         
         try:
             # Generate video
-            video_path = generate_video(topic, output_filename=f"batch_{i:03d}.mp4")
+            video_path = generate_video(topic, output_filename=f"batch_{i:03d}.mp4", script=script)
             
             if video_path:
                 generated.append(video_path)
@@ -3,10 +3,15 @@ Prompt templates for GPT-based script generation.
 Optimized for retention and cost efficiency.
 """
 
-SCRIPT_GENERATION_PROMPT = """Você é um roteirista especializado em YouTube Shorts e TikTok viral no nicho de curiosidades obscuras e fatos curiosos.
+# Bump when a script prompt change should invalidate cached scripts
+SCRIPT_PROMPT_VERSION = 1
 
-TAREFA: Crie um roteiro de EXATAMENTE {duration} segundos sobre o seguinte tópico:
-"{topic}"
+# Long prompts are split into a static prefix (sent as the system prompt /
+# cached context, identical on every call) and a short dynamic suffix.
+
+SCRIPT_SYSTEM_PROMPT = """Você é um roteirista especializado em YouTube Shorts e TikTok viral no nicho de curiosidades obscuras e fatos curiosos.
+
+Para cada pedido, crie um roteiro com EXATAMENTE a duração pedida sobre o tópico indicado.
 
 ESTRUTURA OBRIGATÓRIA:
 
@@ -35,20 +40,64 @@ REGRAS:
 - NUNCA mencione "curta" ou "inscreva-se" explicitamente
 
 FORMATO DE SAÍDA (JSON):
-{{
+{
   "hook": "texto do hook (10-15 palavras)",
   "body": "texto do corpo principal (80-100 palavras)",
   "outro": "conclusão (10-15 palavras)",
   "visual_keywords": ["palavra1", "palavra2", "palavra3"],
-  "duration_estimate": {duration}
-}}
+  "duration_estimate": duração pedida, em segundos
+}
 
-IMPORTANTE: O roteiro deve ser lido em {duration} segundos em ritmo natural de fala.
+IMPORTANTE: O roteiro deve ser lido na duração pedida em ritmo natural de fala.
 """
 
-TOPIC_GENERATION_PROMPT = """Você é um especialista em conteúdo viral para YouTube Shorts e TikTok no nicho de curiosidades obscuras.
+SCRIPT_TASK_PROMPT = """TAREFA: Crie um roteiro de EXATAMENTE {duration} segundos sobre o seguinte tópico:
+"{topic}"
 
-TAREFA: Gere {count} ideias de tópicos ÚNICOS e VIRAIS sobre curiosidades que poucas pessoas conhecem.
+IMPORTANTE: O roteiro deve ser lido em {duration} segundos ("duration_estimate": {duration}).
+"""
+
+# Appended to SCRIPT_TASK_PROMPT when a near-duplicate topic has a script
+SCRIPT_SEED_SUFFIX = """
+ROTEIRO DE REFERÊNCIA (tópico muito parecido, já publicado):
+{seed}
+
+Use-o apenas como base de pesquisa: escreva um roteiro NOVO, com hook, frases e ângulo diferentes.
+"""
+
+# Appended to SCRIPT_SYSTEM_PROMPT for batched requests, so single and batch
+# calls share one set of instructions (and the same cacheable prefix)
+BATCH_SCRIPT_FORMAT = """
+PEDIDOS EM LOTE:
+Quando vários tópicos forem pedidos de uma vez, crie um roteiro independente para cada um, com a duração indicada para o seu tópico (o corpo ocupa a maior parte dela, ~2 palavras por segundo). Não repita hooks ou outros entre os roteiros.
+
+FORMATO DE SAÍDA EM LOTE (JSON), um item por tópico com o mesmo "id":
+{
+  "scripts": [
+    {
+      "id": 1,
+      "hook": "texto do hook (10-15 palavras)",
+      "body": "texto do corpo principal",
+      "outro": "conclusão (10-15 palavras)",
+      "visual_keywords": ["palavra1", "palavra2", "palavra3"],
+      "duration_estimate": duração pedida para o tópico, em segundos
+    }
+  ]
+}
+"""
+
+BATCH_SCRIPT_SYSTEM_PROMPT = SCRIPT_SYSTEM_PROMPT + BATCH_SCRIPT_FORMAT
+
+BATCH_SCRIPT_TASK_PROMPT = """TAREFA: Crie {count} roteiros, um para cada tópico abaixo, cada um com EXATAMENTE a duração indicada:
+{items}
+"""
+
+# One line per topic in BATCH_SCRIPT_TASK_PROMPT
+BATCH_SCRIPT_ITEM = '{id}. "{topic}" ({duration} segundos)'
+
+TOPIC_SYSTEM_PROMPT = """Você é um especialista em conteúdo viral para YouTube Shorts e TikTok no nicho de curiosidades obscuras.
+
+Sua tarefa é gerar ideias de tópicos ÚNICOS e VIRAIS sobre curiosidades que poucas pessoas conhecem.
 
 CRITÉRIOS:
 - Deve ser surpreendente e contra intuitivo
@@ -66,25 +115,25 @@ CATEGORIAS (varie entre elas):
 - Animais raros
 
 FORMATO DE SAÍDA (JSON):
-{{
+{
   "topics": [
-    {{
+    {
       "title": "título curto do tópico",
       "category": "categoria",
       "hook_suggestion": "sugestão de gancho"
-    }}
+    }
   ]
-}}
+}
 
 Gere tópicos que você NUNCA viu em outros canais.
 """
 
-METADATA_OPTIMIZATION_PROMPT = """Você é um especialista em SEO para YouTube Shorts e TikTok.
+TOPIC_TASK_PROMPT = """TAREFA: Gere {count} ideias de tópicos.
+"""
 
-TAREFA: Crie metadados otimizados para o seguinte vídeo:
+METADATA_SYSTEM_PROMPT = """Você é um especialista em SEO para YouTube Shorts e TikTok.
 
-ROTEIRO:
-{script}
+Sua tarefa é criar metadados otimizados para o roteiro de vídeo enviado.
 
 GERE:
 
@@ -110,16 +159,22 @@ GERE:
    - Relevantes para busca
 
 FORMATO DE SAÍDA (JSON):
-{{
+{
   "title": "título otimizado",
   "description": "descrição otimizada",
   "hashtags": ["#tag1", "#tag2"],
   "tags": ["keyword1", "keyword2"]
-}}
+}
 
 IMPORTANTE: Seja criativo e único. Evite títulos genéricos.
 """
 
+METADATA_TASK_PROMPT = """TAREFA: Crie metadados otimizados para o seguinte vídeo:
+
+ROTEIRO:
+{script}
+"""
+
 # Hook templates para variação
 HOOK_TEMPLATES = [
     "Você sabia que {fact}?",
@@ -27,6 +27,7 @@ class Settings:
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
     ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY", "")
     ELEVENLABS_VOICE_ID = os.getenv("ELEVENLABS_VOICE_ID", "ErXwobaYiN019PkySvjV")
+    ELEVENLABS_API_BASE = os.getenv("ELEVENLABS_API_BASE", "https://api.elevenlabs.io").rstrip("/")
     PEXELS_API_KEY = os.getenv("PEXELS_API_KEY", "")
     PIXABAY_API_KEY = os.getenv("PIXABAY_API_KEY", "")
     GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
@@ -52,6 +53,9 @@ class Settings:
     VIDEO_WIDTH = int(os.getenv("VIDEO_WIDTH", "1080"))
     VIDEO_HEIGHT = int(os.getenv("VIDEO_HEIGHT", "1920"))
     VIDEO_FPS = int(os.getenv("VIDEO_FPS", "30"))
+    VIDEO_EDITOR = os.getenv("VIDEO_EDITOR", "auto")  # auto, ffmpeg, moviepy
+    EDITOR_PROFILE = os.getenv("EDITOR_PROFILE", "default")
+    EDITOR_CALIBRATION_SECONDS = float(os.getenv("EDITOR_CALIBRATION_SECONDS", "2"))
     
     # Niche
     DEFAULT_NICHE = os.getenv("DEFAULT_NICHE", "curiosidades_obscuras")
@@ -73,17 +77,77 @@ class Settings:
     TARGET_MONTHLY_REVENUE = float(os.getenv("TARGET_MONTHLY_REVENUE", "1000"))
     ENABLE_AB_TESTING = os.getenv("ENABLE_AB_TESTING", "true").lower() == "true"
     
+    # HTTP client (shared pools for REST providers)
+    HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+    HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "60"))
+    HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+    HTTP_BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", "0.5"))
+    HTTP_MAX_RETRY_AFTER = float(os.getenv("HTTP_MAX_RETRY_AFTER", "30"))
+    HTTP_MAX_PER_HOST = int(os.getenv("HTTP_MAX_PER_HOST", "4"))
+    
+    # Rate governor (shared provider quotas across processes)
+    RATE_GOVERNOR_ENABLED = os.getenv("RATE_GOVERNOR_ENABLED", "true").lower() == "true"
+    RATE_GOVERNOR_MAX_WAIT = float(os.getenv("RATE_GOVERNOR_MAX_WAIT", "60"))
+    
     # Cost Optimization
     ECONOMY_MODE = os.getenv("ECONOMY_MODE", "true").lower() == "true"
     CACHE_AGGRESSIVE = os.getenv("CACHE_AGGRESSIVE", "true").lower() == "true"
+    AUDIO_CACHE_MAX_MB = float(os.getenv("AUDIO_CACHE_MAX_MB", "500"))
+    SCRIPT_CACHE_TTL_DAYS = float(os.getenv("SCRIPT_CACHE_TTL_DAYS", "90"))  # 0 = never expire
+    # First backoff (seconds) after a provider returns an invalid script for a topic; doubles per failure
+    SCRIPT_FAILURE_BACKOFF = float(os.getenv("SCRIPT_FAILURE_BACKOFF", "300"))
     MAX_DAILY_SPEND = float(os.getenv("MAX_DAILY_SPEND", "5.00"))
     MAX_MONTHLY_SPEND = float(os.getenv("MAX_MONTHLY_SPEND", "50.00"))
     WARN_AT_BUDGET_PERCENT = int(os.getenv("WARN_AT_BUDGET_PERCENT", "70"))
     
     # API Provider Priority
     SCRIPT_PROVIDER = os.getenv("SCRIPT_PROVIDER", "gemini,openrouter,openai").split(",")
+    # Near-duplicate topics: "reuse" the cached script, use it as a "seed", or "off"
+    SCRIPT_SIMILAR_MODE = os.getenv("SCRIPT_SIMILAR_MODE", "reuse").lower()
+    SCRIPT_SIMILARITY_THRESHOLD = float(os.getenv("SCRIPT_SIMILARITY_THRESHOLD", "0.75"))
+    # Cached scripts written for up to this many seconds more/less are reused (narration is fitted)
+    SCRIPT_DURATION_TOLERANCE = int(os.getenv("SCRIPT_DURATION_TOLERANCE", "5"))
+    # Stream LLM responses so narration/asset search start before the script is complete
+    SCRIPT_STREAMING = os.getenv("SCRIPT_STREAMING", "true").lower() == "true"
+    # Hedging: if the provider is slower than its p90, also ask the next cheapest one
+    SCRIPT_HEDGING = os.getenv("SCRIPT_HEDGING", "false").lower() == "true"
+    SCRIPT_HEDGE_MAX_RATE = float(os.getenv("SCRIPT_HEDGE_MAX_RATE", "0.1"))
+    # Pre-TTS lint: predicted narration must fit the target duration, the hook must be short
+    SCRIPT_LINT = os.getenv("SCRIPT_LINT", "true").lower() == "true"
+    SCRIPT_LINT_MIN_RATIO = float(os.getenv("SCRIPT_LINT_MIN_RATIO", "0.7"))  # Shorter = rejected
+    SCRIPT_LINT_MAX_RATIO = float(os.getenv("SCRIPT_LINT_MAX_RATIO", "1.25"))  # Longer = body trimmed
+    SCRIPT_HOOK_MAX_WORDS = int(os.getenv("SCRIPT_HOOK_MAX_WORDS", "20"))
+    SCRIPT_BATCH_SIZE = int(os.getenv("SCRIPT_BATCH_SIZE", "5"))  # Topics per LLM request in generate_many
+    SCRIPT_BATCH_RETRIES = int(os.getenv("SCRIPT_BATCH_RETRIES", "1"))
     TTS_PROVIDER = os.getenv("TTS_PROVIDER", "google,elevenlabs_free,elevenlabs_paid").split(",")
     
+    # Chunked narration (sentences synthesized in parallel, then stitched)
+    TTS_CHUNKED = os.getenv("TTS_CHUNKED", "false").lower() == "true"
+    TTS_MAX_CONCURRENCY = int(os.getenv("TTS_MAX_CONCURRENCY", "4"))
+    TTS_CHUNK_GAP_MS = int(os.getenv("TTS_CHUNK_GAP_MS", "120"))
+    TTS_CHUNK_CROSSFADE_MS = int(os.getenv("TTS_CHUNK_CROSSFADE_MS", "0"))
+    # Reuse cached hook/outro phrases and synthesize only novel text
+    TTS_PHRASE_CACHE = os.getenv("TTS_PHRASE_CACHE", "true").lower() == "true"
+    
+    # Narration time-fitting (silence trimming + atempo to the target duration)
+    NARRATION_FIT = os.getenv("NARRATION_FIT", "true").lower() == "true"
+    NARRATION_MAX_PAUSE_MS = int(os.getenv("NARRATION_MAX_PAUSE_MS", "400"))
+    NARRATION_FIT_TOLERANCE = float(os.getenv("NARRATION_FIT_TOLERANCE", "0.03"))
+    NARRATION_MIN_TEMPO = float(os.getenv("NARRATION_MIN_TEMPO", "0.95"))
+    NARRATION_MAX_TEMPO = float(os.getenv("NARRATION_MAX_TEMPO", "1.25"))
+    
+    # Local offline TTS (provider "local" in TTS_PROVIDER)
+    LOCAL_TTS_ENGINE = os.getenv("LOCAL_TTS_ENGINE", "espeak-ng")
+    LOCAL_TTS_VOICE = os.getenv("LOCAL_TTS_VOICE", "pt-br")
+    LOCAL_TTS_RATE = int(os.getenv("LOCAL_TTS_RATE", "165"))  # Words per minute
+    LOCAL_TTS_WORKERS = int(os.getenv("LOCAL_TTS_WORKERS", "0"))  # 0 = one per CPU
+    
+    # TTS routing (cheapest provider within latency/quota, circuit breaker)
+    TTS_MAX_LATENCY_SECONDS = float(os.getenv("TTS_MAX_LATENCY_SECONDS", "30"))
+    TTS_BREAKER_FAILURES = int(os.getenv("TTS_BREAKER_FAILURES", "3"))
+    TTS_BREAKER_COOLDOWN = int(os.getenv("TTS_BREAKER_COOLDOWN", "600"))
+    TTS_BREAKER_PROBE_TIMEOUT = int(os.getenv("TTS_BREAKER_PROBE_TIMEOUT", "120"))
+    
     # Humanization
     STEALTH_MODE = os.getenv("STEALTH_MODE", "false").lower() == "true"
     RANDOMIZE_POST_TIME = os.getenv("RANDOMIZE_POST_TIME", "true").lower() == "true"
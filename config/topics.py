@@ -0,0 +1,41 @@
+"""
+Built-in topic lists (batch production ideas and offline fallback topics).
+"""
+
+# Topic ideas for curiosidades obscuras
+TOPIC_IDEAS = [
+    "Por que o céu é azul durante o dia mas vermelho no pôr do sol",
+    "A verdade sobre beber 8 copos de água por dia",
+    "Como os gatos sempre caem de pé",
+    "Por que o sal derrete o gelo",
+    "O mistério da zona morta do oceano",
+    "Como funcionam os sonhos lúcidos",
+    "O que causa a aurora boreal",
+    "Por que temos impressões digitais únicas",
+    "Como as abelhas fazem mel",
+    "O segredo das pirâmides do Egito",
+    "Por que ficamos com soluço",
+    "Como funciona a memória fotográfica",
+    "O mistério do Triângulo das Bermudas",
+    "Por que sentimos calafrios ao ouvir música",
+    "Como os camaleões mudam de cor",
+    "O que acontece quando desmaiamos",
+    "Por que o espaço é silencioso",
+    "Como as plantas carnívoras capturam presas",
+    "O fenômeno da déjà vu",
+    "Por que choramos quando cortamos cebola"
+]
+
+# Used by TopicGenerator when no LLM is available
+FALLBACK_TOPICS = [
+    {"title": "Por que o céu é azul", "category": "Ciência", "hook_suggestion": "Você sabe por que o céu muda de cor?"},
+    {"title": "Como os gatos sempre caem de pé", "category": "Natureza", "hook_suggestion": "Esse truque dos gatos vai te surpreender"},
+    {"title": "O mistério do Triângulo das Bermudas", "category": "Mistério", "hook_suggestion": "A verdade sobre o Triângulo das Bermudas"},
+    {"title": "Por que temos impressões digitais únicas", "category": "Corpo Humano", "hook_suggestion": "Você sabia que suas digitais são únicas?"},
+    {"title": "Como funciona a aurora boreal", "category": "Espaço", "hook_suggestion": "O fenômeno mais bonito da natureza"},
+    {"title": "A verdade sobre sonhos lúcidos", "category": "Mente", "hook_suggestion": "Controle seus sonhos com esta técnica"},
+    {"title": "Por que o sal derrete o gelo", "category": "Química", "hook_suggestion": "A ciência por trás do derretimento"},
+    {"title": "Como as plantas carnívoras capturam presas", "category": "Natureza", "hook_suggestion": "Plantas que comem insetos!"},
+    {"title": "O fenômeno da déjà vu", "category": "Mente", "hook_suggestion": "Por que sentimos que já vivemos isso?"},
+    {"title": "Como os camaleões mudam de cor", "category": "Animais", "hook_suggestion": "O segredo da camuflagem perfeita"}
+]
@@ -17,6 +17,8 @@ except ImportError:
 
 from modules.budget_controller import budget
 from modules.topic_generator import topic_generator
+from modules.narration_cache import narration_cache
+from modules.script_store import script_store
 from config.settings import settings
 
 app = Flask(__name__)
@@ -166,6 +168,12 @@ DASHBOARD_HTML = """
                 <div class="label">Arquivos de áudio</div>
             </div>
             
+            <div class="card">
+                <h2>Roteiros em Cache</h2>
+                <div class="value" id="scripts">{{ stats.scripts }}</div>
+                <div class="label">{{ stats.script_hits }} reaproveitamento(s)</div>
+            </div>
+            
             <div class="card">
                 <h2>Vídeos de Fundo</h2>
                 <div class="value" id="backgrounds">{{ stats.backgrounds }}</div>
@@ -257,15 +265,10 @@ def index():
                     "date": f.stat().st_mtime
                 })
     
-    # Get audio files
-    audio_dir = settings.DATA_DIR / "audio_cache"
-    audio_files = []
-    if audio_dir.exists():
-        for f in audio_dir.glob("*.mp3"):
-            audio_files.append({
-                "name": f.name,
-                "size_mb": f.stat().st_size / 1024 / 1024
-            })
+    # Get audio files (from the cache index, no directory scan)
+    audio_files = narration_cache.list_entries(limit=100)
+    audio_stats = narration_cache.get_stats()
+    script_stats = script_store.get_stats()
     
     # Get video files
     video_dir = settings.TEMP_DIR / "videos"
@@ -283,7 +286,9 @@ def index():
     
     stats = {
         "videos": len(generated_videos),
-        "narrations": len(audio_files),
+        "narrations": audio_stats["count"],
+        "scripts": script_stats["valid"],
+        "script_hits": script_stats["hits"],
         "backgrounds": len(video_files),
         "cost": report["total_cost"],
         "remaining": report["remaining_budget"]
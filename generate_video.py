@@ -2,35 +2,46 @@
 Complete video generator - orchestrates all modules to create final video.
 """
 
+import math
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
 
 from modules.script_generator import script_generator
+from modules.script_linter import ScriptTooShort, script_linter
+from modules.script_store import script_store
 from modules.voice_narrator import voice_narrator
+from modules.narration_fitter import narration_fitter
+from modules.narration_cache import narration_cache
+from modules.duration_predictor import duration_predictor
 from modules.asset_manager import asset_manager
 from modules.budget_controller import budget
 from modules.humanizer import humanizer
+from modules.editor_backends import editor_registry
+from config.settings import settings
 
-try:
-    from modules.ffmpeg_video_editor import ffmpeg_video_editor
-    video_editor = ffmpeg_video_editor
-except:
-    video_editor = None
+def _video_count(script: dict) -> int:
+    """Background clips for a script: roughly one per 20s of predicted narration."""
+    return max(3, math.ceil(voice_narrator.predict_duration(script) / 20))
 
-try:
-    from modules.video_editor import video_editor as moviepy_editor
-except:
-    moviepy_editor = None
-
-def generate_video(topic: str, output_filename: str = None) -> Path:
+def generate_video(
+    topic: str,
+    output_filename: str = None,
+    editor: str = None,
+    recalibrate: bool = False,
+    script: dict = None
+) -> Path:
     """
     Generate complete video from topic.
     
     Args:
         topic: Video topic/curiosity
         output_filename: Custom output filename
+        editor: Editor backend ("auto", "ffmpeg", "moviepy"); defaults to VIDEO_EDITOR
+        recalibrate: Re-run the editor benchmark instead of using cached results
+        script: Pre-generated script (e.g. from generate_many); generated if None
     
     Returns:
         Path to generated video
@@ -48,33 +59,104 @@ def generate_video(topic: str, output_filename: str = None) -> Path:
         raise Exception("Budget limit reached")
     
     try:
-        # Step 1: Generate script
+        # Step 1: Generate script. While it streams, the hook goes to TTS
+        # and the asset search starts as soon as the keywords arrive.
         print("📝 PASSO 1: Geração de Roteiro")
         print("-" * 60)
-        script = script_generator.generate(topic)
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            early = {}
+            fields = {}
+            
+            def on_field(field, value):
+                fields[field] = value
+                if field == "hook" and "hook" not in early and not script_linter.hook_problems(value):
+                    print("   🔊 Hook recebido: narração antecipada iniciada")
+                    early["hook"] = executor.submit(voice_narrator.prepare_hook, value)
+                elif field == "visual_keywords" and "assets" not in early and all(
+                    key in fields for key in ("hook", "body", "outro")
+                ):
+                    print("   🎥 Palavras-chave recebidas: busca de assets iniciada")
+                    early["keywords"] = value
+                    early["assets"] = executor.submit(
+                        asset_manager.get_background_videos, value, count=_video_count(fields)
+                    )
+            
+            if script is None:
+                streaming = on_field if settings.SCRIPT_STREAMING else None
+                script = script_generator.generate(topic, on_field=streaming)
+            
+            print(f"✅ Roteiro gerado:")
+            print(f"   Hook: {script['hook'][:50]}...")
+            print(f"   Duração: {script.get('duration_estimate', 50)}s\n")
+            
+            # Steps 2 and 3 run in parallel: assets are sized from the predicted
+            # narration length while TTS runs. Scripts that can't fit the target
+            # are trimmed, replaced or rejected here, before any TTS credits are spent.
+            if settings.SCRIPT_LINT:
+                try:
+                    script, predicted = script_linter.lint(script)
+                except ScriptTooShort as e:
+                    # Ask for a new script once; if that fails too, narrate the short one
+                    print(f"⚠️ {e}: gerando novo roteiro")
+                    script, predicted = e.script, e.predicted
+                    try:
+                        script, predicted = script_linter.lint(script_generator.generate(
+                            topic, script.get("target_duration"), use_cache=False
+                        ))
+                    except Exception as retry_error:
+                        print(f"⚠️ Novo roteiro descartado ({retry_error}), usando o anterior")
+                except ValueError:
+                    # Malformed or oversized: don't serve it from the cache again
+                    if script.get("cache_id"):
+                        script_store.discard(script["cache_id"])
+                    raise
+            else:
+                predicted = voice_narrator.predict_duration(script)
+            print(f"🔮 Duração prevista da narração: {predicted:.1f}s\n")
+            
+            def narrate():
+                # Let the early hook synthesis land in the cache first
+                hook_future = early.get("hook")
+                if hook_future:
+                    try:
+                        hook_future.result()
+                    except Exception as e:
+                        print(f"⚠️ Narração antecipada do hook falhou: {e}")
+                return voice_narrator.generate(script)
+            
+            print("🔊 PASSO 2: Geração de Narração (em paralelo)")
+            print("-" * 60)
+            narration_future = executor.submit(narrate)
+            
+            print("🎥 PASSO 3: Download de Assets")
+            print("-" * 60)
+            keywords = script.get('visual_keywords', ['curiosidade'])
+            if "assets" in early and early["keywords"] == keywords:
+                background_videos = early["assets"].result()
+            else:
+                background_videos = asset_manager.get_background_videos(keywords, count=_video_count(script))
+            background_music = asset_manager.get_background_music(mood='lofi')
+            
+            print(f"✅ {len(background_videos)} vídeos de fundo obtidos")
+            print(f"✅ Música de fundo: {background_music.name}\n")
+            
+            narration_path = narration_future.result()
         
-        print(f"✅ Roteiro gerado:")
-        print(f"   Hook: {script['hook'][:50]}...")
-        print(f"   Duração: {script.get('duration_estimate', 50)}s\n")
+        # Feed the measured duration back into the predictor
+        narration_full_text = f"{script['hook']} {script['body']} {script['outro']}"
+        entry = narration_cache.describe(narration_path)
+        if entry and entry["duration"]:
+            duration_predictor.observe(narration_full_text, entry["provider"], entry["voice"], entry["duration"])
+            print(f"📏 Narração: {entry['duration']:.1f}s (previsto {predicted:.1f}s)")
         
-        # Step 2: Generate narration
-        print("🔊 PASSO 2: Geração de Narração")
-        print("-" * 60)
-        narration_path = voice_narrator.generate(script)
+        # Fit to the target duration (trim pauses / atempo) instead of re-synthesizing
+        target_duration = script.get('target_duration') or script.get('duration_estimate')
+        narration_path = narration_fitter.fit(narration_path, target_duration)
         
         print(f"✅ Narração gerada: {narration_path.name}\n")
         
-        # Step 3: Get background assets
-        print("🎥 PASSO 3: Download de Assets")
-        print("-" * 60)
-        keywords = script.get('visual_keywords', ['curiosidade'])
-        background_videos = asset_manager.get_background_videos(keywords, count=3)
-        background_music = asset_manager.get_background_music(mood='lofi')
-        
-        print(f"✅ {len(background_videos)} vídeos de fundo obtidos")
-        print(f"✅ Música de fundo: {background_music.name}\n")
-        
         # Step 4: Edit video
+        editor_name, video_editor = editor_registry.select(editor, recalibrate=recalibrate)
         if not video_editor:
             print("\n⚠️  FFmpeg não instalado.")
             print("   Baixe em: https://www.gyan.dev/ffmpeg/builds/ffmpeg-release-essentials.7z")
@@ -86,7 +168,7 @@ def generate_video(topic: str, output_filename: str = None) -> Path:
             print(f"   - Música: {background_music}")
             return None
         
-        print("🎬 PASSO 4: Edição de Vídeo")
+        print(f"🎬 PASSO 4: Edição de Vídeo ({editor_name})")
         print("-" * 60)
         video_path = video_editor.create_video(
             script=script,
@@ -119,11 +201,13 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Generate complete video')
     parser.add_argument('--topic', type=str, required=True, help='Video topic')
     parser.add_argument('--output', type=str, help='Output filename')
+    parser.add_argument('--editor', choices=['auto', 'ffmpeg', 'moviepy'], help='Editor backend (default: VIDEO_EDITOR)')
+    parser.add_argument('--recalibrate', action='store_true', help='Re-run the editor benchmark')
     
     args = parser.parse_args()
     
     try:
-        video_path = generate_video(args.topic, args.output)
+        video_path = generate_video(args.topic, args.output, editor=args.editor, recalibrate=args.recalibrate)
         
         if video_path:
             print(f"\n🎉 Vídeo salvo em: {video_path}")
@@ -18,6 +18,7 @@ def main():
     parser.add_argument('--test-mode', action='store_true', help='Run in test mode')
     parser.add_argument('--topic', type=str, help='Video topic')
     parser.add_argument('--output', type=str, help='Output video filename')
+    parser.add_argument('--repair-cache', action='store_true', help='Remove invalid/placeholder scripts from the cache')
     
     args = parser.parse_args()
     
@@ -40,6 +41,13 @@ def main():
         print("\n❌ Sistema pausado devido a limite de budget.")
         return
     
+    if args.repair_cache:
+        from modules.script_store import script_store
+        print("\n🔧 Verificando cache de roteiros...")
+        removed = script_store.repair()
+        print(f"✅ {removed} roteiro(s) inválido(s) removido(s)")
+        return
+    
     if args.test_mode:
         print("\n🧪 Modo de teste ativado...")
         print(f"📁 Diretórios: {settings.OUTPUT_DIR}")
@@ -53,6 +61,9 @@ def main():
         print(f"   Vídeos gerados: {report['videos_generated']}")
         print(f"   Custo por vídeo: ${report['cost_per_video']:.2f}")
         print(f"   Budget restante: ${report['remaining_budget']:.2f}")
+        for provider, usage in report["llm_usage"].items():
+            print(f"   {provider}: {usage['calls']} chamadas, {usage['prompt_tokens']} tokens de prompt "
+                  f"({usage['cache_ratio']:.0%} em cache), {usage['avg_seconds']:.1f}s em média")
         
         print("\n✅ Sistema configurado corretamente!")
         print("\n📝 Próximos passos:")
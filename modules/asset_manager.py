@@ -3,12 +3,13 @@ Asset manager for downloading and caching background videos and music.
 Integrates with Pexels API for videos and Pixabay for music.
 """
 
-import requests
 import hashlib
 from pathlib import Path
 from typing import List, Optional
 
 from config.settings import settings
+from modules.http_client import http_client
+from modules.rate_governor import rate_governor
 
 class AssetManager:
     """Manages visual and audio assets for videos."""
@@ -51,7 +52,8 @@ class AssetManager:
         }
         
         try:
-            response = requests.get(url, headers=headers, params=params)
+            rate_governor.acquire("pexels")
+            response = http_client.get(url, headers=headers, params=params)
             response.raise_for_status()
             
             data = response.json()
@@ -90,12 +92,12 @@ class AssetManager:
                     
                     # Download
                     print(f"   ⬇️ Baixando vídeo {video_id}...")
-                    video_response = requests.get(video_url, stream=True)
-                    video_response.raise_for_status()
-                    
-                    with open(cache_path, "wb") as f:
-                        for chunk in video_response.iter_content(chunk_size=8192):
-                            f.write(chunk)
+                    with http_client.get(video_url, stream=True) as video_response:
+                        video_response.raise_for_status()
+                        
+                        with open(cache_path, "wb") as f:
+                            for chunk in video_response.iter_content(chunk_size=64 * 1024):
+                                f.write(chunk)
                     
                     downloaded.append(cache_path)
                     
@@ -179,7 +181,8 @@ class AssetManager:
                 "audio_type": "music"
             }
             
-            response = requests.get(url, params=params)
+            rate_governor.acquire("pixabay")
+            response = http_client.get(url, params=params)
             response.raise_for_status()
             data = response.json()
             
@@ -194,7 +197,7 @@ class AssetManager:
                     
                     if not music_file.exists():
                         print(f"   ⬇️ Baixando música...")
-                        music_response = requests.get(music_url)
+                        music_response = http_client.get(music_url)
                         music_response.raise_for_status()
                         
                         with open(music_file, "wb") as f:
@@ -0,0 +1,192 @@
+"""
+Audio helpers shared by the caption, narration and editing modules.
+Decodes audio to PCM once with ffmpeg so analysis can run in numpy.
+"""
+
+import hashlib
+import subprocess
+from pathlib import Path
+from typing import List, Optional
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+DEFAULT_SAMPLE_RATE = 16000
+
+def file_hash(path: Path) -> str:
+    """SHA-1 of a file's contents (streamed, constant memory)."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def decode_pcm(path: Path, sample_rate: int = DEFAULT_SAMPLE_RATE) -> "np.ndarray":
+    """
+    Decode any audio file to mono float32 PCM in [-1, 1].
+
+    Args:
+        path: Audio file (mp3, wav, ...)
+        sample_rate: Output sample rate
+
+    Returns:
+        1-D numpy array of samples
+    """
+    if not NUMPY_AVAILABLE:
+        raise ImportError("numpy não instalado. Execute: pip install numpy")
+
+    cmd = [
+        'ffmpeg', '-v', 'error',
+        '-i', str(path),
+        '-f', 's16le',
+        '-acodec', 'pcm_s16le',
+        '-ac', '1',
+        '-ar', str(sample_rate),
+        '-'
+    ]
+    result = subprocess.run(cmd, capture_output=True, check=False)
+    if result.returncode != 0:
+        raise Exception(f"FFmpeg falhou ao decodificar áudio: {result.stderr[:200]}")
+
+    samples = np.frombuffer(result.stdout, dtype=np.int16)
+    return samples.astype(np.float32) / 32768.0
+
+def stitch_audio(
+    inputs: List[Path],
+    output: Path,
+    gap_ms: int = 0,
+    crossfade_ms: int = 0,
+    sample_rate: int = 44100,
+    gains_db: Optional[List[float]] = None
+) -> Path:
+    """
+    Join audio files into one MP3.
+
+    Args:
+        inputs: Audio files in playback order
+        output: Destination MP3
+        gap_ms: Silence inserted after each input (ignored with crossfade)
+        crossfade_ms: Overlap between consecutive inputs
+        sample_rate: Output sample rate
+        gains_db: Optional per-input gain (loudness matching)
+
+    Returns:
+        Path to stitched file
+    """
+    if not inputs:
+        raise ValueError("Nenhum áudio para juntar")
+
+    cmd = ['ffmpeg', '-y', '-v', 'error']
+    for path in inputs:
+        cmd += ['-i', str(path)]
+
+    # Normalize format so concat/acrossfade accept every input
+    gains_db = gains_db or [0.0] * len(inputs)
+    filters = [
+        f"[{i}:a]aresample={sample_rate},aformat=sample_fmts=fltp:channel_layouts=mono,"
+        f"volume={gains_db[i]:.2f}dB[n{i}]"
+        for i in range(len(inputs))
+    ]
+
+    if len(inputs) == 1:
+        last = "n0"
+    elif crossfade_ms > 0:
+        last = "n0"
+        for i in range(1, len(inputs)):
+            label = f"x{i}"
+            filters.append(f"[{last}][n{i}]acrossfade=d={crossfade_ms / 1000:.3f}:c1=tri:c2=tri[{label}]")
+            last = label
+    else:
+        labels = ""
+        for i in range(len(inputs)):
+            if gap_ms > 0 and i < len(inputs) - 1:
+                filters.append(f"[n{i}]apad=pad_dur={gap_ms / 1000:.3f}[p{i}]")
+                labels += f"[p{i}]"
+            else:
+                labels += f"[n{i}]"
+        filters.append(f"{labels}concat=n={len(inputs)}:v=0:a=1[joined]")
+        last = "joined"
+
+    cmd += [
+        '-filter_complex', ";".join(filters),
+        '-map', f'[{last}]',
+        '-c:a', 'libmp3lame',
+        '-b:a', '128k',
+        str(output)
+    ]
+
+    result = subprocess.run(cmd, capture_output=True, text=True, check=False)
+    if result.returncode != 0 or not output.exists():
+        raise Exception(f"FFmpeg falhou ao juntar áudios: {result.stderr[:200]}")
+
+    return output
+
+def probe_duration(path: Path) -> Optional[float]:
+    """Duration in seconds via ffprobe, or None if it can't be read."""
+    cmd = [
+        'ffprobe', '-v', 'error',
+        '-show_entries', 'format=duration',
+        '-of', 'default=noprint_wrappers=1:nokey=1',
+        str(path)
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        return float(result.stdout.strip())
+    except Exception:
+        return None
+
+def measure_loudness(path: Path, sample_rate: int = DEFAULT_SAMPLE_RATE) -> float:
+    """
+    Speech level in dBFS (RMS over voiced 50 ms frames).
+
+    Frames more than 30 dB below the loudest frame are ignored so pauses
+    don't drag the level down.
+    """
+    samples = decode_pcm(path, sample_rate)
+    frame = sample_rate // 20
+    frame_count = len(samples) // frame
+    if frame_count == 0:
+        return -90.0
+
+    frames = samples[:frame_count * frame].reshape(frame_count, frame)
+    power = np.mean(frames ** 2, axis=1) + 1e-12
+    db = 10 * np.log10(power)
+    voiced = power[db > db.max() - 30]
+    return float(10 * np.log10(np.mean(voiced)))
+
+def encode_pcm(
+    samples: "np.ndarray",
+    output: Path,
+    sample_rate: int = DEFAULT_SAMPLE_RATE,
+    audio_filter: Optional[str] = None
+) -> Path:
+    """
+    Encode mono float PCM to MP3, optionally through an ffmpeg audio filter.
+
+    Args:
+        samples: 1-D array of samples in [-1, 1]
+        output: Destination MP3 path
+        sample_rate: Sample rate of samples
+        audio_filter: ffmpeg -af filter chain (e.g. "atempo=1.1")
+
+    Returns:
+        Path to encoded file
+    """
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16)
+
+    cmd = [
+        'ffmpeg', '-y', '-v', 'error',
+        '-f', 's16le', '-ac', '1', '-ar', str(sample_rate), '-i', '-'
+    ]
+    if audio_filter:
+        cmd += ['-af', audio_filter]
+    cmd += ['-c:a', 'libmp3lame', '-b:a', '128k', str(output)]
+
+    result = subprocess.run(cmd, input=pcm.tobytes(), capture_output=True, check=False)
+    if result.returncode != 0 or not output.exists():
+        raise Exception(f"FFmpeg falhou ao codificar áudio: {result.stderr[:200]}")
+
+    return output
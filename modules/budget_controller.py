@@ -5,10 +5,29 @@ Monitors expenses in real-time and prevents overspending.
 
 import json
 import os
+import threading
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 from config.settings import settings
+from modules.duration_predictor import duration_predictor
+
+# Monthly free-tier character allowances
+GOOGLE_TTS_FREE_CHARS = 4_000_000
+ELEVENLABS_FREE_CHARS = 10_000
+
+# USD per 1K characters once the free tier is used up
+TTS_PRICE_PER_1K = {
+    "google": 0.004,
+    "elevenlabs": 0.30,
+}
+
+# USD per 1M tokens of script generation (Gemini stays in the free tier)
+LLM_PRICE_PER_1M = {
+    "gemini": 0.0,
+    "openrouter": 0.30,
+    "openai": 15.0,
+}
 
 class BudgetController:
     """Tracks and manages API costs across all services."""
@@ -16,6 +35,8 @@ class BudgetController:
     def __init__(self):
         self.budget_file = settings.DATA_DIR / "budget.json"
         self.costs = self._load_costs()
+        # Narration chunks are synthesized from worker threads
+        self._lock = threading.RLock()
     
     def _load_costs(self) -> Dict:
         """Load existing cost data or create new."""
@@ -32,6 +53,7 @@ class BudgetController:
             "gemini": {"requests": 0, "cost": 0.0},
             "elevenlabs": {"characters": 0, "cost": 0.0},
             "google_tts": {"characters": 0, "cost": 0.0},
+            "hedging": {"requests": 0, "wins": 0, "cost": 0.0},
             "total_cost": 0.0,
             "videos_generated": 0,
             "daily_costs": {},
@@ -41,8 +63,9 @@ class BudgetController:
     
     def _save_costs(self):
         """Save costs to file."""
-        with open(self.budget_file, 'w', encoding='utf-8') as f:
-            json.dump(self.costs, f, indent=2, ensure_ascii=False)
+        with self._lock:
+            with open(self.budget_file, 'w', encoding='utf-8') as f:
+                json.dump(self.costs, f, indent=2, ensure_ascii=False)
     
     def _reset_if_new_month(self):
         """Reset costs if it's a new month."""
@@ -54,57 +77,137 @@ class BudgetController:
     
     def track_openai(self, tokens: int):
         """Track OpenAI API usage."""
-        self._reset_if_new_month()
-        cost = (tokens / 1_000_000) * 15.0  # $15 per 1M tokens (GPT-4o)
-        self.costs["openai"]["tokens"] += tokens
-        self.costs["openai"]["cost"] += cost
-        self._update_total(cost)
+        with self._lock:
+            self._reset_if_new_month()
+            cost = (tokens / 1_000_000) * 15.0  # $15 per 1M tokens (GPT-4o)
+            self.costs["openai"]["tokens"] += tokens
+            self.costs["openai"]["cost"] += cost
+            self._update_total(cost)
     
     def track_gemini(self):
         """Track Gemini API usage (free tier)."""
-        self._reset_if_new_month()
-        self.costs["gemini"]["requests"] += 1
-        # Free tier, no cost
+        with self._lock:
+            self._reset_if_new_month()
+            self.costs["gemini"]["requests"] += 1
+            # Free tier, no cost
     
     def track_elevenlabs(self, characters: int, is_free_tier: bool = True):
         """Track ElevenLabs TTS usage."""
-        self._reset_if_new_month()
-        self.costs["elevenlabs"]["characters"] += characters
-        
-        if not is_free_tier:
-            # Paid tier: $0.30 per 1K characters
-            cost = (characters / 1000) * 0.30
-            self.costs["elevenlabs"]["cost"] += cost
-            self._update_total(cost)
+        with self._lock:
+            self._reset_if_new_month()
+            self.costs["elevenlabs"]["characters"] += characters
+            
+            if not is_free_tier:
+                # Paid tier: $0.30 per 1K characters
+                cost = (characters / 1000) * 0.30
+                self.costs["elevenlabs"]["cost"] += cost
+                self._update_total(cost)
     
     def track_google_tts(self, characters: int):
         """Track Google TTS usage."""
+        with self._lock:
+            self._reset_if_new_month()
+            self.costs["google_tts"]["characters"] += characters
+            
+            # Free tier: first 4M characters/month
+            if self.costs["google_tts"]["characters"] > GOOGLE_TTS_FREE_CHARS:
+                excess = characters
+                cost = (excess / 1_000_000) * 4.0  # $4 per 1M after free tier
+                self.costs["google_tts"]["cost"] += cost
+                self._update_total(cost)
+    
+    def tts_quota_remaining(self, provider: str) -> Optional[int]:
+        """
+        Free-tier characters left this month for a TTS provider.
+        
+        Returns:
+            Remaining characters, or None if the provider has no free-tier quota
+        """
         self._reset_if_new_month()
-        self.costs["google_tts"]["characters"] += characters
+        if provider == "google":
+            return max(GOOGLE_TTS_FREE_CHARS - self.costs["google_tts"]["characters"], 0)
+        if provider == "elevenlabs_free":
+            return max(ELEVENLABS_FREE_CHARS - self.costs["elevenlabs"]["characters"], 0)
+        return None
+    
+    def tts_cost(self, provider: str, characters: int) -> float:
+        """Marginal cost in USD of synthesizing characters with a provider."""
+        if provider == "google":
+            remaining = self.tts_quota_remaining("google")
+            billable = max(characters - remaining, 0)
+            return (billable / 1000) * TTS_PRICE_PER_1K["google"]
+        if provider == "elevenlabs_paid":
+            return (characters / 1000) * TTS_PRICE_PER_1K["elevenlabs"]
+        return 0.0
+    
+    def llm_request_cost(self, provider: str, prompt_chars: int) -> float:
+        """Estimated USD cost of one script request (prompt plus ~300-token reply)."""
+        tokens = prompt_chars / 4 + 300
+        return (tokens / 1_000_000) * LLM_PRICE_PER_1M.get(provider, 0.0)
+    
+    def track_hedge(self, provider: str, won: bool, cost: float):
+        """
+        Track a hedged script request.
         
-        # Free tier: first 4M characters/month
-        if self.costs["google_tts"]["characters"] > 4_000_000:
-            excess = characters
-            cost = (excess / 1_000_000) * 4.0  # $4 per 1M after free tier
-            self.costs["google_tts"]["cost"] += cost
+        The losing request is abandoned mid-stream, so its provider never
+        reports usage for it; its estimated cost is added to the total here.
+        
+        Args:
+            provider: Provider of the discarded (losing) request
+            won: Whether the hedge answered first
+            cost: Estimated cost of the discarded request
+        """
+        with self._lock:
+            self._reset_if_new_month()
+            hedging = self.costs.setdefault("hedging", {"requests": 0, "wins": 0, "cost": 0.0})
+            hedging["requests"] += 1
+            hedging["wins"] += int(won)
+            hedging["cost"] += cost
+            by_provider = hedging.setdefault("providers", {})
+            by_provider[provider] = by_provider.get(provider, 0.0) + cost
             self._update_total(cost)
     
+    def track_llm_usage(self, provider: str, usage: Dict[str, int], seconds: float):
+        """
+        Record token usage and latency of one LLM call.
+        
+        Args:
+            provider: LLM provider
+            usage: Tokens as {"prompt", "cached", "output"} (cached = prompt
+                tokens served from the provider's prefix/context cache)
+            seconds: Request latency
+        """
+        with self._lock:
+            self._reset_if_new_month()
+            ledger = self.costs.setdefault("llm_usage", {})
+            entry = ledger.setdefault(provider, {
+                "calls": 0, "prompt_tokens": 0, "cached_tokens": 0, "output_tokens": 0, "seconds": 0.0
+            })
+            entry["calls"] += 1
+            entry["prompt_tokens"] += usage.get("prompt", 0)
+            entry["cached_tokens"] += usage.get("cached", 0)
+            entry["output_tokens"] += usage.get("output", 0)
+            entry["seconds"] += seconds
+            self._save_costs()
+    
     def _update_total(self, cost: float):
         """Update total costs."""
         today = datetime.now().strftime("%Y-%m-%d")
         
-        self.costs["total_cost"] += cost
-        
-        if today not in self.costs["daily_costs"]:
-            self.costs["daily_costs"][today] = 0.0
-        self.costs["daily_costs"][today] += cost
-        
-        self._save_costs()
+        with self._lock:
+            self.costs["total_cost"] += cost
+            
+            if today not in self.costs["daily_costs"]:
+                self.costs["daily_costs"][today] = 0.0
+            self.costs["daily_costs"][today] += cost
+            
+            self._save_costs()
     
     def track_video_generated(self):
         """Increment video counter."""
-        self.costs["videos_generated"] += 1
-        self._save_costs()
+        with self._lock:
+            self.costs["videos_generated"] += 1
+            self._save_costs()
     
     def get_cost_per_video(self) -> float:
         """Calculate average cost per video."""
@@ -147,6 +250,19 @@ class BudgetController:
             "gemini_requests": self.costs["gemini"]["requests"],
             "elevenlabs_chars": self.costs["elevenlabs"]["characters"],
             "google_tts_chars": self.costs["google_tts"]["characters"],
+            "hedged_requests": self.costs.get("hedging", {}).get("requests", 0),
+            "hedge_cost": self.costs.get("hedging", {}).get("cost", 0.0),
+            "llm_usage": {
+                provider: {
+                    "calls": entry["calls"],
+                    "prompt_tokens": entry["prompt_tokens"],
+                    "cached_tokens": entry["cached_tokens"],
+                    "output_tokens": entry["output_tokens"],
+                    "cache_ratio": entry["cached_tokens"] / entry["prompt_tokens"] if entry["prompt_tokens"] else 0.0,
+                    "avg_seconds": entry["seconds"] / entry["calls"] if entry["calls"] else 0.0,
+                }
+                for provider, entry in self.costs.get("llm_usage", {}).items()
+            },
         }
     
     def estimate_video_cost(self, script_tokens: int, narration_chars: int) -> float:
@@ -162,7 +278,7 @@ class BudgetController:
         
         # Estimate narration cost
         if settings.ECONOMY_MODE and settings.GOOGLE_TTS_API_KEY:
-            if self.costs["google_tts"]["characters"] < 4_000_000:
+            if self.costs["google_tts"]["characters"] < GOOGLE_TTS_FREE_CHARS:
                 narration_cost = 0.0  # Google TTS free tier
             else:
                 narration_cost = (narration_chars / 1_000_000) * 4.0
@@ -171,5 +287,25 @@ class BudgetController:
         
         return script_cost + narration_cost
 
+    def estimate_video_timing(self, narration_text: str, provider: str = "", voice: str = "") -> Dict:
+        """
+        Estimate cost and narration length for a video before it is produced.
+        
+        Args:
+            narration_text: Full narration text
+            provider: TTS provider expected to narrate it
+            voice: Voice identifier of that provider
+        
+        Returns:
+            Dictionary with narration_seconds, narration_chars and cost
+        """
+        narration_chars = len(narration_text)
+        return {
+            "narration_seconds": duration_predictor.predict(narration_text, provider, voice),
+            "narration_chars": narration_chars,
+            # ~4 characters per token of output, plus the prompt
+            "cost": self.estimate_video_cost(narration_chars // 4 + 500, narration_chars)
+        }
+
 # Global budget instance
 budget = BudgetController()
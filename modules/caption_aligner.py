@@ -0,0 +1,189 @@
+"""
+Offline caption alignment against the narration audio.
+Detects speech segments from a numpy energy envelope and spreads words
+over them by syllable weight. Results are cached per narration hash.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from config.settings import settings
+from modules.audio_utils import DEFAULT_SAMPLE_RATE, decode_pcm, file_hash
+from modules.text_utils import count_syllables
+
+FRAME_MS = 10          # Envelope resolution
+MIN_SILENCE_MS = 150   # Shorter gaps are treated as speech
+MIN_SPEECH_MS = 60     # Shorter bursts are treated as noise
+
+def even_timings(count: int, duration: float) -> List[Tuple[float, float]]:
+    """Spread count words evenly across duration (fallback timing)."""
+    if count == 0:
+        return []
+    step = duration / count
+    return [(i * step, (i + 1) * step) for i in range(count)]
+
+class CaptionAligner:
+    """Maps caption words onto the speech detected in a narration file."""
+
+    def __init__(self):
+        self.cache_dir = settings.DATA_DIR / "alignment_cache"
+        self.cache_dir.mkdir(exist_ok=True)
+        self._hashes: Dict[Tuple[str, float, int], str] = {}
+
+    def align(
+        self,
+        narration_audio: Path,
+        words: List[str],
+        duration: Optional[float] = None
+    ) -> List[Tuple[float, float]]:
+        """
+        Get (start, end) times in seconds for each word.
+
+        Args:
+            narration_audio: Narration file the words are spoken in
+            words: Caption words in reading order
+            duration: Known narration duration (used by the fallback)
+
+        Returns:
+            One (start, end) tuple per word
+        """
+        if not words:
+            return []
+
+        try:
+            analysis = self._load_analysis(narration_audio)
+        except Exception as e:
+            print(f"   ⚠️  Alinhamento indisponível ({e}), usando tempo uniforme")
+            return even_timings(len(words), duration or 0.0)
+
+        text_key = hashlib.md5(" ".join(words).encode()).hexdigest()
+        cached = analysis["alignments"].get(text_key)
+        if cached and len(cached) == len(words):
+            return [tuple(t) for t in cached]
+
+        segments = analysis["segments"] or [[0.0, analysis["duration"]]]
+        timings = self._map_words(words, segments)
+
+        analysis["alignments"][text_key] = timings
+        self._save_analysis(analysis)
+
+        return timings
+
+    def _audio_key(self, narration_audio: Path) -> str:
+        """Content hash of the narration (memoized per path/mtime/size)."""
+        stat = narration_audio.stat()
+        memo_key = (str(narration_audio), stat.st_mtime, stat.st_size)
+        if memo_key not in self._hashes:
+            self._hashes[memo_key] = file_hash(narration_audio)
+        return self._hashes[memo_key]
+
+    def _load_analysis(self, narration_audio: Path) -> Dict:
+        """Load speech segments from cache, decoding the audio only on a miss."""
+        audio_key = self._audio_key(narration_audio)
+        cache_file = self.cache_dir / f"{audio_key}.json"
+
+        if cache_file.exists():
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy não instalado")
+
+        sample_rate = DEFAULT_SAMPLE_RATE
+        samples = decode_pcm(narration_audio, sample_rate)
+        analysis = {
+            "audio_hash": audio_key,
+            "duration": len(samples) / sample_rate,
+            "segments": self._detect_speech(samples, sample_rate),
+            "alignments": {}
+        }
+        self._save_analysis(analysis)
+        return analysis
+
+    def _save_analysis(self, analysis: Dict):
+        cache_file = self.cache_dir / f"{analysis['audio_hash']}.json"
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump(analysis, f)
+
+    def _detect_speech(self, samples: "np.ndarray", sample_rate: int) -> List[List[float]]:
+        """Energy-based VAD: returns [start, end] speech segments in seconds."""
+        frame = int(sample_rate * FRAME_MS / 1000)
+        frame_count = len(samples) // frame
+        if frame_count == 0:
+            return []
+
+        frames = samples[:frame_count * frame].reshape(frame_count, frame)
+        rms = np.sqrt(np.mean(frames ** 2, axis=1) + 1e-12)
+        db = 20 * np.log10(rms)
+
+        # Light smoothing (30 ms) to avoid chattering at the threshold
+        db = np.convolve(db, np.ones(3) / 3, mode="same")
+
+        floor = np.percentile(db, 10)
+        peak = np.percentile(db, 95)
+        threshold = floor + 0.3 * (peak - floor)
+        speech = db > threshold
+
+        # Run boundaries of the boolean mask
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], speech.astype(np.int8), [0]))))
+        runs = edges.reshape(-1, 2)  # [start_frame, end_frame)
+
+        segments = []
+        min_gap = MIN_SILENCE_MS / FRAME_MS
+        for start, end in runs:
+            if segments and start - segments[-1][1] < min_gap:
+                segments[-1][1] = end
+            else:
+                segments.append([start, end])
+
+        min_len = MIN_SPEECH_MS / FRAME_MS
+        step = FRAME_MS / 1000
+        return [
+            [round(start * step, 3), round(end * step, 3)]
+            for start, end in segments
+            if end - start >= min_len
+        ]
+
+    def _map_words(self, words: List[str], segments: List[List[float]]) -> List[List[float]]:
+        """Distribute words over speech time by syllable weight."""
+        # Pauses are already excluded from speech time, so punctuation
+        # needs no extra weight: sentence ends land on detected gaps
+        weights = [float(count_syllables(word)) for word in words]
+
+        speech_total = sum(end - start for start, end in segments)
+        scale = speech_total / sum(weights)
+
+        # Cumulative speech-time position of every word boundary
+        bounds = [0.0]
+        for weight in weights:
+            bounds.append(bounds[-1] + weight * scale)
+
+        offsets = [0.0]
+        for start, end in segments:
+            offsets.append(offsets[-1] + end - start)
+
+        def to_real(position: float, is_end: bool) -> float:
+            # A boundary that falls exactly between segments belongs to the
+            # previous segment for an end time and to the next one for a start
+            for i, (start, end) in enumerate(segments):
+                local = position - offsets[i]
+                limit = end - start
+                if local < limit or (is_end and local <= limit) or i == len(segments) - 1:
+                    return round(start + min(max(local, 0.0), limit), 3)
+            return segments[-1][1]
+
+        return [
+            [to_real(bounds[i], False), to_real(bounds[i + 1], True)]
+            for i in range(len(words))
+        ]
+
+# Global instance
+caption_aligner = CaptionAligner()
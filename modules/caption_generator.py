@@ -5,139 +5,219 @@ Creates animated word-by-word captions with highlighting.
 
 import json
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 import re
 
+from config.settings import settings
+from modules.caption_aligner import caption_aligner, even_timings
+
+# Named colors -> RGB hex
+COLORS = {
+    "white": "FFFFFF",
+    "yellow": "FFFF00",
+    "black": "000000",
+    "red": "FF0000",
+    "green": "00FF00",
+    "cyan": "00FFFF",
+}
+
 class CaptionGenerator:
     """Generate TikTok-style captions with word-by-word animation."""
-    
+
     def __init__(self):
-        self.font_size = 60
+        self.font_name = "Arial Black"
+        self.font_size = 80  # Pixels at PlayResY = video height
         self.font_color = "white"
         self.highlight_color = "yellow"
         self.box_color = "black@0.6"  # Semi-transparent black
         self.position = "(w-text_w)/2:h*0.75"  # Bottom center
-        
-    def create_caption_file(self, script: dict, narration_duration: float, output_path: Path) -> Path:
-        """
-        Create SRT subtitle file from script with timing.
-        
-        Args:
-            script: Script dictionary with segments
-            narration_duration: Total duration of narration
-            output_path: Path to save .srt file
-            
-        Returns:
-            Path to .srt file
-        """
-        # Extract all text from script
+        self.margin_v = 320  # Distance from the bottom edge
+        self.words_per_caption = 3  # Show 3 words at a time
+
+    def _extract_text_blocks(self, script: dict) -> List[str]:
+        """Collect narration text in reading order (hook/body/outro schema)."""
         text_blocks = []
-        
+
         # Hook
         if script.get('hook'):
             text_blocks.append(script['hook'])
-        
-        # Segments
+
+        # Body (current schema)
+        if script.get('body'):
+            text_blocks.append(script['body'])
+
+        # Segments (legacy schema)
         for segment in script.get('segments', []):
             if segment.get('narration'):
                 text_blocks.append(segment['narration'])
-        
-        # Conclusion
-        if script.get('conclusion'):
+
+        # Outro (current schema) / conclusion (legacy schema)
+        if script.get('outro'):
+            text_blocks.append(script['outro'])
+        elif script.get('conclusion'):
             text_blocks.append(script['conclusion'])
-        
-        # Join all text
-        full_text = " ".join(text_blocks)
-        
-        # Split into words
-        words = full_text.split()
-        
+
+        return text_blocks
+
+    def create_caption_file(
+        self,
+        script: dict,
+        narration_duration: float,
+        output_path: Path,
+        narration_audio: Optional[Path] = None
+    ) -> Path:
+        """
+        Create ASS subtitle file with per-word karaoke highlighting.
+
+        Styles are declared once in the file header; each caption line
+        carries \\k tags so libass highlights the spoken word in the same
+        burn-in pass.
+
+        Args:
+            script: Script dictionary (hook/body/outro)
+            narration_duration: Total duration of narration
+            output_path: Path used to name the .ass file
+            narration_audio: Narration file to align word timing against
+                (words are spread evenly when omitted)
+
+        Returns:
+            Path to .ass file
+        """
+        words = " ".join(self._extract_text_blocks(script)).split()
+
         if not words:
             return None
-        
+
         # Calculate timing for each word
-        time_per_word = narration_duration / len(words)
-        
-        # Create SRT format subtitles
-        srt_content = []
-        current_time = 0
-        words_per_caption = 3  # Show 3 words at a time
-        
-        for i in range(0, len(words), words_per_caption):
-            chunk_words = words[i:i + words_per_caption]
-            chunk_text = " ".join(chunk_words)
-            
-            # Calculate start and end times
-            start_time = current_time
-            end_time = current_time + (len(chunk_words) * time_per_word)
-            
-            # Format times as SRT (HH:MM:SS,mmm)
-            start_srt = self._format_srt_time(start_time)
-            end_srt = self._format_srt_time(end_time)
-            
-            # Add subtitle entry
-            subtitle_index = (i // words_per_caption) + 1
-            srt_content.append(f"{subtitle_index}")
-            srt_content.append(f"{start_srt} --> {end_srt}")
-            srt_content.append(chunk_text.upper())  # Uppercase for TikTok style
-            srt_content.append("")  # Empty line between entries
-            
-            current_time = end_time
-        
-        # Write SRT file
-        srt_path = output_path.with_suffix('.srt')
-        with open(srt_path, 'w', encoding='utf-8') as f:
-            f.write("\n".join(srt_content))
-        
-        print(f"✓ Legendas criadas: {len(srt_content) // 4} segmentos")
-        
-        return srt_path
-    
+        if narration_audio:
+            timings = caption_aligner.align(narration_audio, words, narration_duration)
+        else:
+            timings = even_timings(len(words), narration_duration)
+
+        events = []
+        for i in range(0, len(words), self.words_per_caption):
+            chunk_words = words[i:i + self.words_per_caption]
+            chunk_timings = timings[i:i + self.words_per_caption]
+            events.append(self._karaoke_event(chunk_words, chunk_timings))
+
+        ass_path = output_path.with_suffix('.ass')
+        with open(ass_path, 'w', encoding='utf-8') as f:
+            f.write(self._ass_header())
+            f.write("\n".join(events))
+            f.write("\n")
+
+        print(f"✓ Legendas criadas: {len(events)} segmentos (karaokê)")
+
+        return ass_path
+
+    def _karaoke_event(self, words: List[str], timings: List[tuple]) -> str:
+        """Build one Dialogue line with a \\k tag per word."""
+        start = timings[0][0]
+        end = timings[-1][1]
+
+        # Work in centiseconds so the \k durations add up to the event length
+        start_cs = round(start * 100)
+        parts = []
+        cursor = start_cs
+        for word, (_, word_end) in zip(words, timings):
+            word_end_cs = max(round(word_end * 100), cursor)
+            parts.append(f"{{\\k{word_end_cs - cursor}}}{self._escape_ass(word.upper())}")
+            cursor = word_end_cs
+
+        return (
+            f"Dialogue: 0,{self._format_ass_time(start)},{self._format_ass_time(end)},"
+            f"TikTok,,0,0,0,,{' '.join(parts)}"
+        )
+
+    def _ass_header(self) -> str:
+        """Script info and the single caption style."""
+        # Karaoke: SecondaryColour before the word is spoken, PrimaryColour after
+        primary = self._ass_color(self.highlight_color)
+        secondary = self._ass_color(self.font_color)
+        outline = self._ass_color("black")
+        back = self._ass_color("black", alpha=0x80)
+
+        return (
+            "[Script Info]\n"
+            "ScriptType: v4.00+\n"
+            f"PlayResX: {settings.VIDEO_WIDTH}\n"
+            f"PlayResY: {settings.VIDEO_HEIGHT}\n"
+            "WrapStyle: 0\n"
+            "ScaledBorderAndShadow: yes\n"
+            "\n"
+            "[V4+ Styles]\n"
+            "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, "
+            "Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, "
+            "Shadow, Alignment, MarginL, MarginR, MarginV, Encoding\n"
+            f"Style: TikTok,{self.font_name},{self.font_size},{primary},{secondary},{outline},{back},"
+            f"-1,0,0,0,100,100,0,0,4,2,0,2,60,60,{self.margin_v},1\n"
+            "\n"
+            "[Events]\n"
+            "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
+        )
+
+    def _ass_color(self, name: str, alpha: int = 0) -> str:
+        """Convert a color name or RRGGBB hex to ASS &HAABBGGRR."""
+        rgb = COLORS.get(name.lower(), name.lstrip('#')).upper()
+        if not re.fullmatch(r"[0-9A-F]{6}", rgb):
+            rgb = COLORS["white"]
+        return f"&H{alpha:02X}{rgb[4:6]}{rgb[2:4]}{rgb[0:2]}"
+
+    def _escape_ass(self, text: str) -> str:
+        """Strip characters that ASS would interpret as override tags."""
+        return text.replace("\\", "/").replace("{", "(").replace("}", ")")
+
+    def _format_ass_time(self, seconds: float) -> str:
+        """Convert seconds to ASS time format (H:MM:SS.cc)."""
+        centis = int(round(seconds * 100))
+        hours = centis // 360000
+        minutes = (centis % 360000) // 6000
+        secs = (centis % 6000) // 100
+
+        return f"{hours:d}:{minutes:02d}:{secs:02d}.{centis % 100:02d}"
+
     def _format_srt_time(self, seconds: float) -> str:
         """Convert seconds to SRT time format (HH:MM:SS,mmm)."""
         hours = int(seconds // 3600)
         minutes = int((seconds % 3600) // 60)
         secs = int(seconds % 60)
         millis = int((seconds % 1) * 1000)
-        
+
         return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
-    
-    def get_ffmpeg_subtitle_filter(self, srt_path: Path) -> str:
+
+    def get_ffmpeg_subtitle_filter(self, caption_path: Path) -> str:
         """
-        Get FFmpeg filter for adding TikTok-style subtitles.
-        
+        Get FFmpeg filter for burning in the captions.
+
         Args:
-            srt_path: Path to .srt subtitle file
-            
+            caption_path: Path to .ass subtitle file (styles are in the file)
+
         Returns:
             FFmpeg filter string
         """
         # Escape path for FFmpeg (Windows compatibility)
-        srt_path_str = str(srt_path).replace('\\', '/').replace(':', r'\\:')
-        
-        # TikTok-style subtitle filter with:
-        # - Large white text with yellow highlight
-        # - Semi-transparent black box background
-        # - Bold font
-        # - Bottom center position
-        filter_str = (
-            f"subtitles='{srt_path_str}'"
+        path_str = str(caption_path).replace('\\', '/').replace(':', r'\\:')
+
+        if caption_path.suffix.lower() == '.ass':
+            return f"ass='{path_str}'"
+
+        # SRT fallback: style has to be forced from the command line
+        return (
+            f"subtitles='{path_str}'"
             f":force_style='"
-            f"FontName=Arial Black,"
+            f"FontName={self.font_name},"
             f"FontSize={self.font_size},"
-            f"PrimaryColour=&H00FFFFFF,"  # White
-            f"OutlineColour=&H00000000,"  # Black outline
-            f"BackColour=&H80000000,"     # Semi-transparent black box
-            f"BorderStyle=4,"              # Box background
-            f"Outline=2,"                  # Thick outline
+            f"PrimaryColour={self._ass_color(self.font_color)},"
+            f"OutlineColour={self._ass_color('black')},"
+            f"BackColour={self._ass_color('black', alpha=0x80)},"
+            f"BorderStyle=4,"
+            f"Outline=2,"
             f"Shadow=0,"
-            f"MarginV=80,"                 # Bottom margin
-            f"Alignment=2,"                # Bottom center
+            f"MarginV=80,"
+            f"Alignment=2,"
             f"Bold=1"
             f"'"
         )
-        
-        return filter_str
 
 # Global instance
 caption_generator = CaptionGenerator()
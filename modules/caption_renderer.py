@@ -0,0 +1,216 @@
+"""
+Caption renderer for the MoviePy editor.
+Rasterizes caption chunks once with Pillow and blends only the active
+caption into each frame with numpy, instead of stacking TextClips.
+"""
+
+from bisect import bisect_right
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Tuple
+
+try:
+    import numpy as np
+    from PIL import Image, ImageDraw, ImageFont
+    RENDERER_AVAILABLE = True
+except ImportError:
+    RENDERER_AVAILABLE = False
+
+from config.settings import settings
+
+# Fonts tried in order when no .ttf is found in assets/fonts
+FALLBACK_FONTS = [
+    "arialbd.ttf",
+    "Arial Bold.ttf",
+    "DejaVuSans-Bold.ttf",
+    "LiberationSans-Bold.ttf",
+]
+
+class CaptionStyle(NamedTuple):
+    """Visual style of a caption chunk (hashable, used as cache key)."""
+    font_size: int = 50
+    color: Tuple[int, int, int] = (255, 255, 255)
+    stroke_color: Tuple[int, int, int] = (0, 0, 0)
+    stroke_width: int = 2
+    max_width: int = 980
+    line_spacing: int = 8
+
+class CaptionRaster(NamedTuple):
+    """Pre-multiplied RGBA raster ready for alpha blending."""
+    premultiplied: "np.ndarray"  # float32 HxWx3, rgb * alpha
+    inverse_alpha: "np.ndarray"  # float32 HxWx1, 1 - alpha
+    width: int
+    height: int
+
+class CaptionTrack:
+    """Time-indexed caption events; blends the active one into each frame."""
+
+    def __init__(self, events: List[Tuple[float, float, CaptionRaster]], frame_size: Tuple[int, int]):
+        # Events must not overlap; sort by start time for bisect lookups
+        events = sorted(events, key=lambda e: e[0])
+        self.starts = [e[0] for e in events]
+        self.ends = [e[1] for e in events]
+        self.rasters = [e[2] for e in events]
+        self.frame_width, self.frame_height = frame_size
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def active(self, t: float) -> Optional[CaptionRaster]:
+        """Return the caption visible at time t, if any."""
+        index = bisect_right(self.starts, t) - 1
+        if index >= 0 and t < self.ends[index]:
+            return self.rasters[index]
+        return None
+
+    def blend(self, frame: "np.ndarray", t: float) -> "np.ndarray":
+        """Alpha-blend the active caption (centered) into the frame."""
+        raster = self.active(t)
+        if raster is None:
+            return frame
+
+        frame_h, frame_w = frame.shape[:2]
+        x = max((frame_w - raster.width) // 2, 0)
+        y = max((frame_h - raster.height) // 2, 0)
+        w = min(raster.width, frame_w - x)
+        h = min(raster.height, frame_h - y)
+
+        # Clips may hand out the same array on every get_frame (ColorClip,
+        # ImageClip): never draw into it, or the caption stays burned in
+        out = frame.copy()
+        region = out[y:y + h, x:x + w].astype(np.float32)
+        region *= raster.inverse_alpha[:h, :w]
+        region += raster.premultiplied[:h, :w]
+        out[y:y + h, x:x + w] = region.astype(np.uint8)
+        return out
+
+class CaptionRenderer:
+    """Rasterizes caption text once per (text, style) and reuses it across videos."""
+
+    def __init__(self, max_cached: int = 512):
+        if not RENDERER_AVAILABLE:
+            raise ImportError(
+                "Pillow e numpy são necessários para as legendas. Execute:\n"
+                "pip install Pillow numpy"
+            )
+
+        self.max_cached = max_cached
+        self._cache: "OrderedDict[Tuple[str, CaptionStyle], CaptionRaster]" = OrderedDict()
+        self._fonts = {}
+
+    def _load_font(self, size: int):
+        """Load a bold TrueType font, preferring assets/fonts."""
+        if size in self._fonts:
+            return self._fonts[size]
+
+        candidates = [str(p) for p in sorted(Path(settings.FONTS_DIR).glob("*.ttf"))]
+        candidates += FALLBACK_FONTS
+
+        font = None
+        for candidate in candidates:
+            try:
+                font = ImageFont.truetype(candidate, size)
+                break
+            except OSError:
+                continue
+
+        if font is None:
+            print("   ⚠️  Nenhuma fonte TrueType encontrada, usando fonte padrão")
+            font = ImageFont.load_default()
+
+        self._fonts[size] = font
+        return font
+
+    def _wrap(self, text: str, font, draw, style: CaptionStyle) -> List[str]:
+        """Greedy word wrap to the style's max width."""
+        lines = []
+        current = ""
+        for word in text.split():
+            candidate = f"{current} {word}".strip()
+            width = draw.textlength(candidate, font=font) + 2 * style.stroke_width
+            if current and width > style.max_width:
+                lines.append(current)
+                current = word
+            else:
+                current = candidate
+        if current:
+            lines.append(current)
+        return lines
+
+    def rasterize(self, text: str, style: CaptionStyle = CaptionStyle()) -> CaptionRaster:
+        """Rasterize text to a pre-multiplied RGBA array (cached)."""
+        key = (text, style)
+        raster = self._cache.get(key)
+        if raster is not None:
+            self._cache.move_to_end(key)
+            return raster
+
+        font = self._load_font(style.font_size)
+        measure = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+        lines = self._wrap(text, font, measure, style)
+
+        boxes = [
+            measure.textbbox((0, 0), line, font=font, stroke_width=style.stroke_width)
+            for line in lines
+        ]
+        line_heights = [box[3] - box[1] for box in boxes]
+        width = max(box[2] - box[0] for box in boxes)
+        height = sum(line_heights) + style.line_spacing * (len(lines) - 1)
+
+        image = Image.new("RGBA", (max(width, 1), max(height, 1)), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(image)
+
+        y = 0
+        for line, box, line_height in zip(lines, boxes, line_heights):
+            x = (width - (box[2] - box[0])) // 2 - box[0]
+            draw.text(
+                (x, y - box[1]),
+                line,
+                font=font,
+                fill=style.color + (255,),
+                stroke_width=style.stroke_width,
+                stroke_fill=style.stroke_color + (255,)
+            )
+            y += line_height + style.line_spacing
+
+        rgba = np.asarray(image, dtype=np.float32) / 255.0
+        alpha = rgba[:, :, 3:4]
+        raster = CaptionRaster(
+            premultiplied=rgba[:, :, :3] * alpha * 255.0,
+            inverse_alpha=1.0 - alpha,
+            width=image.width,
+            height=image.height
+        )
+
+        self._cache[key] = raster
+        if len(self._cache) > self.max_cached:
+            self._cache.popitem(last=False)
+
+        return raster
+
+    def build_track(
+        self,
+        chunks: List[Tuple[str, float, float]],
+        frame_size: Tuple[int, int],
+        style: CaptionStyle = CaptionStyle()
+    ) -> CaptionTrack:
+        """
+        Build a caption track from (text, start, end) chunks.
+
+        Args:
+            chunks: Caption text with start/end times in seconds
+            frame_size: (width, height) of the target video
+            style: Caption style
+
+        Returns:
+            CaptionTrack ready to be applied with clip.fl
+        """
+        events = [
+            (start, end, self.rasterize(text, style))
+            for text, start, end in chunks
+            if text.strip() and end > start
+        ]
+        return CaptionTrack(events, frame_size)
+
+# Global instance
+caption_renderer = CaptionRenderer() if RENDERER_AVAILABLE else None
@@ -0,0 +1,89 @@
+"""
+Reader management for the MoviePy editor.
+Loops short clips over a single ffmpeg reader and closes every reader
+deterministically once a video is rendered.
+"""
+
+from pathlib import Path
+from typing import Dict, List
+
+try:
+    from moviepy.editor import VideoFileClip, AudioFileClip, VideoClip
+    MOVIEPY_AVAILABLE = True
+except ImportError:
+    MOVIEPY_AVAILABLE = False
+
+if MOVIEPY_AVAILABLE:
+    class LoopedClip(VideoClip):
+        """Plays a clip repeatedly by mapping t modulo its duration onto one reader."""
+
+        def __init__(self, clip: VideoClip, duration: float):
+            source_duration = clip.duration
+            # Keep the last frame time strictly inside the source clip
+            last_frame = max(source_duration - 1.0 / (clip.fps or 30), 0)
+
+            def make_frame(t):
+                return clip.get_frame(min(t % source_duration, last_frame))
+
+            VideoClip.__init__(self, make_frame=make_frame, duration=duration)
+            self.source = clip
+            self.size = clip.size
+            self.fps = clip.fps
+
+class ReaderPool:
+    """
+    Owns every file reader opened while rendering one video.
+
+    Usage:
+        with ReaderPool() as pool:
+            clip = pool.video(path)
+            ...
+        # all ffmpeg readers are closed here
+    """
+
+    def __init__(self):
+        self._videos: Dict[str, "VideoFileClip"] = {}
+        self._audios: List["AudioFileClip"] = []
+
+    def video(self, path: Path) -> "VideoFileClip":
+        """Open a video once per render; repeated paths share the same reader."""
+        key = str(Path(path).resolve())
+        clip = self._videos.get(key)
+        if clip is None:
+            clip = VideoFileClip(str(path), audio=False)
+            self._videos[key] = clip
+        return clip
+
+    def audio(self, path: Path) -> "AudioFileClip":
+        """Open an audio file tracked by the pool."""
+        clip = AudioFileClip(str(path))
+        self._audios.append(clip)
+        return clip
+
+    def loop(self, clip: VideoClip, duration: float) -> VideoClip:
+        """Return clip extended to duration without duplicating readers."""
+        if clip.duration >= duration:
+            return clip.subclip(0, duration)
+        return LoopedClip(clip, duration)
+
+    @property
+    def open_readers(self) -> int:
+        """Number of readers currently held by the pool."""
+        return len(self._videos) + len(self._audios)
+
+    def close_all(self):
+        """Close every reader (terminates the ffmpeg processes)."""
+        for clip in list(self._videos.values()) + self._audios:
+            try:
+                clip.close()
+            except Exception as e:
+                print(f"   ⚠️  Erro ao fechar leitor: {e}")
+        self._videos.clear()
+        self._audios.clear()
+
+    def __enter__(self) -> "ReaderPool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close_all()
+        return False
@@ -0,0 +1,165 @@
+"""
+Narration duration predictor.
+Learns seconds of audio from text size per TTS voice, so the pipeline can
+plan (assets, render, cost/timing estimates) before the narration exists.
+"""
+
+import hashlib
+import json
+import threading
+from typing import Dict, List, Optional
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from config.settings import settings
+from modules.text_utils import count_text_syllables
+
+FEATURES = ["chars", "words", "syllables"]
+MIN_SAMPLES = 8       # Below this a per-voice syllable rate is used
+MAX_SAMPLES = 500     # Most recent observations kept per voice
+RIDGE = 1e-3          # Keeps the fit stable (the features are strongly correlated)
+DEFAULT_SECONDS_PER_SYLLABLE = 0.17  # ~6 syllables/s, typical pt-BR TTS
+
+def text_features(text: str) -> Dict[str, int]:
+    """Size features of a narration text."""
+    return {
+        "chars": len(text),
+        "words": len(text.split()),
+        "syllables": count_text_syllables(text),
+    }
+
+class DurationPredictor:
+    """Least-squares model of narration duration per provider/voice."""
+
+    def __init__(self):
+        self.model_file = settings.DATA_DIR / "duration_model.json"
+        self._lock = threading.Lock()
+        self.model = self._load_model()
+
+    def _load_model(self) -> Dict:
+        if self.model_file.exists():
+            try:
+                with open(self.model_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                pass
+        return {"voices": {}}
+
+    def _save_model(self):
+        with open(self.model_file, 'w', encoding='utf-8') as f:
+            json.dump(self.model, f, indent=2, ensure_ascii=False)
+
+    def _voice_key(self, provider: str, voice: str) -> str:
+        return f"{provider}:{voice}"
+
+    def predict(self, text: str, provider: str, voice: str = "") -> float:
+        """
+        Predict the narration duration of text.
+
+        Args:
+            text: Text to be narrated
+            provider: TTS provider (as stored in the narration cache)
+            voice: Voice identifier
+
+        Returns:
+            Predicted duration in seconds
+        """
+        features = text_features(text)
+        entry = self.model["voices"].get(self._voice_key(provider, voice))
+
+        if entry and entry.get("coefficients"):
+            coefficients = entry["coefficients"]
+            prediction = coefficients[0] + sum(
+                c * features[name] for c, name in zip(coefficients[1:], FEATURES)
+            )
+            if prediction > 0:
+                return round(prediction, 2)
+
+        rate = (entry or {}).get("seconds_per_syllable") or self._global_rate()
+        return round(features["syllables"] * rate, 2)
+
+    def observe(self, text: str, provider: str, voice: str, duration: float):
+        """
+        Add a measured narration and refit that voice's model.
+
+        Args:
+            text: Narrated text
+            provider: TTS provider
+            voice: Voice identifier
+            duration: Measured audio duration in seconds
+        """
+        if not duration or duration <= 0 or not text.strip():
+            return
+
+        features = text_features(text)
+        text_key = hashlib.md5(text.encode()).hexdigest()[:12]
+
+        with self._lock:
+            entry = self.model["voices"].setdefault(
+                self._voice_key(provider, voice), {"samples": {}}
+            )
+            samples = entry["samples"]
+            # Re-observing the same text (cache hit) replaces the sample
+            samples.pop(text_key, None)
+            samples[text_key] = [features[name] for name in FEATURES] + [round(duration, 3)]
+            while len(samples) > MAX_SAMPLES:
+                samples.pop(next(iter(samples)))
+
+            self._refit(entry)
+            self._save_model()
+
+    def _refit(self, entry: Dict):
+        """Recompute coefficients and the fallback syllable rate."""
+        rows = list(entry["samples"].values())
+        syllables = sum(row[2] for row in rows)
+        entry["seconds_per_syllable"] = sum(row[-1] for row in rows) / syllables if syllables else None
+        entry["coefficients"] = self._least_squares(rows) if len(rows) >= MIN_SAMPLES else None
+
+    def _least_squares(self, rows: List[List[float]]) -> Optional[List[float]]:
+        """Ridge-regularized least squares: duration ~ 1 + chars + words + syllables."""
+        if not NUMPY_AVAILABLE:
+            return None
+
+        data = np.array(rows, dtype=float)
+        X = np.column_stack([np.ones(len(data)), data[:, :-1]])
+        y = data[:, -1]
+
+        # Scale columns so the ridge term treats every feature alike
+        scale = np.abs(X).max(axis=0)
+        scale[scale == 0] = 1.0
+        Xs = X / scale
+
+        penalty = np.sqrt(RIDGE) * np.eye(Xs.shape[1])
+        penalty[0, 0] = 0.0  # Don't shrink the intercept
+        A = np.vstack([Xs, penalty])
+        b = np.concatenate([y, np.zeros(Xs.shape[1])])
+        solution, *_ = np.linalg.lstsq(A, b, rcond=None)
+
+        return [round(float(c), 6) for c in solution / scale]
+
+    def _global_rate(self) -> float:
+        """Seconds per syllable over every voice (default when there is no history)."""
+        rates = [
+            entry["seconds_per_syllable"]
+            for entry in self.model["voices"].values()
+            if entry.get("seconds_per_syllable")
+        ]
+        return sum(rates) / len(rates) if rates else DEFAULT_SECONDS_PER_SYLLABLE
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """Samples and fit status per voice."""
+        return {
+            key: {
+                "samples": len(entry["samples"]),
+                "fitted": bool(entry.get("coefficients")),
+                "seconds_per_syllable": entry.get("seconds_per_syllable")
+            }
+            for key, entry in self.model["voices"].items()
+        }
+
+# Global instance
+duration_predictor = DurationPredictor()
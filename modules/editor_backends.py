@@ -0,0 +1,232 @@
+"""
+Video editor backend registry.
+Picks the fastest available editor (FFmpeg or MoviePy) per profile and
+resolution using a short calibration render cached per host.
+"""
+
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from config.settings import settings
+
+def _load_ffmpeg_editor():
+    from modules.ffmpeg_video_editor import ffmpeg_video_editor
+    return ffmpeg_video_editor
+
+def _load_moviepy_editor():
+    from modules.video_editor import video_editor
+    return video_editor
+
+# Backend name -> lazy loader, in default preference order
+BACKENDS: Dict[str, Callable] = {
+    "ffmpeg": _load_ffmpeg_editor,
+    "moviepy": _load_moviepy_editor,
+}
+
+CALIBRATION_SCRIPT = {
+    "hook": "Teste de calibração do editor",
+    "body": "Este vídeo curto mede a velocidade de renderização",
+    "outro": "Fim do teste",
+    "visual_keywords": ["teste"],
+    "duration_estimate": 2
+}
+
+class EditorBackendRegistry:
+    """Loads editor backends lazily and selects the fastest one for this host."""
+
+    def __init__(self):
+        self.benchmark_file = settings.DATA_DIR / "editor_benchmark.json"
+        self._editors = {}
+        self._unavailable = {}
+
+    def get(self, name: str):
+        """Return the editor instance for a backend, or None if unavailable."""
+        if name not in BACKENDS:
+            raise ValueError(f"Editor desconhecido: {name} (opções: {', '.join(BACKENDS)})")
+
+        if name in self._editors:
+            return self._editors[name]
+        if name in self._unavailable:
+            return None
+
+        try:
+            editor = BACKENDS[name]()
+        except Exception as e:
+            editor = None
+            self._unavailable[name] = str(e)
+
+        if editor is None:
+            self._unavailable.setdefault(name, "não instalado")
+            return None
+
+        self._editors[name] = editor
+        return editor
+
+    def available(self) -> List[str]:
+        """Names of backends that can be loaded on this host."""
+        return [name for name in BACKENDS if self.get(name) is not None]
+
+    def select(
+        self,
+        override: Optional[str] = None,
+        profile: Optional[str] = None,
+        recalibrate: bool = False
+    ):
+        """
+        Select an editor backend.
+
+        Args:
+            override: Backend name forced by the user ("auto" or None to benchmark)
+            profile: Render profile name (part of the cache key)
+            recalibrate: Ignore cached benchmark results
+
+        Returns:
+            Tuple (backend name, editor instance), or (None, None) if none available
+        """
+        override = override or settings.VIDEO_EDITOR
+        if override and override != "auto":
+            editor = self.get(override)
+            if editor is None:
+                reason = self._unavailable.get(override, "")
+                print(f"⚠️  Editor '{override}' indisponível ({reason}), usando seleção automática")
+            else:
+                return override, editor
+
+        candidates = self.available()
+        if not candidates:
+            return None, None
+        if len(candidates) == 1:
+            return candidates[0], self.get(candidates[0])
+
+        profile = profile or settings.EDITOR_PROFILE
+        key = f"{profile}@{settings.VIDEO_WIDTH}x{settings.VIDEO_HEIGHT}"
+
+        data = self._load_results()
+        entry = data["results"].get(key)
+        if recalibrate or not entry or entry.get("selected") not in candidates:
+            entry = self._calibrate(candidates)
+            if entry:
+                data["results"][key] = entry
+                self._save_results(data)
+
+        if not entry:
+            # Calibration failed: fall back to preference order
+            return candidates[0], self.get(candidates[0])
+
+        name = entry["selected"]
+        print(f"🎞️  Editor selecionado: {name} ({key})")
+        return name, self.get(name)
+
+    def _fingerprint(self) -> Dict:
+        """Host data that invalidates cached benchmarks when it changes."""
+        ffmpeg_version = ""
+        try:
+            result = subprocess.run(['ffmpeg', '-version'], capture_output=True, text=True, check=True)
+            ffmpeg_version = result.stdout.splitlines()[0]
+        except Exception:
+            pass
+
+        return {
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+            "python": sys.version.split()[0],
+            "ffmpeg": ffmpeg_version,
+        }
+
+    def _load_results(self) -> Dict:
+        """Load cached results; discard them if the host changed."""
+        fingerprint = self._fingerprint()
+        if self.benchmark_file.exists():
+            try:
+                with open(self.benchmark_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get("fingerprint") == fingerprint:
+                    return data
+                print("🔄 Host alterado, benchmark de editores será refeito")
+            except (OSError, ValueError):
+                pass
+        return {"fingerprint": fingerprint, "results": {}}
+
+    def _save_results(self, data: Dict):
+        with open(self.benchmark_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+    def _make_calibration_inputs(self, work_dir: Path, seconds: float):
+        """Create a synthetic narration and background clip with ffmpeg."""
+        narration = work_dir / "calibration.mp3"
+        background = work_dir / "calibration_bg.mp4"
+
+        commands = [
+            [
+                'ffmpeg', '-y', '-f', 'lavfi',
+                '-i', f'sine=frequency=220:duration={seconds}',
+                '-c:a', 'libmp3lame', str(narration)
+            ],
+            [
+                'ffmpeg', '-y', '-f', 'lavfi',
+                '-i', f'testsrc2=size=1280x720:rate={settings.VIDEO_FPS}:duration={seconds}',
+                '-c:v', 'libx264', '-preset', 'ultrafast', '-pix_fmt', 'yuv420p',
+                str(background)
+            ],
+        ]
+        for cmd in commands:
+            subprocess.run(cmd, capture_output=True, check=True)
+
+        return narration, background
+
+    def _calibrate(self, candidates: List[str]) -> Optional[Dict]:
+        """Time a short render with each backend and pick the fastest."""
+        seconds = settings.EDITOR_CALIBRATION_SECONDS
+        print(f"⏱️  Calibrando editores ({', '.join(candidates)}) com render de {seconds}s...")
+
+        work_dir = Path(tempfile.mkdtemp(prefix="editor_calibration_"))
+        timings = {}
+        try:
+            narration, background = self._make_calibration_inputs(work_dir, seconds)
+
+            for name in candidates:
+                editor = self.get(name)
+                original_output = editor.output_dir
+                editor.output_dir = work_dir
+                try:
+                    start = time.perf_counter()
+                    editor.create_video(
+                        script=dict(CALIBRATION_SCRIPT),
+                        narration_audio=narration,
+                        background_videos=[background],
+                        background_music=None,
+                        output_filename=f"calibration_{name}.mp4"
+                    )
+                    timings[name] = round(time.perf_counter() - start, 3)
+                    print(f"   {name}: {timings[name]:.2f}s")
+                except Exception as e:
+                    print(f"   ⚠️  {name} falhou na calibração: {e}")
+                finally:
+                    editor.output_dir = original_output
+        except Exception as e:
+            print(f"⚠️  Calibração indisponível: {e}")
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        if not timings:
+            return None
+
+        return {
+            "timings": timings,
+            "selected": min(timings, key=timings.get),
+            "measured_at": datetime.now().isoformat(timespec="seconds")
+        }
+
+# Global instance
+editor_registry = EditorBackendRegistry()
@@ -76,7 +76,7 @@ class FFmpegVideoEditor:
         # Step 3: Add TikTok-style captions
         print("   📝 Adicionando legendas estilo TikTok...")
         temp_with_captions = self.output_dir / "temp_with_captions.mp4"
-        self._add_captions(temp_with_narration, script, duration, temp_with_captions)
+        self._add_captions(temp_with_narration, script, duration, temp_with_captions, narration_audio)
         
         # Step 4: Skip background music temporarily (FFmpeg mixer issue)
         print("   ⏭️  Pulando música de fundo (temporariamente)")
@@ -226,19 +226,19 @@ class FFmpegVideoEditor:
         
         print(f"   ✅ Música adicionada: {output.stat().st_size / 1024 / 1024:.1f} MB")
     
-    def _add_captions(self, video: Path, script: dict, duration: float, output: Path):
-        """Add TikTok-style captions to video using FFmpeg subtitles."""
+    def _add_captions(self, video: Path, script: dict, duration: float, output: Path, narration: Optional[Path] = None):
+        """Add TikTok-style karaoke captions to video (ASS burned in by libass)."""
         try:
-            # Generate SRT subtitle file
-            srt_path = caption_generator.create_caption_file(script, duration, video)
+            # Generate ASS subtitle file (styles + per-word \k timing)
+            caption_path = caption_generator.create_caption_file(script, duration, video, narration)
             
-            if not srt_path or not srt_path.exists():
+            if not caption_path or not caption_path.exists():
                 print("   ⚠️  Legendas não criadas, continuando sem legendas...")
                 video.replace(output)
                 return
             
             # Get FFmpeg subtitle filter
-            subtitle_filter = caption_generator.get_ffmpeg_subtitle_filter(srt_path)
+            subtitle_filter = caption_generator.get_ffmpeg_subtitle_filter(caption_path)
             
             # Apply subtitles with FFmpeg
             cmd = [
@@ -260,9 +260,9 @@ class FFmpegVideoEditor:
             else:
                 print(f"   ✅ Legendas adicionadas com sucesso!")
             
-            # Cleanup SRT file
-            if srt_path.exists():
-                srt_path.unlink()
+            # Cleanup subtitle file
+            if caption_path.exists():
+                caption_path.unlink()
                 
         except Exception as e:
             print(f"   ⚠️  Erro ao processar legendas: {e}")
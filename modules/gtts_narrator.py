@@ -1,10 +1,9 @@
 """
 gTTS-based voice narrator as fallback for when ElevenLabs/Google Cloud isn't available.
-100% free, no API key needed, works offline.
+100% free, no API key needed (still requires network access).
 """
 
 from pathlib import Path
-import hashlib
 from typing import Dict
 
 try:
@@ -13,7 +12,7 @@ try:
 except ImportError:
     GTTS_AVAILABLE = False
 
-from config.settings import settings
+from modules.narration_cache import narration_cache
 
 class GTTSNarrator:
     """Simple TTS using gTTS (Google Text-to-Speech) - no API key needed."""
@@ -22,20 +21,20 @@ class GTTSNarrator:
         if not GTTS_AVAILABLE:
             raise ImportError("gTTS não instalado. Execute: pip install gTTS")
         
-        self.cache_dir = settings.DATA_DIR / "audio_cache"
-        self.cache_dir.mkdir(exist_ok=True)
+        self.cache_dir = narration_cache.cache_dir
     
     def generate(self, script: Dict) -> Path:
         """Generate narration using gTTS."""
         full_text = f"{script['hook']} {script['body']} {script['outro']}"
         
-        # Check cache
-        cache_key = hashlib.md5(full_text.encode()).hexdigest()
-        cache_file = self.cache_dir / f"gtts_{cache_key}.mp3"
-        
-        if cache_file.exists():
+        # Check cache (same key VoiceNarrator uses for its gTTS fallback)
+        cache_key = narration_cache.make_key(full_text, provider="gtts", voice="pt", model="gtts")
+        cached = narration_cache.get(cache_key)
+        if cached:
             print("📦 Áudio encontrado no cache (gTTS)")
-            return cache_file
+            return cached
+        
+        cache_file = narration_cache.path_for(cache_key)
         
         print("🔊 Gerando narração com gTTS (grátis, sem API key)...")
         
@@ -43,6 +42,8 @@ class GTTSNarrator:
             # Generate audio
             tts = gTTS(text=full_text, lang='pt', slow=False)
             tts.save(str(cache_file))
+            narration_cache.put(cache_key, cache_file, provider="gtts", voice="pt", model="gtts",
+                                characters=len(full_text))
             
             print(f"✅ Narração gerada: {cache_file.name}")
             return cache_file
@@ -0,0 +1,186 @@
+"""
+Shared HTTP client for REST providers (Pexels, Pixabay, ElevenLabs, OpenRouter).
+Keeps one keep-alive session per host, applies connect/read timeouts,
+retries transient failures with jittered backoff (honoring Retry-After)
+and bounds concurrent requests per host.
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+from config.settings import settings
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Statuses where the server did not process the request, safe to retry for POST
+SAFE_RETRY_STATUSES = {429, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+class HTTPClient:
+    """Pooled, retrying HTTP client shared by every REST integration."""
+
+    def __init__(self):
+        self._sessions: Dict[str, requests.Session] = {}
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _host(self, url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def session(self, url: str) -> requests.Session:
+        """Keep-alive session for the URL's host (created on first use)."""
+        host = self._host(url)
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=settings.HTTP_MAX_PER_HOST
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._sessions[host] = session
+                self._slots[host] = threading.BoundedSemaphore(settings.HTTP_MAX_PER_HOST)
+            return session
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        timeout: Optional[Union[float, Tuple[float, float]]] = None,
+        retries: Optional[int] = None,
+        **kwargs
+    ) -> requests.Response:
+        """
+        Send a request through the host's pool.
+
+        Connection errors and 429/5xx responses are retried with jittered
+        exponential backoff; a Retry-After header overrides the delay.
+        Non-idempotent methods (POST) are only retried when the server
+        can't have processed the request (connect timeouts, connection
+        refused / DNS failures, 429/502/503/504); a connection dropped
+        after the request was sent is not retried.
+
+        With stream=True the host slot is held until the response is
+        closed, so callers should close it (or use it as a context manager).
+
+        Args:
+            method: HTTP method
+            url: Full URL
+            timeout: Seconds, or (connect, read); defaults to HTTP_*_TIMEOUT
+            retries: Extra attempts; defaults to HTTP_MAX_RETRIES
+            **kwargs: Passed to requests (headers, params, json, stream, ...)
+
+        Returns:
+            The final response (may still be an error status)
+        """
+        method = method.upper()
+        session = self.session(url)
+        slot = self._slots[self._host(url)]
+        timeout = timeout or (settings.HTTP_CONNECT_TIMEOUT, settings.HTTP_READ_TIMEOUT)
+        retries = settings.HTTP_MAX_RETRIES if retries is None else retries
+        idempotent = method in IDEMPOTENT_METHODS
+
+        attempt = 0
+        while True:
+            slot.acquire()
+            released = False
+
+            def release():
+                nonlocal released
+                if not released:
+                    released = True
+                    slot.release()
+
+            try:
+                response = session.request(method, url, timeout=timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                release()
+                # A read timeout or dropped connection on POST may have been processed: don't repeat it
+                retryable = idempotent or self._not_sent(e)
+                if attempt >= retries or not retryable:
+                    raise
+                delay = self._backoff(attempt)
+                print(f"   🔁 {self._host(url)}: {type(e).__name__}, nova tentativa em {delay:.1f}s")
+            except BaseException:
+                release()
+                raise
+            else:
+                statuses = RETRY_STATUSES if idempotent else SAFE_RETRY_STATUSES
+                if response.status_code not in statuses or attempt >= retries:
+                    if kwargs.get("stream"):
+                        original_close = response.close
+
+                        def close():
+                            try:
+                                original_close()
+                            finally:
+                                release()
+
+                        response.close = close
+                    else:
+                        release()
+                    return response
+
+                delay = self._retry_after(response) or self._backoff(attempt)
+                response.close()
+                release()
+                print(f"   🔁 {self._host(url)}: HTTP {response.status_code}, nova tentativa em {delay:.1f}s")
+
+            time.sleep(delay)
+            attempt += 1
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def _not_sent(self, error: Exception) -> bool:
+        """Whether a request failed before reaching the server (no connection was made)."""
+        if isinstance(error, requests.ConnectTimeout):
+            return True
+        if isinstance(error, requests.Timeout):
+            return False
+        # requests wraps urllib3's MaxRetryError, whose reason is the connect error
+        reason = error.args[0] if error.args else None
+        return isinstance(getattr(reason, "reason", reason), NewConnectionError)
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff."""
+        cap = settings.HTTP_BACKOFF_BASE * (2 ** attempt)
+        return random.uniform(0, min(cap, settings.HTTP_MAX_RETRY_AFTER))
+
+    def _retry_after(self, response: requests.Response) -> Optional[float]:
+        """Delay requested by the server (seconds or HTTP date), capped."""
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            delay = float(value)
+        except ValueError:
+            try:
+                delay = parsedate_to_datetime(value).timestamp() - time.time()
+            except (TypeError, ValueError):
+                return None
+        return min(max(delay, 0.0), settings.HTTP_MAX_RETRY_AFTER)
+
+    def close(self):
+        """Close every pooled connection."""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+            self._slots.clear()
+
+# Global instance
+http_client = HTTPClient()
@@ -0,0 +1,98 @@
+"""
+Incremental JSON field parser for streamed LLM output.
+Reports each top-level field of a JSON object as soon as its value is
+complete, while the rest of the object is still being generated.
+"""
+
+import json
+from typing import Any, Dict, List, Tuple
+
+class JSONFieldStream:
+    """
+    Feed text chunks, get back (key, value) pairs of completed top-level fields.
+
+    Text before the first "{" (e.g. a ```json fence) and after the closing
+    "}" is ignored. Values are decoded with json.loads, so a malformed
+    value raises ValueError.
+    """
+
+    def __init__(self):
+        self.fields: Dict[str, Any] = {}
+        self.done = False
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._key = None
+        self._value_start = None
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        Consume a chunk of the response.
+
+        Returns:
+            Fields completed by this chunk, in order
+        """
+        completed = []
+        if self.done:
+            return completed
+
+        self._text += chunk
+        text = self._text
+        while self._pos < len(text) and not self.done:
+            ch = text[self._pos]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        if self._value_start is None:
+                            self._key = json.loads(text[self._string_start:self._pos + 1])
+                        else:
+                            # String values are complete at their closing quote
+                            completed.append(self._complete(self._pos + 1))
+            elif self._depth == 0:
+                if ch == "{":
+                    self._depth = 1
+            elif ch == '"':
+                self._in_string = True
+                self._string_start = self._pos
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                if self._depth == 1:
+                    if self._value_start is not None:
+                        completed.append(self._complete(self._pos))
+                    self.done = True
+                self._depth -= 1
+                if self._depth == 1 and self._value_start is not None:
+                    # Closed an object/array value
+                    completed.append(self._complete(self._pos + 1))
+            elif self._depth == 1:
+                if ch == ":" and self._key is not None:
+                    self._value_start = self._pos + 1
+                elif ch == "," and self._value_start is not None:
+                    # Number, true/false/null
+                    completed.append(self._complete(self._pos))
+
+            self._pos += 1
+
+        return [field for field in completed if field is not None]
+
+    def _complete(self, end: int):
+        """Decode the current value (text up to end) and record the field."""
+        raw = self._text[self._value_start:end].strip()
+        key = self._key
+        self._key = None
+        self._value_start = None
+        if not raw:
+            return None
+        value = json.loads(raw)
+        self.fields[key] = value
+        return key, value
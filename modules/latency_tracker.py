@@ -0,0 +1,90 @@
+"""
+Script-generation latency tracker.
+Keeps recent response times per LLM provider to learn when a request is
+unusually slow (p90), and the recent hedge rate so hedging stays capped.
+"""
+
+import json
+import threading
+from typing import Dict, List, Optional
+
+from config.settings import settings
+
+WINDOW = 50          # Latency samples kept per provider
+RATE_WINDOW = 100    # Recent requests used to compute the hedge rate
+MIN_SAMPLES = 5      # No hedging until a provider's p90 is learned
+
+class LatencyTracker:
+    """Rolling latency samples and hedge decisions for LLM providers."""
+
+    def __init__(self):
+        self.state_file = settings.DATA_DIR / "llm_latency.json"
+        self._lock = threading.Lock()
+        self.samples: Dict[str, List[float]] = {}
+        self.hedged: List[bool] = []
+        self._load()
+
+    def _load(self):
+        if not self.state_file.exists():
+            return
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.samples = data.get("samples", {})
+        self.hedged = data.get("hedged", [])
+
+    def _save(self):
+        with open(self.state_file, 'w', encoding='utf-8') as f:
+            json.dump({"samples": self.samples, "hedged": self.hedged}, f, indent=2)
+
+    def observe(self, provider: str, seconds: float):
+        """Record the latency of a successful request."""
+        with self._lock:
+            samples = self.samples.setdefault(provider, [])
+            samples.append(round(seconds, 3))
+            del samples[:-WINDOW]
+            self._save()
+
+    def p90(self, provider: str) -> Optional[float]:
+        """90th percentile latency in seconds (None until MIN_SAMPLES are in)."""
+        samples = sorted(self.samples.get(provider, []))
+        if len(samples) < MIN_SAMPLES:
+            return None
+        return samples[min(int(len(samples) * 0.9), len(samples) - 1)]
+
+    def hedge_rate(self) -> float:
+        """Share of recent requests that were hedged."""
+        if not self.hedged:
+            return 0.0
+        return sum(self.hedged) / len(self.hedged)
+
+    def hedge_delay(self, provider: str) -> Optional[float]:
+        """
+        Seconds to wait for provider before hedging.
+
+        Returns:
+            The learned p90, or None if hedging shouldn't happen (p90 not
+            learned yet or SCRIPT_HEDGE_MAX_RATE reached)
+        """
+        if self.hedge_rate() >= settings.SCRIPT_HEDGE_MAX_RATE:
+            return None
+        return self.p90(provider)
+
+    def record_request(self, hedged: bool):
+        """Count a request toward the hedge rate."""
+        with self._lock:
+            self.hedged.append(hedged)
+            del self.hedged[:-RATE_WINDOW]
+            self._save()
+
+    def get_stats(self) -> Dict:
+        """p90 per provider and the current hedge rate."""
+        return {
+            "p90": {provider: self.p90(provider) for provider in self.samples},
+            "hedge_rate": self.hedge_rate()
+        }
+
+# Global instance
+latency_tracker = LatencyTracker()
@@ -0,0 +1,98 @@
+"""
+Process-wide LLM SDK clients.
+Imports each SDK lazily on first use and keeps one configured client per
+provider, shared by the script, topic and metadata generators.
+"""
+
+import threading
+from typing import Dict, Optional, Tuple
+
+from config.settings import settings
+
+GEMINI_MODEL = "gemini-2.5-flash"
+
+def _field(obj, name: str):
+    """Attribute of an SDK object or key of a plain dict."""
+    if obj is None:
+        return None
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
+
+def openai_usage(usage) -> Dict[str, int]:
+    """Prompt, cached-prompt and output tokens from an OpenAI-style usage (object or dict)."""
+    details = _field(usage, "prompt_tokens_details")
+    return {
+        "prompt": _field(usage, "prompt_tokens") or 0,
+        "cached": _field(details, "cached_tokens") or 0,
+        "output": _field(usage, "completion_tokens") or 0,
+    }
+
+def gemini_usage(response) -> Dict[str, int]:
+    """Prompt, cached-prompt and output tokens of a Gemini response."""
+    metadata = _field(response, "usage_metadata")
+    return {
+        "prompt": _field(metadata, "prompt_token_count") or 0,
+        "cached": _field(metadata, "cached_content_token_count") or 0,
+        "output": _field(metadata, "candidates_token_count") or 0,
+    }
+
+class LLMClientRegistry:
+    """Thread-safe cache of SDK clients (Gemini models, OpenAI client)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._genai = None
+        self._gemini_models: Dict[Tuple[str, Optional[str]], object] = {}
+        self._openai_client = None
+
+    def gemini(self, model_name: str = GEMINI_MODEL, system_instruction: Optional[str] = None):
+        """
+        Configured Gemini GenerativeModel (created once per model/instruction).
+
+        Args:
+            model_name: Gemini model id
+            system_instruction: Optional system prompt bound to the model
+
+        Returns:
+            google.generativeai.GenerativeModel
+        """
+        key = (model_name, system_instruction)
+        model = self._gemini_models.get(key)
+        if model is not None:
+            return model
+
+        with self._lock:
+            if self._genai is None:
+                try:
+                    import google.generativeai as genai
+                except ImportError:
+                    raise Exception("google-generativeai não instalado. Execute: pip install google-generativeai")
+                genai.configure(api_key=settings.GEMINI_API_KEY)
+                self._genai = genai
+
+            model = self._gemini_models.get(key)
+            if model is None:
+                if system_instruction:
+                    model = self._genai.GenerativeModel(model_name, system_instruction=system_instruction)
+                else:
+                    model = self._genai.GenerativeModel(model_name)
+                self._gemini_models[key] = model
+            return model
+
+    def openai(self):
+        """Shared OpenAI client (keeps its HTTP connection pool warm)."""
+        if self._openai_client is not None:
+            return self._openai_client
+
+        with self._lock:
+            if self._openai_client is None:
+                try:
+                    from openai import OpenAI
+                except ImportError:
+                    raise Exception("openai não instalado. Execute: pip install openai")
+                self._openai_client = OpenAI(api_key=settings.OPENAI_API_KEY)
+            return self._openai_client
+
+# Global instance
+llm_clients = LLMClientRegistry()
@@ -0,0 +1,93 @@
+"""
+Offline TTS using a local speech engine (espeak-ng / espeak).
+No network, no quota: used for drafts, benchmarks and days when the
+free tiers are exhausted.
+"""
+
+import shutil
+import subprocess
+import threading
+from typing import Iterator, Optional
+
+from config.settings import settings
+
+# Engines tried when LOCAL_TTS_ENGINE is not installed
+ENGINES = ["espeak-ng", "espeak"]
+
+STREAM_CHUNK_SIZE = 16 * 1024
+
+class LocalTTS:
+    """Runs a local speech engine piped into ffmpeg to produce MP3."""
+
+    def __init__(self):
+        self.engine = self._find_engine()
+
+    def _find_engine(self) -> Optional[str]:
+        for name in [settings.LOCAL_TTS_ENGINE] + ENGINES:
+            if name and shutil.which(name):
+                return name
+        return None
+
+    @property
+    def available(self) -> bool:
+        return self.engine is not None and shutil.which('ffmpeg') is not None
+
+    @property
+    def voice(self) -> str:
+        return settings.LOCAL_TTS_VOICE
+
+    @property
+    def rate(self) -> int:
+        return settings.LOCAL_TTS_RATE
+
+    def stream(self, text: str) -> Iterator[bytes]:
+        """
+        Synthesize text as an MP3 byte stream.
+
+        The engine writes WAV to stdout and ffmpeg encodes it as it
+        arrives, so each call is its own pair of processes and calls can
+        run in parallel.
+        """
+        if not self.available:
+            raise Exception("espeak-ng não instalado. Execute: sudo apt install espeak-ng ffmpeg")
+
+        engine = subprocess.Popen(
+            [self.engine, '-v', self.voice, '-s', str(self.rate), '--stdout', '--stdin'],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+        encoder = subprocess.Popen(
+            ['ffmpeg', '-v', 'error', '-f', 'wav', '-i', 'pipe:0',
+             '-ac', '1', '-c:a', 'libmp3lame', '-q:a', '4', '-f', 'mp3', 'pipe:1'],
+            stdin=engine.stdout, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        # Only the encoder reads the engine's output
+        engine.stdout.close()
+
+        def feed():
+            # Written from a thread so a long text can't deadlock the pipes
+            try:
+                engine.stdin.write(text.encode('utf-8'))
+            except OSError:
+                pass  # Engine died; reported through its exit status
+            finally:
+                engine.stdin.close()
+
+        feeder = threading.Thread(target=feed, daemon=True)
+        feeder.start()
+
+        try:
+            for chunk in iter(lambda: encoder.stdout.read(STREAM_CHUNK_SIZE), b""):
+                yield chunk
+        finally:
+            encoder.stdout.close()
+            encoder_status = encoder.wait()
+            engine_status = engine.wait()
+            feeder.join()
+            error = encoder.stderr.read().decode(errors='ignore').strip()
+            encoder.stderr.close()
+
+        if engine_status != 0 or encoder_status != 0:
+            raise Exception(f"TTS local falhou ({self.engine}={engine_status}, ffmpeg={encoder_status}): {error}")
+
+# Global instance
+local_tts = LocalTTS()
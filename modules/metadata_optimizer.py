@@ -3,9 +3,13 @@ Metadata optimizer for generating SEO-optimized titles, descriptions, and hashta
 """
 
 import json
+import time
 from typing import Dict
 from config.settings import settings
-from config.prompts import METADATA_OPTIMIZATION_PROMPT
+from config.prompts import METADATA_SYSTEM_PROMPT, METADATA_TASK_PROMPT
+from modules.budget_controller import budget
+from modules.llm_clients import llm_clients, gemini_usage, openai_usage
+from modules.rate_governor import rate_governor
 
 class MetadataOptimizer:
     """Generates optimized metadata for videos."""
@@ -45,13 +49,13 @@ class MetadataOptimizer:
     
     def _generate_with_gemini(self, script: str) -> Dict:
         """Generate metadata using Gemini."""
-        import google.generativeai as genai
-        genai.configure(api_key=settings.GEMINI_API_KEY)
+        rate_governor.acquire("gemini")
+        model = llm_clients.gemini(system_instruction=METADATA_SYSTEM_PROMPT)
         
-        model = genai.GenerativeModel('gemini-2.5-flash')
-        
-        prompt = METADATA_OPTIMIZATION_PROMPT.format(script=script)
+        prompt = METADATA_TASK_PROMPT.format(script=script)
+        start = time.perf_counter()
         response = model.generate_content(prompt)
+        budget.track_llm_usage("gemini", gemini_usage(response), time.perf_counter() - start)
         
         # Parse response
         text = response.text
@@ -64,19 +68,21 @@ class MetadataOptimizer:
     
     def _generate_with_openai(self, script: str) -> Dict:
         """Generate metadata using OpenAI."""
-        from openai import OpenAI
-        client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        rate_governor.acquire("openai")
+        client = llm_clients.openai()
         
-        prompt = METADATA_OPTIMIZATION_PROMPT.format(script=script)
+        prompt = METADATA_TASK_PROMPT.format(script=script)
         
+        start = time.perf_counter()
         response = client.chat.completions.create(
             model="gpt-4o-mini",
             messages=[
-                {"role": "system", "content": "Você é um especialista em SEO para YouTube e TikTok."},
+                {"role": "system", "content": METADATA_SYSTEM_PROMPT},
                 {"role": "user", "content": prompt}
             ],
             response_format={"type": "json_object"}
         )
+        budget.track_llm_usage("openai", openai_usage(response.usage), time.perf_counter() - start)
         
         return json.loads(response.choices[0].message.content)
     
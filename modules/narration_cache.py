@@ -0,0 +1,243 @@
+"""
+Indexed narration cache.
+Keys include provider, voice, model and voice settings; a SQLite index
+tracks size, duration and last access and enforces a disk budget (LRU).
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config.settings import settings
+from modules.audio_utils import probe_duration
+
+class NarrationCache:
+    """Audio cache with an O(1) key index and LRU eviction."""
+
+    def __init__(self):
+        self.cache_dir = settings.DATA_DIR / "audio_cache"
+        self.cache_dir.mkdir(exist_ok=True)
+        self.db_path = self.cache_dir / "index.db"
+        self.max_bytes = int(settings.AUDIO_CACHE_MAX_MB * 1024 * 1024)
+        self._lock = threading.Lock()
+        self._init_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _init_database(self):
+        """Create the index; adopt files cached before the index existed."""
+        is_new = not self.db_path.exists()
+
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS narrations (
+                key TEXT PRIMARY KEY,
+                filename TEXT NOT NULL,
+                provider TEXT,
+                voice TEXT,
+                model TEXT,
+                characters INTEGER,
+                size INTEGER NOT NULL,
+                duration REAL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_narrations_last_access ON narrations(last_access)')
+        # describe() looks entries up by file (legacy entries' keys don't match their filenames)
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_narrations_filename ON narrations(filename)')
+        conn.commit()
+
+        if is_new:
+            # Legacy files (text-only keys) become evictable entries
+            for f in self.cache_dir.glob("*.mp3"):
+                stat = f.stat()
+                cursor.execute('''
+                    INSERT OR IGNORE INTO narrations
+                    (key, filename, provider, size, created_at, last_access)
+                    VALUES (?, ?, 'legacy', ?, ?, ?)
+                ''', (f"legacy:{f.stem}", f.name, stat.st_size, stat.st_mtime, stat.st_mtime))
+            conn.commit()
+
+        conn.close()
+
+    def make_key(
+        self,
+        text: str,
+        provider: str,
+        voice: str = "",
+        model: str = "",
+        voice_settings: Optional[Dict] = None
+    ) -> str:
+        """Cache key for a synthesis request (same text, other voice = other key)."""
+        payload = json.dumps({
+            "text": text,
+            "provider": provider,
+            "voice": voice,
+            "model": model,
+            "settings": voice_settings or {}
+        }, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+    def path_for(self, key: str) -> Path:
+        """Where the audio for a key is (or will be) stored."""
+        return self.cache_dir / f"{key}.mp3"
+
+    def get(self, key: str) -> Optional[Path]:
+        """Return the cached file for key and mark it as recently used."""
+        if not settings.CACHE_AGGRESSIVE:
+            return None
+
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute('SELECT filename FROM narrations WHERE key = ?', (key,))
+        row = cursor.fetchone()
+
+        path = None
+        if row:
+            candidate = self.cache_dir / row[0]
+            if candidate.exists():
+                cursor.execute('UPDATE narrations SET last_access = ? WHERE key = ?', (time.time(), key))
+                path = candidate
+            else:
+                # File removed behind our back
+                cursor.execute('DELETE FROM narrations WHERE key = ?', (key,))
+            conn.commit()
+
+        conn.close()
+        return path
+
+    def put(
+        self,
+        key: str,
+        path: Path,
+        provider: str = "",
+        voice: str = "",
+        model: str = "",
+        characters: int = 0
+    ):
+        """Register a freshly synthesized file and enforce the disk budget."""
+        if not path.exists():
+            return
+
+        now = time.time()
+        conn = self._connect()
+        conn.execute('''
+            INSERT OR REPLACE INTO narrations
+            (key, filename, provider, voice, model, characters, size, duration, created_at, last_access)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            key, path.name, provider, voice, model, characters,
+            path.stat().st_size, probe_duration(path), now, now
+        ))
+        conn.commit()
+        conn.close()
+
+        self.evict()
+
+    def evict(self) -> int:
+        """Delete least recently used files until the cache fits the budget."""
+        if self.max_bytes <= 0:
+            return 0
+
+        removed = 0
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+            cursor.execute('SELECT COALESCE(SUM(size), 0) FROM narrations')
+            total = cursor.fetchone()[0]
+
+            while total > self.max_bytes:
+                cursor.execute('''
+                    SELECT key, filename, size FROM narrations
+                    ORDER BY last_access ASC LIMIT 50
+                ''')
+                rows = cursor.fetchall()
+                if not rows:
+                    break
+
+                for key, filename, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    (self.cache_dir / filename).unlink(missing_ok=True)
+                    cursor.execute('DELETE FROM narrations WHERE key = ?', (key,))
+                    total -= size
+                    removed += 1
+
+                conn.commit()
+
+            conn.close()
+
+        if removed:
+            print(f"🧹 Cache de áudio: {removed} arquivo(s) antigo(s) removido(s)")
+        return removed
+
+    def describe(self, path: Path) -> Optional[Dict]:
+        """Index entry (provider, voice, model, characters, duration) for a cached file."""
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT provider, voice, model, characters, duration
+            FROM narrations WHERE filename = ?
+        ''', (Path(path).name,))
+        row = cursor.fetchone()
+        conn.close()
+
+        if not row:
+            return None
+        provider, voice, model, characters, duration = row
+        return {
+            "provider": provider,
+            "voice": voice,
+            "model": model,
+            "characters": characters,
+            "duration": duration
+        }
+
+    def list_entries(self, limit: int = 100) -> List[Dict]:
+        """Most recently used entries (for the dashboard)."""
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT filename, provider, voice, size, duration, last_access
+            FROM narrations
+            ORDER BY last_access DESC
+            LIMIT ?
+        ''', (limit,))
+        rows = cursor.fetchall()
+        conn.close()
+
+        return [
+            {
+                "name": filename,
+                "provider": provider,
+                "voice": voice,
+                "size_mb": size / 1024 / 1024,
+                "duration": duration,
+                "last_access": last_access
+            }
+            for filename, provider, voice, size, duration, last_access in rows
+        ]
+
+    def get_stats(self) -> Dict:
+        """Entry count and total size."""
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM narrations')
+        count, total = cursor.fetchone()
+        conn.close()
+
+        return {
+            "count": count,
+            "size_mb": total / 1024 / 1024,
+            "max_mb": self.max_bytes / 1024 / 1024
+        }
+
+# Global instance
+narration_cache = NarrationCache()
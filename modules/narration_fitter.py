@@ -0,0 +1,146 @@
+"""
+Narration time-fitting.
+Trims silences and applies pitch-preserving tempo so a narration lands on
+the video's target duration without another TTS call.
+"""
+
+import hashlib
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from config.settings import settings
+from modules.audio_utils import decode_pcm, encode_pcm, file_hash
+
+SAMPLE_RATE = 44100
+FRAME_MS = 10        # Silence detection resolution
+EDGE_MS = 80         # Silence kept before the first and after the last word
+MIN_SAVING_S = 0.05  # Smaller changes aren't worth a re-encode
+
+class NarrationFitter:
+    """Fits narration audio to a target duration."""
+
+    def __init__(self):
+        self.output_dir = settings.TEMP_DIR / "fitted"
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+    def fit(self, narration_audio: Path, target_duration: Optional[float]) -> Path:
+        """
+        Fit a narration to target_duration.
+
+        Leading/trailing silence is trimmed and inner pauses longer than
+        NARRATION_MAX_PAUSE_MS are shortened. If the result is still off
+        by more than NARRATION_FIT_TOLERANCE, atempo is applied within
+        NARRATION_MIN_TEMPO..NARRATION_MAX_TEMPO.
+
+        Args:
+            narration_audio: Narration file
+            target_duration: Desired duration in seconds (None = only trim silences)
+
+        Returns:
+            Path to the fitted file (the original path if nothing changed)
+        """
+        if not settings.NARRATION_FIT:
+            return narration_audio
+        if not NUMPY_AVAILABLE:
+            print("   ⚠️  numpy não instalado, narração não ajustada")
+            return narration_audio
+
+        params = (
+            f"{target_duration}:{settings.NARRATION_MAX_PAUSE_MS}:{settings.NARRATION_FIT_TOLERANCE}:"
+            f"{settings.NARRATION_MIN_TEMPO}:{settings.NARRATION_MAX_TEMPO}"
+        )
+        key = hashlib.sha1(f"{file_hash(narration_audio)}:{params}".encode()).hexdigest()
+        output_path = self.output_dir / f"{key}.mp3"
+        if output_path.exists():
+            return output_path
+
+        try:
+            samples = decode_pcm(narration_audio, SAMPLE_RATE)
+        except Exception as e:
+            print(f"   ⚠️  Narração não ajustada: {e}")
+            return narration_audio
+
+        original = len(samples) / SAMPLE_RATE
+        trimmed = self._trim_silences(samples)
+        duration = len(trimmed) / SAMPLE_RATE
+
+        tempo = 1.0
+        if target_duration:
+            error = duration / target_duration - 1
+            if abs(error) > settings.NARRATION_FIT_TOLERANCE:
+                tempo = duration / target_duration
+                tempo = min(max(tempo, settings.NARRATION_MIN_TEMPO), settings.NARRATION_MAX_TEMPO)
+
+        final = duration / tempo
+        if abs(original - final) < MIN_SAVING_S:
+            return narration_audio
+
+        audio_filter = f"atempo={tempo:.4f}" if abs(tempo - 1.0) > 1e-3 else None
+        encode_pcm(trimmed, output_path, SAMPLE_RATE, audio_filter)
+
+        target_info = f" (alvo {target_duration:.0f}s)" if target_duration else ""
+        tempo_info = f", tempo x{tempo:.2f}" if audio_filter else ""
+        print(f"⏱️  Narração ajustada: {original:.1f}s → {final:.1f}s{target_info}{tempo_info}")
+        return output_path
+
+    def _silent_runs(self, samples: "np.ndarray") -> Tuple[List[Tuple[int, int]], int]:
+        """Silent [start, end) frame runs and the total frame count."""
+        frame = SAMPLE_RATE * FRAME_MS // 1000
+        frame_count = len(samples) // frame
+        if frame_count == 0:
+            return [], 0
+
+        frames = samples[:frame_count * frame].reshape(frame_count, frame)
+        db = 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-12)
+
+        floor = np.percentile(db, 10)
+        peak = np.percentile(db, 95)
+        # Relative threshold, capped 40 dB below the peak so soft speech is kept
+        threshold = min(floor + 0.3 * (peak - floor), peak - 40)
+        silent = db < threshold
+
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], silent.astype(np.int8), [0]))))
+        return [(int(start), int(end)) for start, end in edges.reshape(-1, 2)], frame_count
+
+    def _trim_silences(self, samples: "np.ndarray") -> "np.ndarray":
+        """Drop edge silence and cap inner pauses at NARRATION_MAX_PAUSE_MS."""
+        runs, frame_count = self._silent_runs(samples)
+        if not runs or len(runs) == 1 and runs[0] == (0, frame_count):
+            return samples
+
+        frame = SAMPLE_RATE * FRAME_MS // 1000
+        edge = EDGE_MS // FRAME_MS
+        max_pause = settings.NARRATION_MAX_PAUSE_MS // FRAME_MS
+
+        # Frame ranges to cut out
+        cuts = []
+        for start, end in runs:
+            if start == 0:
+                cuts.append((0, max(end - edge, 0)))
+            elif end == frame_count:
+                cuts.append((min(start + edge, end), len(samples) // frame + 1))
+            elif end - start > max_pause:
+                # Keep half the allowed pause on each side of the cut
+                half = max_pause // 2
+                cuts.append((start + half, end - (max_pause - half)))
+
+        keep = []
+        cursor = 0
+        for start, end in cuts:
+            start, end = start * frame, min(end * frame, len(samples))
+            if start > cursor:
+                keep.append(samples[cursor:start])
+            cursor = max(cursor, end)
+        if cursor < len(samples):
+            keep.append(samples[cursor:])
+
+        return np.concatenate(keep) if keep else samples
+
+# Global instance
+narration_fitter = NarrationFitter()
@@ -0,0 +1,229 @@
+"""
+Quota and rate governor for external providers.
+Token buckets and daily/monthly counters live in a shared SQLite file, so
+every process on the host draws from the same allowance.
+"""
+
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from config.settings import settings
+from modules.budget_controller import ELEVENLABS_FREE_CHARS
+
+# per_minute / per_hour: request rate (token bucket, burst = the limit)
+# daily / monthly: counters in the unit passed to acquire() (requests or characters)
+PROVIDER_LIMITS: Dict[str, Dict[str, float]] = {
+    "gemini": {"per_minute": 15, "daily": 1500},
+    "openai": {"per_minute": 60},
+    "openrouter": {"per_minute": 20},
+    "google_tts": {"per_minute": 300},
+    "elevenlabs": {"per_minute": 20},
+    "elevenlabs_free": {"monthly": ELEVENLABS_FREE_CHARS},
+    "pexels": {"per_hour": 200, "monthly": 20000},
+    "pixabay": {"per_minute": 100},
+}
+
+class RateLimitExceeded(Exception):
+    """Raised when an allowance won't be available within the allowed wait."""
+
+    def __init__(self, provider: str, wait: float):
+        self.provider = provider
+        self.wait = wait
+        super().__init__(f"Limite de {provider} atingido (disponível em {wait:.0f}s)")
+
+class RateGovernor:
+    """Cross-process token buckets and quota counters."""
+
+    def __init__(self):
+        self.db_path = settings.DATA_DIR / "rate_governor.db"
+        self._init_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+        return sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+
+    def _init_database(self):
+        conn = self._connect()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS buckets (
+                provider TEXT PRIMARY KEY,
+                tokens REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS counters (
+                provider TEXT NOT NULL,
+                period TEXT NOT NULL,
+                used REAL NOT NULL,
+                PRIMARY KEY (provider, period)
+            )
+        ''')
+        conn.close()
+
+    def _bucket_spec(self, limits: Dict) -> Optional[tuple]:
+        """(capacity, tokens per second) of a provider's bucket, if it has one."""
+        if "per_minute" in limits:
+            return limits["per_minute"], limits["per_minute"] / 60
+        if "per_hour" in limits:
+            return limits["per_hour"], limits["per_hour"] / 3600
+        return None
+
+    def _periods(self, now: datetime) -> Dict[str, tuple]:
+        """Counter key and seconds until reset for each period."""
+        tomorrow = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        next_month = (now.replace(day=28) + timedelta(days=4)).replace(
+            day=1, hour=0, minute=0, second=0, microsecond=0
+        )
+        return {
+            "daily": (f"day:{now:%Y-%m-%d}", (tomorrow - now).total_seconds()),
+            "monthly": (f"month:{now:%Y-%m}", (next_month - now).total_seconds()),
+        }
+
+    def _check(self, conn: sqlite3.Connection, provider: str, amount: float, consume: bool) -> float:
+        """
+        Seconds until amount is available (0 = available now).
+
+        Consumes the allowance when consume is True and it is available;
+        callers that consume must hold a BEGIN IMMEDIATE transaction.
+        """
+        limits = PROVIDER_LIMITS.get(provider)
+        if not limits:
+            return 0.0
+
+        now_ts = time.time()
+        wait = 0.0
+
+        # Quota counters
+        periods = self._periods(datetime.now())
+        counters = {}
+        for name, (period, reset_in) in periods.items():
+            if name not in limits:
+                continue
+            row = conn.execute(
+                'SELECT used FROM counters WHERE provider = ? AND period = ?', (provider, period)
+            ).fetchone()
+            used = row[0] if row else 0.0
+            counters[period] = used
+            if used + amount > limits[name]:
+                wait = max(wait, reset_in)
+
+        # Token bucket (one token per request)
+        spec = self._bucket_spec(limits)
+        tokens = None
+        if spec:
+            capacity, refill = spec
+            row = conn.execute(
+                'SELECT tokens, updated_at FROM buckets WHERE provider = ?', (provider,)
+            ).fetchone()
+            if row:
+                tokens = min(capacity, row[0] + (now_ts - row[1]) * refill)
+            else:
+                tokens = capacity
+            if tokens < 1:
+                wait = max(wait, (1 - tokens) / refill)
+
+        if wait > 0 or not consume:
+            return wait
+
+        for period, used in counters.items():
+            conn.execute(
+                'INSERT OR REPLACE INTO counters (provider, period, used) VALUES (?, ?, ?)',
+                (provider, period, used + amount)
+            )
+        if tokens is not None:
+            conn.execute(
+                'INSERT OR REPLACE INTO buckets (provider, tokens, updated_at) VALUES (?, ?, ?)',
+                (provider, tokens - 1, now_ts)
+            )
+        return 0.0
+
+    def time_until_available(self, provider: str, amount: float = 1) -> float:
+        """
+        Seconds until a request of amount units could be made (for schedulers).
+
+        Args:
+            provider: Provider name (see PROVIDER_LIMITS)
+            amount: Requests, or characters for character quotas
+
+        Returns:
+            0.0 if available now
+        """
+        if not settings.RATE_GOVERNOR_ENABLED:
+            return 0.0
+        conn = self._connect()
+        try:
+            return self._check(conn, provider, amount, consume=False)
+        finally:
+            conn.close()
+
+    def try_acquire(self, provider: str, amount: float = 1) -> bool:
+        """Consume the allowance if available right now."""
+        if not settings.RATE_GOVERNOR_ENABLED:
+            return True
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            available = self._check(conn, provider, amount, consume=True) == 0
+            conn.execute('COMMIT')
+            return available
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+    def acquire(self, provider: str, amount: float = 1, max_wait: Optional[float] = None):
+        """
+        Wait for and consume an allowance.
+
+        Args:
+            provider: Provider name (see PROVIDER_LIMITS)
+            amount: Requests, or characters for character quotas
+            max_wait: Longest acceptable wait in seconds (RATE_GOVERNOR_MAX_WAIT if None)
+
+        Raises:
+            RateLimitExceeded: If the allowance won't be available within max_wait
+        """
+        if not settings.RATE_GOVERNOR_ENABLED:
+            return
+        max_wait = settings.RATE_GOVERNOR_MAX_WAIT if max_wait is None else max_wait
+        deadline = time.time() + max_wait
+        announced = False
+
+        while True:
+            if self.try_acquire(provider, amount):
+                return
+
+            wait = self.time_until_available(provider, amount)
+            if time.time() + wait > deadline:
+                raise RateLimitExceeded(provider, wait)
+
+            if not announced:
+                print(f"   ⏳ Limite de {provider}: aguardando {wait:.1f}s")
+                announced = True
+            # Another process may take the slot first, so re-check after sleeping
+            time.sleep(max(wait, 0.05))
+
+    def get_status(self) -> Dict[str, Dict]:
+        """Usage and availability per provider."""
+        periods = self._periods(datetime.now())
+        conn = self._connect()
+        status = {}
+        for provider, limits in PROVIDER_LIMITS.items():
+            entry = {"wait": self.time_until_available(provider)}
+            for name, (period, _) in periods.items():
+                if name in limits:
+                    row = conn.execute(
+                        'SELECT used FROM counters WHERE provider = ? AND period = ?', (provider, period)
+                    ).fetchone()
+                    entry[name] = {"used": row[0] if row else 0, "limit": limits[name]}
+            status[provider] = entry
+        conn.close()
+        return status
+
+# Global instance
+rate_governor = RateGovernor()
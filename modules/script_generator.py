@@ -4,53 +4,150 @@ Supports Gemini (free), OpenRouter (cheap), and OpenAI (premium).
 """
 
 import json
-import hashlib
-import requests
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 from config.settings import settings
-from config.prompts import SCRIPT_GENERATION_PROMPT
+from config.prompts import (
+    SCRIPT_SYSTEM_PROMPT, SCRIPT_TASK_PROMPT, SCRIPT_SEED_SUFFIX,
+    BATCH_SCRIPT_SYSTEM_PROMPT, BATCH_SCRIPT_TASK_PROMPT, BATCH_SCRIPT_ITEM
+)
 from modules.budget_controller import budget
 from modules.humanizer import humanizer
+from modules.http_client import http_client
+from modules.json_stream import JSONFieldStream
+from modules.latency_tracker import latency_tracker
+from modules.llm_clients import llm_clients, gemini_usage, openai_usage, GEMINI_MODEL
+from modules.rate_governor import rate_governor
+from modules.script_store import script_problems, script_store
+from modules.topic_matcher import topic_matcher
+
+# Model used per provider (recorded with each cached script)
+PROVIDER_MODELS = {
+    "gemini": GEMINI_MODEL,
+    "openai": "gpt-4o-mini",
+    "openrouter": "google/gemini-flash-1.5",
+}
+
+# Script fields reported to on_field callbacks while a response streams
+STREAM_FIELDS = ("hook", "body", "outro", "visual_keywords")
+
+class RequestCancelled(Exception):
+    """A streamed request was abandoned because a hedged one won."""
+
+class InvalidScript(ValueError):
+    """A provider answered, but not with a usable script (provider is set by _generate_timed)."""
+    
+    provider: Optional[str] = None
 
 class ScriptGenerator:
     """Generates video scripts using AI with cost optimization."""
     
     def __init__(self):
-        self.cache_dir = settings.DATA_DIR / "script_cache"
-        self.cache_dir.mkdir(exist_ok=True)
+        # Per-thread cancel flag checked while consuming a stream
+        self._local = threading.local()
     
-    def _get_cache_key(self, topic: str, duration: int) -> str:
-        """Generate cache key for a topic."""
-        content = f"{topic}_{duration}"
-        return hashlib.md5(content.encode()).hexdigest()
+    def _lookup(self, topic: str, duration: int) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """
+        Find a cached script for a topic.
+        
+        Tries the topic itself and then the closest past topic
+        (MinHash/LSH). Depending on SCRIPT_SIMILAR_MODE a near-duplicate is
+        reused as is ("reuse") or only handed back as a seed for a new
+        script ("seed").
+        
+        Returns:
+            (script to use, seed script) - either may be None
+        """
+        cached = self._load_from_cache(topic, duration)
+        if cached:
+            return cached, None
+        
+        if settings.SCRIPT_SIMILAR_MODE == "off" or not settings.CACHE_AGGRESSIVE:
+            return None, None
+        
+        match = topic_matcher.find_similar(topic)
+        if not match:
+            return None, None
+        
+        similar_topic, similarity = match
+        similar = self._load_from_cache(similar_topic, duration, quiet=True)
+        if not similar:
+            return None, None
+        
+        if settings.SCRIPT_SIMILAR_MODE == "seed":
+            print(f"🌱 Usando roteiro de '{similar_topic[:40]}' como base ({similarity:.0%} similar)")
+            return None, similar
+        
+        print(f"♻️  Roteiro de tópico similar reaproveitado: '{similar_topic[:40]}' ({similarity:.0%})")
+        return similar, None
     
-    def _load_from_cache(self, cache_key: str) -> Optional[Dict]:
-        """Load script from cache if exists."""
+    def _script_prompt(self, topic: str, duration: int, seed: Optional[Dict] = None) -> str:
+        """Dynamic part of a single-script prompt (SCRIPT_SYSTEM_PROMPT is the prefix)."""
+        prompt = SCRIPT_TASK_PROMPT.format(duration=duration, topic=topic)
+        if seed:
+            seed_text = json.dumps(
+                {field: seed[field] for field in ("hook", "body", "outro")},
+                ensure_ascii=False
+            )
+            prompt += SCRIPT_SEED_SUFFIX.format(seed=seed_text)
+        return prompt
+    
+    def _load_from_cache(self, topic: str, duration: int, quiet: bool = False) -> Optional[Dict]:
+        """
+        Cached script of a topic with the nearest duration.
+        
+        Scripts written for up to SCRIPT_DURATION_TOLERANCE seconds more or
+        less are accepted; the returned copy targets the requested duration
+        (written_for keeps the one it was written for) and the narration
+        fitter absorbs the difference.
+        """
         if not settings.CACHE_AGGRESSIVE:
             return None
         
-        cache_file = self.cache_dir / f"{cache_key}.json"
-        if cache_file.exists():
-            print("📦 Script encontrado no cache")
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return None
+        script = script_store.get(topic, duration, settings.SCRIPT_DURATION_TOLERANCE)
+        if script is None:
+            return None
+        
+        written_for = script.get("target_duration", duration)
+        if not quiet:
+            if written_for != duration:
+                print(f"📦 Script encontrado no cache (escrito para {written_for}s, alvo {duration}s)")
+            else:
+                print("📦 Script encontrado no cache")
+        
+        script["written_for"] = written_for
+        script["target_duration"] = duration
+        return script
     
-    def _save_to_cache(self, cache_key: str, script: Dict):
-        """Save script to cache."""
-        cache_file = self.cache_dir / f"{cache_key}.json"
-        with open(cache_file, 'w', encoding='utf-8') as f:
-            json.dump(script, f, indent=2, ensure_ascii=False)
+    def _save_to_cache(self, topic: str, script: Dict, provider: str):
+        """Save script to the script store (sets its cache_id)."""
+        script["cache_id"] = script_store.put(topic, script, provider=provider, model=PROVIDER_MODELS.get(provider, ""))
     
-    def generate(self, topic: str, duration: Optional[int] = None) -> Dict:
+    def generate(
+        self,
+        topic: str,
+        duration: Optional[int] = None,
+        on_field: Optional[Callable] = None,
+        use_cache: bool = True
+    ) -> Dict:
         """
         Generate video script.
         
+        With on_field the response is streamed and on_field(field, value)
+        is called as soon as hook, body, outro and visual_keywords are
+        complete, before the whole response has arrived. The returned
+        script is still validated once the stream closes; if a provider
+        fails and the next one is tried, fields may be reported again.
+        
         Args:
             topic: Video topic/curiosity
             duration: Video duration in seconds (randomized if None)
+            on_field: Optional callback for streamed fields
+            use_cache: False to always ask a provider for a new script
         
         Returns:
             Dictionary with script components
@@ -59,159 +156,521 @@ class ScriptGenerator:
         if duration is None:
             duration = humanizer.get_random_duration()
         
-        # Check cache
-        cache_key = self._get_cache_key(topic, duration)
-        cached = self._load_from_cache(cache_key)
+        # Check cache (same or near-duplicate topic, nearest duration)
+        cached, seed = self._lookup(topic, duration) if use_cache else (None, None)
         if cached:
+            if on_field:
+                for field in STREAM_FIELDS:
+                    if field in cached:
+                        on_field(field, cached[field])
             return cached
         
         # Generate new script using provider priority
         for provider in settings.SCRIPT_PROVIDER:
             try:
                 print(f"🔄 Tentando provedor: {provider}")
-                if provider == "gemini" and settings.GEMINI_API_KEY:
-                    script = self._generate_with_gemini(topic, duration)
-                elif provider == "openrouter" and settings.OPENROUTER_API_KEY:
-                    script = self._generate_with_openrouter(topic, duration)
-                elif provider == "openai" and settings.OPENAI_API_KEY:
-                    script = self._generate_with_openai(topic, duration)
-                else:
+                if not self._is_configured(provider):
                     print(f"⏭️  {provider} não configurado, pulando...")
                     continue
                 
+                backoff = script_store.failure_backoff(topic, provider)
+                if backoff:
+                    print(f"⏳ {provider} falhou recentemente neste tópico, nova tentativa em {backoff / 60:.0f} min")
+                    continue
+                
+                if settings.SCRIPT_HEDGING:
+                    provider, script = self._generate_hedged(provider, topic, duration, seed, on_field)
+                else:
+                    script = self._generate_timed(provider, topic, duration, seed, on_field)
+                
+                # Duration the narration will be fitted to
+                script["target_duration"] = duration
+                
                 # Save to cache
-                self._save_to_cache(cache_key, script)
+                self._save_to_cache(topic, script, provider)
+                script_store.clear_failure(topic, provider)
+                topic_matcher.add(topic)
                 return script
                 
+            except InvalidScript as e:
+                # Unusable response for this topic: back off before asking that provider again
+                failed = e.provider or provider
+                backoff = script_store.record_failure(topic, failed, str(e))
+                print(f"⚠️ Resposta inválida de {failed}: {e} (nova tentativa em {backoff / 60:.0f} min)")
             except Exception as e:
                 print(f"⚠️ Erro com {provider}: {str(e)}")
-                import traceback
-                traceback.print_exc()
-                continue
         
         raise Exception("❌ Nenhum provedor de API disponível para gerar roteiro")
     
-    def _generate_with_gemini(self, topic: str, duration: int) -> Dict:
-        """Generate script using Google Gemini (FREE)."""
-        print("🤖 Gerando roteiro com Gemini (grátis)...")
-        
+    def _generate_timed(
+        self,
+        provider: str,
+        topic: str,
+        duration: int,
+        seed: Optional[Dict] = None,
+        on_field: Optional[Callable] = None,
+        cancel: Optional[threading.Event] = None
+    ) -> Dict:
+        """Generate with one provider, recording its latency on success."""
+        self._local.cancel = cancel
+        start = time.perf_counter()
         try:
-            import google.generativeai as genai
-            genai.configure(api_key=settings.GEMINI_API_KEY)
-            
-            # Use gemini-2.5-flash (available model)
-            model = genai.GenerativeModel('gemini-2.5-flash')
-            
-            prompt = SCRIPT_GENERATION_PROMPT.format(
-                duration=duration,
-                topic=topic
+            if provider == "gemini":
+                script = self._generate_with_gemini(topic, duration, seed, on_field)
+            elif provider == "openrouter":
+                script = self._generate_with_openrouter(topic, duration, seed, on_field)
+            elif provider == "openai":
+                script = self._generate_with_openai(topic, duration, seed, on_field)
+            else:
+                raise ValueError(f"Provedor de roteiro desconhecido: {provider}")
+        except InvalidScript as e:
+            e.provider = provider
+            raise
+        latency_tracker.observe(provider, time.perf_counter() - start)
+        return script
+    
+    def _hedge_provider(self, primary: str, prompt_chars: int) -> Optional[str]:
+        """Cheapest other configured provider (SCRIPT_PROVIDER order breaks ties)."""
+        candidates = [p for p in settings.SCRIPT_PROVIDER if p != primary and self._is_configured(p)]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda p: budget.llm_request_cost(p, prompt_chars))
+    
+    def _generate_hedged(
+        self,
+        provider: str,
+        topic: str,
+        duration: int,
+        seed: Optional[Dict] = None,
+        on_field: Optional[Callable] = None
+    ) -> Tuple[str, Dict]:
+        """
+        Generate with provider, hedging with a second provider when it's slow.
+        
+        If provider hasn't answered within its learned p90 latency, the same
+        request goes to the next cheapest provider and the first valid
+        script wins. Both requests are streamed so the loser can be
+        abandoned mid-stream. Hedging is skipped until the p90 is learned
+        and while the recent hedge rate is above SCRIPT_HEDGE_MAX_RATE.
+        
+        Returns:
+            (provider that answered, script)
+        """
+        prompt_chars = len(SCRIPT_SYSTEM_PROMPT) + len(self._script_prompt(topic, duration, seed))
+        backup = self._hedge_provider(provider, prompt_chars)
+        delay = latency_tracker.hedge_delay(provider)
+        if backup is None or delay is None:
+            latency_tracker.record_request(False)
+            return provider, self._generate_timed(provider, topic, duration, seed, on_field)
+        
+        def ignore(field, value):
+            pass
+        
+        executor = ThreadPoolExecutor(max_workers=2)
+        cancels = {}
+        futures = {}
+        
+        def submit(name, callback):
+            cancels[name] = threading.Event()
+            future = executor.submit(
+                self._generate_timed, name, topic, duration, seed, callback, cancels[name]
             )
+            futures[future] = name
+        
+        try:
+            submit(provider, on_field or ignore)
+            done, _ = wait(futures, timeout=delay)
+            hedged = not done
+            latency_tracker.record_request(hedged)
+            if hedged:
+                print(f"⏱️  {provider} acima do p90 ({delay:.1f}s): disparando {backup} em paralelo")
+                submit(backup, ignore)
             
-            response = model.generate_content(prompt)
+            pending = set(futures)
+            errors = []
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        script = future.result()
+                    except Exception as e:
+                        errors.append(e)
+                        continue
+                    
+                    winner = futures[future]
+                    for name, cancel in cancels.items():
+                        if name != winner:
+                            cancel.set()
+                    if hedged:
+                        loser = provider if winner == backup else backup
+                        budget.track_hedge(loser, winner == backup, budget.llm_request_cost(loser, prompt_chars))
+                        if winner == backup:
+                            print(f"🏁 {backup} respondeu primeiro")
+                    return winner, script
             
-            # Track usage (free tier)
-            budget.track_gemini()
+            # Both failed: the caller handles the last error, invalid scripts
+            # among the others are recorded against their own provider here
+            for e in errors[:-1]:
+                if isinstance(e, InvalidScript):
+                    script_store.record_failure(topic, e.provider, str(e))
+            raise errors[-1]
+        finally:
+            executor.shutdown(wait=False)
+    
+    def generate_many(self, topics: List[str], duration: Optional[int] = None) -> List[Optional[Dict]]:
+        """
+        Generate scripts for several topics with batched LLM requests.
+        
+        Up to SCRIPT_BATCH_SIZE topics share one request (and one copy of
+        the instructions). Every script is validated and cached on its
+        own; only the ones missing or invalid in the response are asked
+        for again (SCRIPT_BATCH_RETRIES times), then the next provider is
+        tried and, as a last resort, generate() per topic.
+        
+        Args:
+            topics: Video topics
+            duration: Video duration in seconds (randomized per topic if None)
+        
+        Returns:
+            Scripts in the same order as topics (None where generation failed)
+        """
+        results: List[Optional[Dict]] = [None] * len(topics)
+        pending = {}  # index -> (topic, duration)
+        batch_failures = {}  # index -> providers whose batches didn't return it
+        
+        for index, topic in enumerate(topics):
+            topic_duration = duration or humanizer.get_random_duration()
+            cached, _ = self._lookup(topic, topic_duration)
+            if cached:
+                results[index] = cached
+            else:
+                pending[index] = (topic, topic_duration)
+        
+        if pending:
+            print(f"📚 Gerando {len(pending)} roteiro(s) em lote...")
+        
+        for provider in settings.SCRIPT_PROVIDER:
+            if not pending:
+                break
+            if not self._is_configured(provider):
+                continue
             
-            # Parse JSON response
-            script = self._parse_response(response.text)
-            return script
+            provider_failed = False
+            for attempt in range(1 + settings.SCRIPT_BATCH_RETRIES):
+                if not pending or provider_failed:
+                    break
+                if attempt:
+                    print(f"🔁 Pedindo novamente {len(pending)} roteiro(s) inválido(s)...")
+                
+                indices = list(pending)
+                for start in range(0, len(indices), settings.SCRIPT_BATCH_SIZE):
+                    chunk = indices[start:start + settings.SCRIPT_BATCH_SIZE]
+                    try:
+                        scripts = self._request_batch(provider, [(i, pending[i][0], pending[i][1]) for i in chunk])
+                    except Exception as e:
+                        print(f"⚠️ Erro com {provider} (lote): {e}")
+                        provider_failed = True
+                        break
+                    
+                    for index in chunk:
+                        script = scripts.get(index)
+                        if not self._is_valid_script(script):
+                            continue
+                        topic, topic_duration = pending.pop(index)
+                        script.setdefault("visual_keywords", ["curiosidade", "fato", "interessante"])
+                        script.setdefault("duration_estimate", topic_duration)
+                        script["target_duration"] = topic_duration
+                        self._save_to_cache(topic, script, provider)
+                        topic_matcher.add(topic)
+                        results[index] = script
             
-        except ImportError:
-            raise Exception("google-generativeai não instalado. Execute: pip install google-generativeai")
+            if not provider_failed:
+                for index in pending:
+                    batch_failures.setdefault(index, []).append(provider)
+        
+        # Whatever the batches couldn't produce is generated one by one. Batch
+        # misses only go to the negative cache if this last resort fails too,
+        # otherwise generate() would skip every provider the batch used.
+        for index, (topic, topic_duration) in pending.items():
+            try:
+                results[index] = self.generate(topic, topic_duration)
+            except Exception as e:
+                print(f"⚠️ Roteiro não gerado para '{topic[:40]}': {e}")
+                for provider in batch_failures.get(index, []):
+                    if not script_store.failure_backoff(topic, provider):
+                        script_store.record_failure(topic, provider, "roteiro inválido na resposta em lote")
+        
+        done = sum(1 for script in results if script)
+        print(f"✅ {done}/{len(topics)} roteiros prontos")
+        return results
+    
+    def _request_batch(self, provider: str, items: List[Tuple[int, str, int]]) -> Dict[int, Dict]:
+        """
+        Request several scripts in one prompt.
+        
+        Args:
+            provider: Script provider
+            items: (index, topic, duration) tuples
+        
+        Returns:
+            Scripts by index (only the ones present in the response)
+        """
+        lines = [
+            BATCH_SCRIPT_ITEM.format(id=number, topic=topic, duration=item_duration)
+            for number, (_, topic, item_duration) in enumerate(items, 1)
+        ]
+        prompt = BATCH_SCRIPT_TASK_PROMPT.format(count=len(items), items="\n".join(lines))
+        
+        print(f"🤖 Lote de {len(items)} roteiro(s) com {provider}...")
+        data = self._extract_json(self._complete(provider, prompt, BATCH_SCRIPT_SYSTEM_PROMPT))
+        entries = data.get("scripts", []) if isinstance(data, dict) else data
+        if not isinstance(entries, list):
+            raise ValueError("Resposta em lote sem lista de roteiros")
+        
+        scripts = {}
+        for position, entry in enumerate(entries):
+            if not isinstance(entry, dict):
+                continue
+            try:
+                number = int(entry.pop("id", position + 1))
+            except (TypeError, ValueError):
+                number = position + 1
+            if 1 <= number <= len(items):
+                scripts[items[number - 1][0]] = entry
+        return scripts
+    
+    def _is_configured(self, provider: str) -> bool:
+        """Check whether a provider from SCRIPT_PROVIDER has an API key."""
+        if provider == "gemini":
+            return bool(settings.GEMINI_API_KEY)
+        if provider == "openrouter":
+            return bool(settings.OPENROUTER_API_KEY)
+        if provider == "openai":
+            return bool(settings.OPENAI_API_KEY)
+        return False
     
-    def _generate_with_openai(self, topic: str, duration: int) -> Dict:
+    def _complete(self, provider: str, prompt: str, system: Optional[str] = None) -> str:
+        """Send a prompt (with an optional system prefix) to a provider and return the raw response text."""
+        if provider == "gemini":
+            return self._complete_with_gemini(prompt, system=system)
+        if provider == "openrouter":
+            return self._complete_with_openrouter(prompt, system=system)
+        if provider == "openai":
+            return self._complete_with_openai(prompt, system=system)
+        raise ValueError(f"Provedor de roteiro desconhecido: {provider}")
+    
+    def _generate_with_gemini(self, topic: str, duration: int, seed: Optional[Dict] = None,
+                              on_field: Optional[Callable] = None) -> Dict:
+        """Generate script using Google Gemini (FREE)."""
+        print("🤖 Gerando roteiro com Gemini (grátis)...")
+        prompt = self._script_prompt(topic, duration, seed)
+        return self._parse_response(self._complete_with_gemini(prompt, on_field, SCRIPT_SYSTEM_PROMPT))
+    
+    def _generate_with_openai(self, topic: str, duration: int, seed: Optional[Dict] = None,
+                              on_field: Optional[Callable] = None) -> Dict:
         """Generate script using OpenAI GPT-4o."""
         print("🤖 Gerando roteiro com GPT-4o...")
+        prompt = self._script_prompt(topic, duration, seed)
+        return self._parse_response(self._complete_with_openai(prompt, on_field, SCRIPT_SYSTEM_PROMPT))
+    
+    def _generate_with_openrouter(self, topic: str, duration: int, seed: Optional[Dict] = None,
+                                  on_field: Optional[Callable] = None) -> Dict:
+        """Generate script using OpenRouter (cheap models)."""
+        print("🤖 Gerando roteiro com OpenRouter (econômico)...")
+        prompt = self._script_prompt(topic, duration, seed)
+        return self._parse_response(self._complete_with_openrouter(prompt, on_field, SCRIPT_SYSTEM_PROMPT))
+    
+    def _consume_stream(self, chunks: Iterator[str], on_field: Callable) -> str:
+        """Collect a streamed response, reporting script fields as they complete."""
+        parser = JSONFieldStream()
+        cancel = getattr(self._local, "cancel", None)
+        parts = []
+        for chunk in chunks:
+            if cancel is not None and cancel.is_set():
+                raise RequestCancelled()
+            parts.append(chunk)
+            try:
+                fields = parser.feed(chunk)
+            except ValueError:
+                # Malformed partial JSON: stop reporting, the final validation decides
+                parser.done = True
+                fields = []
+            
+            for field, value in fields:
+                if field not in STREAM_FIELDS:
+                    continue
+                try:
+                    on_field(field, value)
+                except Exception as e:
+                    print(f"⚠️ Erro ao processar campo '{field}' do roteiro: {e}")
+        return "".join(parts)
+    
+    def _complete_with_gemini(self, prompt: str, on_field: Optional[Callable] = None,
+                              system: Optional[str] = None) -> str:
+        rate_governor.acquire("gemini")
+        # The static prefix is bound to a per-process model as system instruction
+        model = llm_clients.gemini(system_instruction=system)
+        start = time.perf_counter()
         
-        from openai import OpenAI
-        client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        if on_field:
+            response = model.generate_content(prompt, stream=True)
+            
+            def chunks():
+                for chunk in response:
+                    try:
+                        yield chunk.text
+                    except ValueError:
+                        # Chunk without text parts (e.g. only a finish reason)
+                        continue
+            
+            text = self._consume_stream(chunks(), on_field)
+        else:
+            response = model.generate_content(prompt)
+            text = response.text
         
-        prompt = SCRIPT_GENERATION_PROMPT.format(
-            duration=duration,
-            topic=topic
-        )
+        # Track usage (free tier)
+        budget.track_gemini()
+        budget.track_llm_usage("gemini", gemini_usage(response), time.perf_counter() - start)
         
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",  # Cheaper alternative
+        return text
+    
+    def _complete_with_openai(self, prompt: str, on_field: Optional[Callable] = None,
+                              system: Optional[str] = None) -> str:
+        rate_governor.acquire("openai")
+        client = llm_clients.openai()
+        # A stable system prefix lets OpenAI's automatic prompt caching kick in
+        request = dict(
+            model=PROVIDER_MODELS["openai"],  # Cheaper alternative
             messages=[
-                {"role": "system", "content": "Você é um roteirista especializado em vídeos virais."},
+                {"role": "system", "content": system or "Você é um roteirista especializado em vídeos virais."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.8,
             response_format={"type": "json_object"}
         )
+        start = time.perf_counter()
         
-        # Track tokens
-        tokens_used = response.usage.total_tokens
-        budget.track_openai(tokens_used)
-        
-        script = json.loads(response.choices[0].message.content)
-        return script
-    
-    def _generate_with_openrouter(self, topic: str, duration: int) -> Dict:
-        """Generate script using OpenRouter (cheap models)."""
-        print("🤖 Gerando roteiro com OpenRouter (econômico)...")
+        if not on_field:
+            response = client.chat.completions.create(**request)
+            
+            # Track tokens
+            budget.track_openai(response.usage.total_tokens)
+            budget.track_llm_usage("openai", openai_usage(response.usage), time.perf_counter() - start)
+            
+            return response.choices[0].message.content
         
-        prompt = SCRIPT_GENERATION_PROMPT.format(
-            duration=duration,
-            topic=topic
+        stream = client.chat.completions.create(
+            **request, stream=True, stream_options={"include_usage": True}
         )
+        usage = []
         
-        response = requests.post(
+        def chunks():
+            for chunk in stream:
+                if chunk.usage:
+                    usage.append(chunk.usage)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        
+        text = self._consume_stream(chunks(), on_field)
+        
+        # Track tokens (sent in the last chunk)
+        if usage:
+            budget.track_openai(usage[-1].total_tokens)
+            budget.track_llm_usage("openai", openai_usage(usage[-1]), time.perf_counter() - start)
+        
+        return text
+    
+    def _complete_with_openrouter(self, prompt: str, on_field: Optional[Callable] = None,
+                                  system: Optional[str] = None) -> str:
+        rate_governor.acquire("openrouter")
+        messages = [{"role": "user", "content": prompt}]
+        if system:
+            messages.insert(0, {"role": "system", "content": system})
+        payload = {
+            "model": PROVIDER_MODELS["openrouter"],  # Cheap model
+            "messages": messages,
+            "usage": {"include": True}
+        }
+        if on_field:
+            payload["stream"] = True
+        
+        start = time.perf_counter()
+        response = http_client.post(
             "https://openrouter.ai/api/v1/chat/completions",
             headers={
                 "Authorization": f"Bearer {settings.OPENROUTER_API_KEY}",
                 "Content-Type": "application/json"
             },
-            json={
-                "model": "google/gemini-flash-1.5",  # Cheap model
-                "messages": [
-                    {"role": "user", "content": prompt}
-                ]
-            }
+            json=payload,
+            stream=bool(on_field)
         )
         
-        if response.status_code != 200:
-            raise Exception(f"OpenRouter error: {response.text}")
-        
-        data = response.json()
-        script = self._parse_response(data["choices"][0]["message"]["content"])
+        with response:
+            if response.status_code != 200:
+                raise Exception(f"OpenRouter error: {response.text}")
+            
+            if on_field:
+                usage = []
+                text = self._consume_stream(self._sse_content(response, usage), on_field)
+            else:
+                data = response.json()
+                usage = [data.get("usage")]
+                text = data["choices"][0]["message"]["content"]
         
-        return script
+        if usage and usage[-1]:
+            budget.track_llm_usage("openrouter", openai_usage(usage[-1]), time.perf_counter() - start)
+        return text
+    
+    def _sse_content(self, response, usage: Optional[List] = None) -> Iterator[str]:
+        """Text deltas of an OpenAI-style server-sent event stream (usage appended to usage)."""
+        for line in response.iter_lines(decode_unicode=True):
+            # Blank keep-alives and ": PROCESSING" comments carry no data
+            if not line or not line.startswith("data:"):
+                continue
+            data = line[len("data:"):].strip()
+            if data == "[DONE]":
+                break
+            event = json.loads(data)
+            if usage is not None and event.get("usage"):
+                usage.append(event["usage"])
+            choices = event.get("choices") or []
+            content = choices[0].get("delta", {}).get("content") if choices else None
+            if content:
+                yield content
+    
+    def _extract_json(self, response_text: str):
+        """Parse JSON from a response, removing markdown code fences."""
+        if "```json" in response_text:
+            response_text = response_text.split("```json")[1].split("```")[0]
+        elif "```" in response_text:
+            response_text = response_text.split("```")[1].split("```")[0]
+        return json.loads(response_text.strip())
+    
+    def _is_valid_script(self, script) -> bool:
+        """Script passes the schema check."""
+        return not script_problems(script)
     
     def _parse_response(self, response_text: str) -> Dict:
-        """Parse AI response into structured script."""
-        # Try to extract JSON from response
+        """
+        Parse AI response into structured script.
+        
+        Raises:
+            InvalidScript: If the response isn't JSON or fails the schema check
+        """
         try:
-            # Remove markdown code blocks if present
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0]
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0]
-            
-            script = json.loads(response_text.strip())
-            
-            # Validate required fields
-            required = ["hook", "body", "outro"]
-            if not all(field in script for field in required):
-                raise ValueError("Script incompleto")
-            
-            # Add visual keywords if missing
-            if "visual_keywords" not in script:
-                script["visual_keywords"] = ["curiosidade", "fato", "interessante"]
-            
-            return script
-            
-        except Exception as e:
-            print(f"⚠️ Erro ao parsear resposta: {e}")
-            # Return default structure
-            return {
-                "hook": "Você sabia disso?",
-                "body": "Esta é uma curiosidade incrível que poucas pessoas conhecem.",
-                "outro": "E você, conhecia esse fato?",
-                "visual_keywords": ["curiosidade"],
-                "duration_estimate": 50
-            }
+            script = self._extract_json(response_text)
+        except ValueError as e:
+            raise InvalidScript(f"Resposta não é JSON: {e}")
+        
+        # Add visual keywords if missing
+        if isinstance(script, dict) and "visual_keywords" not in script:
+            script["visual_keywords"] = ["curiosidade", "fato", "interessante"]
+        
+        problems = script_problems(script)
+        if problems:
+            raise InvalidScript(f"Roteiro inválido: {'; '.join(problems)}")
+        
+        return script
 
 # Global instance
 script_generator = ScriptGenerator()
@@ -0,0 +1,102 @@
+"""
+Pre-TTS script linter.
+Checks a generated script locally (required fields, hook length, predicted
+spoken duration for the voice that will narrate it) so out-of-bounds
+scripts are trimmed or rejected before paying for TTS and rendering.
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config.settings import settings
+from modules.script_store import script_problems
+from modules.text_utils import split_sentences
+from modules.voice_narrator import voice_narrator
+
+class ScriptTooShort(ValueError):
+    """Script predicted to run shorter than SCRIPT_LINT_MIN_RATIO x its target."""
+
+    def __init__(self, message: str, script: Dict, predicted: float):
+        super().__init__(message)
+        self.script = script
+        self.predicted = predicted
+
+class ScriptLinter:
+    """Fast local checks between ScriptGenerator and VoiceNarrator."""
+
+    def hook_problems(self, hook: str) -> List[str]:
+        """Problems with a hook (empty list = OK)."""
+        words = len(hook.split())
+        if words > settings.SCRIPT_HOOK_MAX_WORDS:
+            return [f"hook longo demais ({words} palavras, máximo {settings.SCRIPT_HOOK_MAX_WORDS})"]
+        return []
+
+    def lint(
+        self,
+        script: Dict,
+        predict: Optional[Callable[[Dict], float]] = None
+    ) -> Tuple[Dict, float]:
+        """
+        Check a script before narration.
+
+        The target is the duration the script was written for (a cached
+        script served for a nearby duration is fitted later, not judged
+        against it). Scripts predicted to run longer than
+        SCRIPT_LINT_MAX_RATIO x the target lose trailing body sentences
+        until they fit; scripts that are malformed, have an oversized hook
+        or are still too long with a single body sentence are rejected.
+
+        Args:
+            script: Script dictionary with hook, body, outro
+            predict: Narration duration predictor (voice_narrator.predict_duration if None)
+
+        Returns:
+            (script to narrate, predicted duration in seconds); the input
+            script is not modified
+
+        Raises:
+            ScriptTooShort: If it runs shorter than SCRIPT_LINT_MIN_RATIO x the target
+            ValueError: If the script is rejected
+        """
+        predict = predict or voice_narrator.predict_duration
+
+        problems = script_problems(script)
+        if not problems:
+            problems = self.hook_problems(script["hook"])
+        if problems:
+            raise ValueError(f"Roteiro rejeitado antes do TTS: {'; '.join(problems)}")
+
+        target = (
+            script.get("written_for") or script.get("target_duration")
+            or script.get("duration_estimate") or settings.VIDEO_DURATION
+        )
+        predicted = predict(script)
+        max_duration = target * settings.SCRIPT_LINT_MAX_RATIO
+
+        if predicted > max_duration:
+            sentences = split_sentences(script["body"], min_chars=1)
+            trimmed = dict(script)
+            while predicted > max_duration and len(sentences) > 1:
+                sentences.pop()
+                trimmed["body"] = " ".join(sentences)
+                predicted = predict(trimmed)
+
+            if predicted > max_duration:
+                raise ValueError(
+                    f"Roteiro rejeitado antes do TTS: {predicted:.1f}s previstos, "
+                    f"máximo {max_duration:.1f}s para {target}s"
+                )
+            removed = len(split_sentences(script["body"], min_chars=1)) - len(sentences)
+            print(f"✂️  Roteiro longo demais: {removed} frase(s) final(is) do corpo removida(s) ({predicted:.1f}s previstos)")
+            script = trimmed
+
+        min_duration = target * settings.SCRIPT_LINT_MIN_RATIO
+        if predicted < min_duration:
+            raise ScriptTooShort(
+                f"Roteiro curto demais: {predicted:.1f}s previstos, mínimo {min_duration:.1f}s para {target}s",
+                script, predicted
+            )
+
+        return script, predicted
+
+# Global instance
+script_linter = ScriptLinter()
@@ -0,0 +1,428 @@
+"""
+SQLite script store.
+One indexed table of generated scripts (topic, duration, provenance,
+prompt version, timestamps) replacing the one-JSON-file-per-script cache,
+with TTL and prompt-version invalidation.
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from typing import Dict, List, Optional
+
+from config.settings import settings
+from config.prompts import SCRIPT_PROMPT_VERSION
+from config.topics import FALLBACK_TOPICS, TOPIC_IDEAS
+from modules.topic_matcher import normalize_topic, topic_matcher
+
+# Durations tried when recovering the topic of a legacy md5(topic_duration) file
+LEGACY_DURATIONS = range(15, 181)
+
+# Fallback the old parser returned on errors; cached copies are poisoned entries
+PLACEHOLDER_BODY = "Esta é uma curiosidade incrível que poucas pessoas conhecem."
+
+# Longest negative-cache backoff for a topic/provider pair
+MAX_FAILURE_BACKOFF = 86400
+
+def script_problems(script) -> List[str]:
+    """
+    Schema check for a generated script.
+
+    Returns:
+        Problems found (empty list = valid)
+    """
+    if not isinstance(script, dict):
+        return ["resposta não é um objeto JSON"]
+
+    problems = [
+        f"campo '{field}' ausente ou vazio"
+        for field in ("hook", "body", "outro")
+        if not isinstance(script.get(field), str) or not script[field].strip()
+    ]
+
+    keywords = script.get("visual_keywords")
+    if keywords is not None and (
+        not isinstance(keywords, list) or not all(isinstance(k, str) and k.strip() for k in keywords)
+    ):
+        problems.append("'visual_keywords' deve ser uma lista de textos")
+
+    estimate = script.get("duration_estimate")
+    if estimate is not None and (isinstance(estimate, bool) or not isinstance(estimate, (int, float)) or estimate <= 0):
+        problems.append("'duration_estimate' deve ser um número positivo")
+
+    if script.get("body") == PLACEHOLDER_BODY:
+        problems.append("roteiro padrão de fallback")
+
+    return problems
+
+class ScriptStore:
+    """Indexed script cache with nearest-duration lookups."""
+
+    def __init__(self):
+        self.db_path = settings.DATA_DIR / "scripts.db"
+        self.legacy_dir = settings.DATA_DIR / "script_cache"
+        # Legacy files whose topic wasn't recovered, looked up lazily on a miss
+        self.unmatched_dir = settings.DATA_DIR / "script_cache_migrated"
+        self._init_database()
+        self._renormalize()
+        if self.legacy_dir.exists():
+            self._migrate_json()
+        self.purge()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _init_database(self):
+        conn = self._connect()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS scripts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                topic TEXT NOT NULL,
+                normalized_topic TEXT NOT NULL,
+                duration INTEGER NOT NULL,
+                provider TEXT,
+                model TEXT,
+                prompt_version INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL,
+                hits INTEGER NOT NULL DEFAULT 0,
+                script TEXT NOT NULL,
+                UNIQUE (normalized_topic, duration)
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_scripts_created ON scripts(created_at)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_scripts_version ON scripts(prompt_version)')
+        # Negative cache: recent generation failures per topic and provider
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS failures (
+                normalized_topic TEXT NOT NULL,
+                provider TEXT NOT NULL,
+                failures INTEGER NOT NULL,
+                last_error TEXT,
+                failed_at REAL NOT NULL,
+                retry_after REAL NOT NULL,
+                PRIMARY KEY (normalized_topic, provider)
+            )
+        ''')
+        conn.commit()
+        conn.close()
+
+    def _renormalize(self):
+        """Re-key scripts stored under an older normalize_topic()."""
+        conn = self._connect()
+        rows = conn.execute('SELECT id, topic, normalized_topic FROM scripts').fetchall()
+        stale = [
+            (normalize_topic(topic), entry_id)
+            for entry_id, topic, normalized in rows
+            if normalize_topic(topic) != normalized
+        ]
+        if stale:
+            conn.executemany('UPDATE OR REPLACE scripts SET normalized_topic = ? WHERE id = ?', stale)
+            conn.commit()
+        conn.close()
+
+    def _min_created(self) -> float:
+        """Oldest creation time still valid (0 = no TTL)."""
+        if settings.SCRIPT_CACHE_TTL_DAYS <= 0:
+            return 0.0
+        return time.time() - settings.SCRIPT_CACHE_TTL_DAYS * 86400
+
+    def get(self, topic: str, duration: int, tolerance: int = 0) -> Optional[Dict]:
+        """
+        Valid script of a topic with the duration nearest to duration.
+
+        Args:
+            topic: Video topic (matched by its normalized form)
+            duration: Requested duration in seconds
+            tolerance: Largest accepted duration difference in seconds
+
+        Returns:
+            The script (target_duration = the duration it was written for,
+            cache_id = its row id), or None
+        """
+        conn = self._connect()
+        cursor = conn.cursor()
+        # Ties go to the longer script: speeding narration up is allowed more than slowing it down
+        query = ('''
+            SELECT id, duration, script FROM scripts
+            WHERE normalized_topic = ? AND duration BETWEEN ? AND ?
+              AND prompt_version = ? AND created_at >= ?
+            ORDER BY ABS(duration - ?), duration DESC
+            LIMIT 1
+        ''', (
+            normalize_topic(topic), duration - tolerance, duration + tolerance,
+            SCRIPT_PROMPT_VERSION, self._min_created(), duration
+        ))
+        row = cursor.execute(*query).fetchone()
+        if row is None and self._load_unmatched(topic, duration, tolerance):
+            row = cursor.execute(*query).fetchone()
+
+        script = None
+        if row:
+            entry_id, written_for, script_json = row
+            cursor.execute(
+                'UPDATE scripts SET last_used = ?, hits = hits + 1 WHERE id = ?', (time.time(), entry_id)
+            )
+            conn.commit()
+            script = json.loads(script_json)
+            script["target_duration"] = written_for
+            script["cache_id"] = entry_id
+
+        conn.close()
+        return script
+
+    def put(self, topic: str, script: Dict, provider: str = "", model: str = "") -> int:
+        """
+        Store a script (replaces the topic's script of the same duration).
+
+        Returns:
+            Row id of the stored script (for discard())
+
+        Raises:
+            ValueError: If the script fails the schema check (nothing is stored)
+        """
+        problems = script_problems(script)
+        if problems:
+            raise ValueError(f"Roteiro inválido não salvo no cache: {'; '.join(problems)}")
+
+        duration = int(script.get("target_duration") or script.get("duration_estimate") or settings.VIDEO_DURATION)
+        stored = {key: value for key, value in script.items() if key != "cache_id"}
+        conn = self._connect()
+        cursor = conn.execute('''
+            INSERT OR REPLACE INTO scripts
+            (topic, normalized_topic, duration, provider, model, prompt_version, created_at, script)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            topic, normalize_topic(topic), duration, provider, model,
+            SCRIPT_PROMPT_VERSION, time.time(), json.dumps(stored, ensure_ascii=False)
+        ))
+        entry_id = cursor.lastrowid
+        conn.commit()
+        conn.close()
+        return entry_id
+
+    def discard(self, entry_id: int):
+        """Delete a stored script by its cache_id (e.g. rejected before TTS)."""
+        conn = self._connect()
+        conn.execute('DELETE FROM scripts WHERE id = ?', (entry_id,))
+        conn.commit()
+        conn.close()
+
+    def purge(self) -> int:
+        """Delete expired scripts and scripts from older prompt versions."""
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute(
+            'DELETE FROM scripts WHERE prompt_version != ? OR created_at < ?',
+            (SCRIPT_PROMPT_VERSION, self._min_created())
+        )
+        removed = cursor.rowcount
+        conn.commit()
+        conn.close()
+
+        if removed:
+            print(f"🧹 Cache de roteiros: {removed} roteiro(s) expirado(s) removido(s)")
+        return removed
+
+    def failure_backoff(self, topic: str, provider: str) -> float:
+        """Seconds until provider may be asked for topic again (0 = now)."""
+        conn = self._connect()
+        row = conn.execute(
+            'SELECT retry_after FROM failures WHERE normalized_topic = ? AND provider = ?',
+            (normalize_topic(topic), provider)
+        ).fetchone()
+        conn.close()
+        return max(row[0] - time.time(), 0.0) if row else 0.0
+
+    def record_failure(self, topic: str, provider: str, error: str) -> float:
+        """
+        Remember that provider failed to produce a valid script for topic.
+
+        The backoff doubles with each consecutive failure, starting at
+        SCRIPT_FAILURE_BACKOFF seconds, up to a day. A failure streak older
+        than a day starts over.
+
+        Returns:
+            Backoff in seconds
+        """
+        normalized = normalize_topic(topic)
+        now = time.time()
+        conn = self._connect()
+        row = conn.execute(
+            'SELECT failures, failed_at FROM failures WHERE normalized_topic = ? AND provider = ?',
+            (normalized, provider)
+        ).fetchone()
+        failures = row[0] + 1 if row and now - row[1] < MAX_FAILURE_BACKOFF else 1
+        backoff = min(settings.SCRIPT_FAILURE_BACKOFF * 2 ** (failures - 1), MAX_FAILURE_BACKOFF)
+        conn.execute('''
+            INSERT OR REPLACE INTO failures
+            (normalized_topic, provider, failures, last_error, failed_at, retry_after)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (normalized, provider, failures, error[:500], now, now + backoff))
+        conn.commit()
+        conn.close()
+        return backoff
+
+    def clear_failure(self, topic: str, provider: str):
+        """Forget failures after provider produced a valid script for topic."""
+        conn = self._connect()
+        conn.execute(
+            'DELETE FROM failures WHERE normalized_topic = ? AND provider = ?',
+            (normalize_topic(topic), provider)
+        )
+        conn.commit()
+        conn.close()
+
+    def repair(self) -> int:
+        """
+        Delete poisoned entries (placeholder or schema-invalid scripts).
+
+        Returns:
+            Number of scripts removed
+        """
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute('SELECT id, topic, script FROM scripts')
+        poisoned = []
+        for entry_id, topic, script_json in cursor.fetchall():
+            try:
+                problems = script_problems(json.loads(script_json))
+            except ValueError:
+                problems = ["JSON corrompido"]
+            if problems:
+                print(f"   🗑️  '{topic[:40]}': {'; '.join(problems)}")
+                poisoned.append((entry_id,))
+
+        cursor.executemany('DELETE FROM scripts WHERE id = ?', poisoned)
+        conn.commit()
+        conn.close()
+        return len(poisoned)
+
+    def _load_unmatched(self, topic: str, duration: int, tolerance: int) -> bool:
+        """
+        Import a legacy md5(topic_duration) file the migration couldn't match.
+
+        Returns:
+            True if a script within tolerance was imported
+        """
+        if not self.unmatched_dir.exists():
+            return False
+
+        for offset in sorted(range(-tolerance, tolerance + 1), key=lambda o: (abs(o), -o)):
+            candidate = duration + offset
+            content = f"{topic}_{candidate}"
+            cache_file = self.unmatched_dir / f"{hashlib.md5(content.encode()).hexdigest()}.json"
+            if not cache_file.exists():
+                continue
+            try:
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    script = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if script_problems(script):
+                continue
+            script.setdefault("target_duration", candidate)
+            self.put(topic, script, provider="legacy")
+            cache_file.unlink()
+            return True
+        return False
+
+    def _known_topics(self) -> set:
+        """Topics seen before (topic database, similarity index, built-in topic lists)."""
+        topics = set(topic_matcher.topics.values())
+        topics.update(TOPIC_IDEAS)
+        topics.update(entry["title"] for entry in FALLBACK_TOPICS)
+        topics_db = settings.DATA_DIR / "topics.db"
+        if topics_db.exists():
+            conn = sqlite3.connect(topics_db)
+            try:
+                topics.update(row[0] for row in conn.execute('SELECT title FROM topics'))
+            except sqlite3.Error:
+                pass
+            conn.close()
+        return topics
+
+    def _migrate_json(self):
+        """
+        One-time import of data/script_cache/*.json.
+
+        Per-topic files carry their topic. Old md5(topic_duration) files
+        are matched against every known topic x duration. Imported files
+        are deleted; the directory, holding only the files whose topic
+        couldn't be recovered, is renamed to script_cache_migrated so this
+        runs only once and get() can still find them by topic on a miss.
+        """
+        files = list(self.legacy_dir.glob("*.json"))
+        legacy_keys = None
+        migrated = 0
+
+        for cache_file in files:
+            try:
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+
+            if "scripts" in data and "topic" in data:
+                for script in data["scripts"]:
+                    if not script_problems(script):
+                        self.put(data["topic"], script, provider="legacy")
+                        migrated += 1
+                cache_file.unlink()
+                continue
+
+            if legacy_keys is None:
+                legacy_keys = {}
+                for topic in self._known_topics():
+                    for duration in LEGACY_DURATIONS:
+                        for content in (f"{topic}_{duration}", f"{normalize_topic(topic)}_{duration}"):
+                            legacy_keys[hashlib.md5(content.encode()).hexdigest()] = (topic, duration)
+
+            match = legacy_keys.get(cache_file.stem)
+            if match and not script_problems(data):
+                topic, duration = match
+                data.setdefault("target_duration", duration)
+                self.put(topic, data, provider="legacy")
+                cache_file.unlink()
+                migrated += 1
+
+        if self.unmatched_dir.exists():
+            # Merge with the leftovers of an earlier migration
+            for leftover in self.legacy_dir.iterdir():
+                leftover.replace(self.unmatched_dir / leftover.name)
+            self.legacy_dir.rmdir()
+        else:
+            self.legacy_dir.rename(self.unmatched_dir)
+
+        if files:
+            print(f"📦 Cache de roteiros migrado para SQLite: {migrated} roteiro(s) de {len(files)} arquivo(s)")
+            unmatched = len(list(self.unmatched_dir.glob("*.json")))
+            if unmatched:
+                print(f"   {unmatched} arquivo(s) sem tópico identificado ficam em {self.unmatched_dir.name} (buscados por tópico quando faltar no cache)")
+
+    def get_stats(self) -> Dict:
+        """Script counts for the dashboard."""
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute('SELECT COUNT(*), COALESCE(SUM(hits), 0) FROM scripts')
+        total, hits = cursor.fetchone()
+        cursor.execute(
+            'SELECT COUNT(*) FROM scripts WHERE prompt_version = ? AND created_at >= ?',
+            (SCRIPT_PROMPT_VERSION, self._min_created())
+        )
+        valid = cursor.fetchone()[0]
+        cursor.execute('SELECT COALESCE(provider, ?), COUNT(*) FROM scripts GROUP BY provider', ("",))
+        by_provider = dict(cursor.fetchall())
+        conn.close()
+
+        return {
+            "count": total,
+            "valid": valid,
+            "hits": hits,
+            "by_provider": by_provider
+        }
+
+# Global instance
+script_store = ScriptStore()
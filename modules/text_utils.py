@@ -0,0 +1,54 @@
+"""
+Text helpers for timing estimates (Portuguese-aware).
+"""
+
+import re
+from typing import List
+
+VOWEL_GROUPS = re.compile(r"[aeiouyáéíóúâêôãõàü]+", re.IGNORECASE)
+WORD_CHARS = re.compile(r"[\w']+", re.UNICODE)
+
+def count_syllables(word: str) -> int:
+    """
+    Approximate syllable count of a Portuguese word.
+
+    Counts vowel groups (diphthongs count once); digits are spoken as
+    roughly two syllables each. Always returns at least 1.
+    """
+    digits = sum(ch.isdigit() for ch in word)
+    letters = "".join(WORD_CHARS.findall(word))
+    syllables = len(VOWEL_GROUPS.findall(letters)) + 2 * digits
+    return max(syllables, 1)
+
+def count_text_syllables(text: str) -> int:
+    """Total syllables in a text."""
+    return sum(count_syllables(word) for word in text.split())
+
+SENTENCE_END = re.compile(r"(?<=[.!?…])\s+")
+
+def split_sentences(text: str, min_chars: int = 20) -> List[str]:
+    """
+    Split narration text at sentence boundaries.
+
+    Sentences shorter than min_chars are merged into the next one so
+    very short fragments don't get their own TTS request.
+    """
+    sentences = []
+    pending = ""
+    for sentence in SENTENCE_END.split(text.strip()):
+        sentence = f"{pending} {sentence}".strip() if pending else sentence.strip()
+        if not sentence:
+            continue
+        if len(sentence) < min_chars:
+            pending = sentence
+            continue
+        sentences.append(sentence)
+        pending = ""
+
+    if pending:
+        if sentences:
+            sentences[-1] = f"{sentences[-1]} {pending}"
+        else:
+            sentences.append(pending)
+
+    return sentences
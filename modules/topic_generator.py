@@ -5,12 +5,17 @@ Sources topics from database, GPT, and Reddit.
 
 import json
 import sqlite3
+import time
 from pathlib import Path
 from typing import List, Dict
 import random
 
 from config.settings import settings
-from config.prompts import TOPIC_GENERATION_PROMPT
+from config.prompts import TOPIC_SYSTEM_PROMPT, TOPIC_TASK_PROMPT
+from config.topics import FALLBACK_TOPICS
+from modules.budget_controller import budget
+from modules.llm_clients import llm_clients, gemini_usage, openai_usage
+from modules.rate_governor import rate_governor
 
 class TopicGenerator:
     """Generates and manages video topics."""
@@ -107,13 +112,13 @@ class TopicGenerator:
     
     def _generate_with_gemini(self, count: int) -> List[Dict]:
         """Generate topics using Gemini."""
-        import google.generativeai as genai
-        genai.configure(api_key=settings.GEMINI_API_KEY)
+        rate_governor.acquire("gemini")
+        model = llm_clients.gemini(system_instruction=TOPIC_SYSTEM_PROMPT)
         
-        model = genai.GenerativeModel('gemini-2.5-flash')
-        
-        prompt = TOPIC_GENERATION_PROMPT.format(count=count)
+        prompt = TOPIC_TASK_PROMPT.format(count=count)
+        start = time.perf_counter()
         response = model.generate_content(prompt)
+        budget.track_llm_usage("gemini", gemini_usage(response), time.perf_counter() - start)
         
         # Parse JSON response
         text = response.text
@@ -127,39 +132,28 @@ class TopicGenerator:
     
     def _generate_with_openai(self, count: int) -> List[Dict]:
         """Generate topics using OpenAI."""
-        from openai import OpenAI
-        client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        rate_governor.acquire("openai")
+        client = llm_clients.openai()
         
-        prompt = TOPIC_GENERATION_PROMPT.format(count=count)
+        prompt = TOPIC_TASK_PROMPT.format(count=count)
         
+        start = time.perf_counter()
         response = client.chat.completions.create(
             model="gpt-4o-mini",
             messages=[
-                {"role": "system", "content": "Você é um especialista em conteúdo viral."},
+                {"role": "system", "content": TOPIC_SYSTEM_PROMPT},
                 {"role": "user", "content": prompt}
             ],
             response_format={"type": "json_object"}
         )
+        budget.track_llm_usage("openai", openai_usage(response.usage), time.perf_counter() - start)
         
         data = json.loads(response.choices[0].message.content)
         return data.get("topics", [])
     
     def _get_fallback_topics(self, count: int) -> List[Dict]:
         """Get fallback topics when AI is not available."""
-        fallback = [
-            {"title": "Por que o céu é azul", "category": "Ciência", "hook_suggestion": "Você sabe por que o céu muda de cor?"},
-            {"title": "Como os gatos sempre caem de pé", "category": "Natureza", "hook_suggestion": "Esse truque dos gatos vai te surpreender"},
-            {"title": "O mistério do Triângulo das Bermudas", "category": "Mistério", "hook_suggestion": "A verdade sobre o Triângulo das Bermudas"},
-            {"title": "Por que temos impressões digitais únicas", "category": "Corpo Humano", "hook_suggestion": "Você sabia que suas digitais são únicas?"},
-            {"title": "Como funciona a aurora boreal", "category": "Espaço", "hook_suggestion": "O fenômeno mais bonito da natureza"},
-            {"title": "A verdade sobre sonhos lúcidos", "category": "Mente", "hook_suggestion": "Controle seus sonhos com esta técnica"},
-            {"title": "Por que o sal derrete o gelo", "category": "Química", "hook_suggestion": "A ciência por trás do derretimento"},
-            {"title": "Como as plantas carnívoras capturam presas", "category": "Natureza", "hook_suggestion": "Plantas que comem insetos!"},
-            {"title": "O fenômeno da déjà vu", "category": "Mente", "hook_suggestion": "Por que sentimos que já vivemos isso?"},
-            {"title": "Como os camaleões mudam de cor", "category": "Animais", "hook_suggestion": "O segredo da camuflagem perfeita"}
-        ]
-        
-        return random.sample(fallback, min(count, len(fallback)))
+        return random.sample(FALLBACK_TOPICS, min(count, len(FALLBACK_TOPICS)))
     
     def add_topics(self, topics: List[Dict]):
         """Add topics to database."""
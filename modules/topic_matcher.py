@@ -0,0 +1,203 @@
+"""
+Topic normalization and near-duplicate matching.
+Normalizes Portuguese topics (case, accents, stopwords, plurals, word
+order) and finds close paraphrases of past topics with MinHash/LSH.
+"""
+
+import json
+import random
+import re
+import threading
+import unicodedata
+import zlib
+from typing import Dict, List, Optional, Set, Tuple
+
+from config.settings import settings
+
+STOPWORDS = {
+    "a", "o", "as", "os", "um", "uma", "uns", "umas", "de", "da", "do", "das", "dos",
+    "em", "no", "na", "nos", "nas", "por", "para", "pra", "pelo", "pela", "pelos", "pelas",
+    "e", "ou", "que", "se", "ao", "aos", "como", "qual", "quais", "quando",
+    "onde", "porque", "sobre", "seu", "sua", "seus", "suas",
+    "mas", "isso", "esse", "essa", "este", "esta", "ele", "ela", "eles", "elas", "sao", "foi",
+    "ser", "tem", "ja", "voce", "nosso", "nossa",
+    # Negation/polarity words ("nao", "sem", "com", "mais", "menos"...) are kept:
+    # they flip the subject of a video
+    # Framing words that don't change the subject of a video
+    "verdade", "misterio", "segredo", "curiosidade", "fato", "incrivel", "realmente",
+}
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+MERSENNE_PRIME = (1 << 61) - 1
+
+# Fixed seeds so signatures are stable across processes and runs
+_rng = random.Random(20240601)
+PERMUTATIONS = [
+    (_rng.randrange(1, MERSENNE_PRIME), _rng.randrange(0, MERSENNE_PRIME))
+    for _ in range(NUM_PERM)
+]
+
+def _strip_accents(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in text if not unicodedata.combining(ch))
+
+def _stem(token: str) -> str:
+    """
+    Light Portuguese plural folding of an accented lowercase word.
+
+    Singular and plural map to the same key, which is not always the
+    dictionary singular (barril/barris -> "barri", árvore/árvores -> "árvor").
+    """
+    if len(token) > 4 and token.endswith(("ões", "ães", "oes", "aes")):
+        return token[:-3] + "ão"
+    if len(token) > 3 and token.endswith("éis"):
+        return token[:-3] + "el"   # papéis -> papel
+    if len(token) > 3 and token.endswith("óis"):
+        return token[:-3] + "ol"   # faróis -> farol
+    if len(token) > 4 and token.endswith("veis"):
+        return token[:-4] + "vel"  # incríveis -> incrível
+    if len(token) > 4 and token.endswith("eis"):
+        return token[:-3] + "i"    # fósseis -> fóssi (= fóssil)
+    if len(token) > 4 and token.endswith("ais"):
+        return token[:-3] + "al"   # animais -> animal
+    if len(token) > 3 and token.endswith("il"):
+        return token[:-1]          # fóssil, barril -> fóssi, barri (= fósseis, barris)
+    if len(token) > 4 and token.endswith(("res", "zes", "ses")):
+        return token[:-2]          # flores, luzes, países -> flor, luz, país
+    if len(token) > 3 and token.endswith(("re", "ze", "se")):
+        return token[:-1]          # árvore, classe -> árvor, class (= árvores, classes)
+    if len(token) > 3 and token.endswith("ns"):
+        return token[:-2] + "m"
+    if len(token) > 3 and token.endswith("s") and token[-2] not in "áéíóúâêô":
+        return token[:-1]          # país, mês stay singular
+    return token
+
+def topic_tokens(topic: str) -> List[str]:
+    """Content words of a topic: lowercase, no accents/punctuation/stopwords, singular."""
+    words = re.findall(r"[0-9a-zà-öø-ÿ]+", unicodedata.normalize("NFC", topic.lower()))
+    tokens = []
+    for word in words:
+        if _strip_accents(word) in STOPWORDS:
+            continue
+        stem = _strip_accents(_stem(word))
+        if stem not in STOPWORDS:
+            tokens.append(stem)
+    return tokens
+
+def normalize_topic(topic: str) -> str:
+    """Canonical form of a topic (word order independent)."""
+    tokens = sorted(set(topic_tokens(topic)))
+    return " ".join(tokens) if tokens else topic.strip().lower()
+
+def shingles(topic: str) -> Set[str]:
+    """Words plus character trigrams of each word (tolerates small wording changes)."""
+    result = set()
+    for token in topic_tokens(topic):
+        result.add(token)
+        padded = f"^{token}$"
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+class TopicMatcher:
+    """MinHash/LSH index of past topics."""
+
+    def __init__(self):
+        self.index_file = settings.DATA_DIR / "topic_index.json"
+        self._lock = threading.Lock()
+        self.topics: Dict[str, str] = {}  # normalized -> original topic
+        self._signatures: Dict[str, List[int]] = {}
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], Set[str]] = {}
+        self._load()
+
+    def _load(self):
+        if not self.index_file.exists():
+            return
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        for topic in data.get("topics", {}).values():
+            self._index(topic)
+
+    def _save(self):
+        with open(self.index_file, 'w', encoding='utf-8') as f:
+            json.dump({"topics": self.topics}, f, indent=2, ensure_ascii=False)
+
+    def _signature(self, topic_shingles: Set[str]) -> List[int]:
+        hashes = [zlib.crc32(s.encode()) for s in topic_shingles] or [0]
+        return [
+            min((a * h + b) % MERSENNE_PRIME for h in hashes)
+            for a, b in PERMUTATIONS
+        ]
+
+    def _index(self, topic: str) -> str:
+        normalized = normalize_topic(topic)
+        if normalized in self.topics:
+            return normalized
+        signature = self._signature(shingles(topic))
+        self.topics[normalized] = topic
+        self._signatures[normalized] = signature
+        for band in range(BANDS):
+            key = (band, tuple(signature[band * ROWS:(band + 1) * ROWS]))
+            self._buckets.setdefault(key, set()).add(normalized)
+        return normalized
+
+    def add(self, topic: str) -> str:
+        """
+        Index a topic that now has a cached script.
+
+        Returns:
+            The normalized topic
+        """
+        with self._lock:
+            known = normalize_topic(topic) in self.topics
+            normalized = self._index(topic)
+            if not known:
+                self._save()
+            return normalized
+
+    def find_similar(self, topic: str, threshold: Optional[float] = None) -> Optional[Tuple[str, float]]:
+        """
+        Most similar indexed topic at or above threshold.
+
+        LSH buckets give the candidates; the exact shingle Jaccard
+        similarity decides.
+
+        Args:
+            topic: Topic to look up
+            threshold: Minimum similarity (SCRIPT_SIMILARITY_THRESHOLD if None)
+
+        Returns:
+            (original topic, similarity), or None
+        """
+        threshold = settings.SCRIPT_SIMILARITY_THRESHOLD if threshold is None else threshold
+        normalized = normalize_topic(topic)
+        if normalized in self.topics:
+            return self.topics[normalized], 1.0
+
+        topic_shingles = shingles(topic)
+        signature = self._signature(topic_shingles)
+
+        candidates = set()
+        for band in range(BANDS):
+            key = (band, tuple(signature[band * ROWS:(band + 1) * ROWS]))
+            candidates |= self._buckets.get(key, set())
+
+        best = None
+        for candidate in candidates:
+            original = self.topics[candidate]
+            similarity = jaccard(topic_shingles, shingles(original))
+            if similarity >= threshold and (best is None or similarity > best[1]):
+                best = (original, similarity)
+        return best
+
+# Global instance
+topic_matcher = TopicMatcher()
@@ -0,0 +1,222 @@
+"""
+TTS provider router.
+Orders providers by cost within latency and free-tier quota limits, and
+stops calling a failing provider with a per-provider circuit breaker.
+"""
+
+import itertools
+import json
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from config.settings import settings
+from modules.budget_controller import budget
+
+EWMA_ALPHA = 0.3         # Weight of the newest observation
+MIN_LATENCY_CHARS = 200  # Short segments are timed as if this long
+
+# gTTS is never routed by cost: it is the explicit last resort
+FINAL_PROVIDER = "gtts"
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class CircuitOpen(Exception):
+    """A request was denied by the provider's circuit breaker."""
+
+class TTSRouter:
+    """Tracks provider health and decides the order providers are tried in."""
+
+    def __init__(self):
+        self.state_file = settings.DATA_DIR / "tts_router.json"
+        self._lock = threading.RLock()
+        self.stats: Dict[str, Dict] = self._load_stats()
+        self._probes: Dict[str, Tuple[str, float]] = {}  # provider -> (ticket, start) of its half-open probe
+        self._tickets = itertools.count(1)
+
+    def _load_stats(self) -> Dict[str, Dict]:
+        if self.state_file.exists():
+            try:
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                pass
+        return {}
+
+    def _save_stats(self):
+        with open(self.state_file, 'w', encoding='utf-8') as f:
+            json.dump(self.stats, f, indent=2, ensure_ascii=False)
+
+    def _entry(self, provider: str) -> Dict:
+        return self.stats.setdefault(provider, {
+            "latency_per_1k": None,   # EWMA seconds per 1K characters
+            "error_rate": 0.0,        # EWMA of failures (0..1)
+            "requests": 0,
+            "failures": 0,
+            "consecutive_failures": 0,
+            "state": CLOSED,
+            "opened_at": 0.0,
+            "last_error": ""
+        })
+
+    def _breaker_allows(self, provider: str) -> bool:
+        """Whether the circuit breaker would let a request through right now."""
+        entry = self._entry(provider)
+        if entry["state"] == CLOSED:
+            return True
+        if entry["state"] == OPEN:
+            return time.time() - entry["opened_at"] >= settings.TTS_BREAKER_COOLDOWN
+        # Half-open: only while no probe is in flight (a lost probe expires)
+        probe = self._probes.get(provider)
+        return probe is None or time.time() - probe[1] >= settings.TTS_BREAKER_PROBE_TIMEOUT
+
+    def acquire(self, provider: str) -> Optional[str]:
+        """
+        Admit one request to provider (call right before sending it).
+
+        Once the cooldown has elapsed the circuit goes half-open and this
+        request becomes the single probe; every other request is denied
+        until the probe's outcome is recorded, it is released, or
+        TTS_BREAKER_PROBE_TIMEOUT passes.
+
+        Returns:
+            None if the request must not be sent, otherwise a ticket for
+            release() ("" unless this request is the probe)
+        """
+        with self._lock:
+            if not self._breaker_allows(provider):
+                return None
+            entry = self._entry(provider)
+            if entry["state"] == OPEN:
+                entry["state"] = HALF_OPEN
+                print(f"🔌 {provider}: circuito semiaberto, testando novamente")
+                self._save_stats()
+            if entry["state"] != HALF_OPEN:
+                return ""
+            ticket = str(next(self._tickets))
+            self._probes[provider] = (ticket, time.time())
+            return ticket
+
+    def release(self, provider: str, ticket: str):
+        """
+        Give up a probe without an outcome (e.g. the consumer stopped reading).
+
+        The circuit stays half-open so the next request probes again. Safe to
+        call after record() or with a non-probe ticket.
+        """
+        with self._lock:
+            probe = self._probes.get(provider)
+            if ticket and probe and probe[0] == ticket:
+                del self._probes[provider]
+
+    def predicted_latency(self, provider: str, characters: int) -> Optional[float]:
+        """Expected seconds to synthesize characters (None until measured)."""
+        rate = self._entry(provider)["latency_per_1k"]
+        if rate is None:
+            return None
+        return rate * max(characters, MIN_LATENCY_CHARS) / 1000
+
+    def route(self, characters: int, providers: List[str]) -> List[str]:
+        """
+        Order providers for a request.
+
+        Providers with an open circuit or without enough free-tier quota
+        are dropped. The rest are sorted cheapest first (ties keep the
+        TTS_PROVIDER order); providers predicted to exceed
+        TTS_MAX_LATENCY_SECONDS go after those that fit. gTTS, if given,
+        is always last.
+
+        Args:
+            characters: Length of the text to synthesize
+            providers: Configured providers, in TTS_PROVIDER order
+
+        Returns:
+            Providers to try, in order
+        """
+        can_spend, _ = budget.can_proceed()
+
+        fitting, slow = [], []
+        with self._lock:
+            for index, provider in enumerate(providers):
+                if provider == FINAL_PROVIDER:
+                    continue
+                if not self._breaker_allows(provider):
+                    continue
+
+                quota = budget.tts_quota_remaining(provider)
+                if provider == "elevenlabs_free" and quota is not None and quota < characters:
+                    continue
+
+                cost = budget.tts_cost(provider, characters)
+                if cost > 0 and not can_spend:
+                    continue
+
+                latency = self.predicted_latency(provider, characters)
+                if latency is not None and latency > settings.TTS_MAX_LATENCY_SECONDS:
+                    slow.append((latency, index, provider))
+                else:
+                    fitting.append((cost, index, provider))
+
+        order = [p for _, _, p in sorted(fitting)] + [p for _, _, p in sorted(slow)]
+        if FINAL_PROVIDER in providers:
+            order.append(FINAL_PROVIDER)
+        return order
+
+    def record(self, provider: str, success: bool, seconds: float, characters: int, error: str = ""):
+        """
+        Record the outcome of one synthesis request.
+
+        Args:
+            provider: Provider name
+            success: Whether audio was produced
+            seconds: Wall time of the request
+            characters: Length of the synthesized text
+            error: Error message on failure
+        """
+        with self._lock:
+            # Any outcome resolves a half-open probe (success closes, failure reopens)
+            self._probes.pop(provider, None)
+            entry = self._entry(provider)
+            entry["requests"] += 1
+            entry["error_rate"] = (1 - EWMA_ALPHA) * entry["error_rate"] + EWMA_ALPHA * (0.0 if success else 1.0)
+
+            if success:
+                rate = seconds * 1000 / max(characters, MIN_LATENCY_CHARS)
+                previous = entry["latency_per_1k"]
+                entry["latency_per_1k"] = rate if previous is None else (1 - EWMA_ALPHA) * previous + EWMA_ALPHA * rate
+                entry["consecutive_failures"] = 0
+                if entry["state"] != CLOSED:
+                    print(f"🔌 {provider}: circuito fechado")
+                entry["state"] = CLOSED
+            else:
+                entry["failures"] += 1
+                entry["consecutive_failures"] += 1
+                entry["last_error"] = error[:200]
+                if entry["state"] == HALF_OPEN or entry["consecutive_failures"] >= settings.TTS_BREAKER_FAILURES:
+                    if entry["state"] != OPEN:
+                        print(f"🔌 {provider}: circuito aberto por {settings.TTS_BREAKER_COOLDOWN}s após {entry['consecutive_failures']} falha(s)")
+                    entry["state"] = OPEN
+                    entry["opened_at"] = time.time()
+
+            self._save_stats()
+
+    def get_status(self) -> Dict[str, Dict]:
+        """Snapshot of per-provider health (for reports and the dashboard)."""
+        with self._lock:
+            return {
+                provider: {
+                    "state": entry["state"],
+                    "latency_per_1k": entry["latency_per_1k"],
+                    "error_rate": round(entry["error_rate"], 3),
+                    "requests": entry["requests"],
+                    "failures": entry["failures"],
+                    "quota_remaining": budget.tts_quota_remaining(provider),
+                    "last_error": entry["last_error"]
+                }
+                for provider, entry in self.stats.items()
+            }
+
+# Global instance
+tts_router = TTSRouter()
@@ -9,8 +9,7 @@ import json
 
 try:
     from moviepy.editor import (
-        VideoFileClip, AudioFileClip, CompositeVideoClip,
-        TextClip, concatenate_videoclips, CompositeAudioClip
+        VideoClip, concatenate_videoclips, CompositeAudioClip
     )
     from moviepy.video.fx import resize
     MOVIEPY_AVAILABLE = True
@@ -18,6 +17,9 @@ except ImportError:
     MOVIEPY_AVAILABLE = False
 
 from config.settings import settings
+from modules.caption_renderer import caption_renderer, CaptionStyle
+from modules.clip_pool import ReaderPool
+from modules.caption_aligner import caption_aligner, even_timings
 
 class VideoEditor:
     """Creates final videos by combining all assets."""
@@ -55,67 +57,65 @@ class VideoEditor:
         """
         print("🎬 Iniciando edição de vídeo...")
         
-        # Load narration to get duration
-        narration = AudioFileClip(str(narration_audio))
-        video_duration = narration.duration
-        
-        print(f"   ⏱️  Duração total: {video_duration:.1f}s")
-        
-        # Create background video
-        background_clip = self._create_background(
-            background_videos,
-            video_duration
-        )
-        
-        # Add captions
-        video_with_captions = self._add_captions(
-            background_clip,
-            script
-        )
-        
-        # Add narration audio
-        final_audio = narration
-        
-        # Add background music if provided
-        if background_music and background_music.exists():
-            print("   🎵 Adicionando música de fundo...")
-            music = AudioFileClip(str(background_music))
-            music = music.volumex(0.1)  # -20dB (10% volume)
-            music = music.set_duration(video_duration)
+        # Every reader opened for this video is closed when the pool exits,
+        # so ffmpeg processes don't pile up across a batch
+        with ReaderPool() as pool:
+            # Load narration to get duration
+            narration = pool.audio(narration_audio)
+            video_duration = narration.duration
             
-            final_audio = CompositeAudioClip([narration, music])
-        
-        # Set audio to video
-        final_video = video_with_captions.set_audio(final_audio)
-        
-        # Generate output filename
-        if not output_filename:
-            from datetime import datetime
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_filename = f"video_{timestamp}.mp4"
-        
-        output_path = self.output_dir / output_filename
-        
-        # Export video
-        print(f"   📤 Exportando vídeo para: {output_path.name}")
-        final_video.write_videofile(
-            str(output_path),
-            fps=settings.VIDEO_FPS,
-            codec='libx264',
-            audio_codec='aac',
-            temp_audiofile='temp-audio.m4a',
-            remove_temp=True,
-            logger=None,  # Suppress verbose output
-            preset='medium',
-            threads=4
-        )
-        
-        # Cleanup
-        narration.close()
-        background_clip.close()
-        final_video.close()
-        if background_music:
-            music.close()
+            print(f"   ⏱️  Duração total: {video_duration:.1f}s")
+            
+            # Create background video
+            background_clip = self._create_background(
+                background_videos,
+                video_duration,
+                pool
+            )
+            
+            # Add captions
+            video_with_captions = self._add_captions(
+                background_clip,
+                script,
+                narration_audio
+            )
+            
+            # Add narration audio
+            final_audio = narration
+            
+            # Add background music if provided
+            if background_music and background_music.exists() and background_music.stat().st_size > 0:
+                print("   🎵 Adicionando música de fundo...")
+                music = pool.audio(background_music)
+                music = music.volumex(0.1)  # -20dB (10% volume)
+                music = music.set_duration(video_duration)
+                
+                final_audio = CompositeAudioClip([narration, music])
+            
+            # Set audio to video
+            final_video = video_with_captions.set_audio(final_audio)
+            
+            # Generate output filename
+            if not output_filename:
+                from datetime import datetime
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                output_filename = f"video_{timestamp}.mp4"
+            
+            output_path = self.output_dir / output_filename
+            
+            # Export video
+            print(f"   📤 Exportando vídeo para: {output_path.name}")
+            final_video.write_videofile(
+                str(output_path),
+                fps=settings.VIDEO_FPS,
+                codec='libx264',
+                audio_codec='aac',
+                temp_audiofile='temp-audio.m4a',
+                remove_temp=True,
+                logger=None,  # Suppress verbose output
+                preset='medium',
+                threads=4
+            )
         
         print(f"✅ Vídeo criado: {output_path}")
         
@@ -127,8 +127,9 @@ class VideoEditor:
     def _create_background(
         self,
         video_paths: List[Path],
-        target_duration: float
-    ) -> VideoFileClip:
+        target_duration: float,
+        pool: ReaderPool
+    ) -> VideoClip:
         """Create background video from multiple clips."""
         print("   🎥 Processando vídeos de fundo...")
         
@@ -144,7 +145,7 @@ class VideoEditor:
                 continue
             
             try:
-                clip = VideoFileClip(str(video_path))
+                clip = pool.video(video_path)
                 
                 # Resize to vertical (9:16)
                 clip = clip.resize(
@@ -163,15 +164,9 @@ class VideoEditor:
                         y2=settings.VIDEO_HEIGHT
                     )
                 
-                # Trim or loop clip
+                # Trim or loop clip (looping reuses the same reader)
                 remaining = target_duration - current_duration
-                if clip.duration > remaining:
-                    clip = clip.subclip(0, remaining)
-                else:
-                    # Loop if too short
-                    loops_needed = int(remaining / clip.duration) + 1
-                    clip = concatenate_videoclips([clip] * loops_needed)
-                    clip = clip.subclip(0, remaining)
+                clip = pool.loop(clip, remaining)
                 
                 clips.append(clip)
                 current_duration += clip.duration
@@ -190,6 +185,9 @@ class VideoEditor:
                 duration=target_duration
             )
         
+        if len(clips) == 1:
+            return clips[0]
+        
         # Concatenate all clips
         final_clip = concatenate_videoclips(clips, method="compose")
         
@@ -197,57 +195,62 @@ class VideoEditor:
     
     def _add_captions(
         self,
-        video: VideoFileClip,
-        script: Dict
-    ) -> CompositeVideoClip:
-        """Add dynamic captions to video."""
+        video: VideoClip,
+        script: Dict,
+        narration_audio: Optional[Path] = None
+    ) -> VideoClip:
+        """Add dynamic captions to video (rasterized once, blended per frame)."""
         print("   💬 Adicionando legendas...")
         
+        if caption_renderer is None:
+            print("   ⚠️  Pillow/numpy ausentes, continuando sem legendas...")
+            return video
+        
         # Combine all text
         full_text = f"{script['hook']} {script['body']} {script['outro']}"
         
         # Split into words for dynamic display
         words = full_text.split()
+        if not words:
+            return video
         
-        # Calculate timing (simple: evenly distribute)
-        duration_per_word = video.duration / len(words)
+        # Word timing aligned to the narration (even spread as fallback)
+        if narration_audio:
+            timings = caption_aligner.align(narration_audio, words, video.duration)
+        else:
+            timings = even_timings(len(words), video.duration)
         
-        # Create caption clips (showing 3-4 words at a time)
-        caption_clips = []
+        # Build caption chunks (showing 3-4 words at a time)
+        chunks = []
         words_per_caption = 4
         
         for i in range(0, len(words), words_per_caption):
             chunk = " ".join(words[i:i + words_per_caption])
-            start_time = i * duration_per_word
-            end_time = start_time + (words_per_caption * duration_per_word)
-            
-            try:
-                txt_clip = TextClip(
-                    chunk,
-                    fontsize=50,
-                    color='white',
-                    font='Arial-Bold',
-                    stroke_color='black',
-                    stroke_width=2,
-                    method='caption',
-                    size=(settings.VIDEO_WIDTH - 100, None)
-                )
-                
-                txt_clip = txt_clip.set_position(('center', 'center'))
-                txt_clip = txt_clip.set_start(start_time)
-                txt_clip = txt_clip.set_duration(min(words_per_caption * duration_per_word, video.duration - start_time))
-                
-                caption_clips.append(txt_clip)
-                
-            except Exception as e:
-                print(f"   ⚠️  Erro ao criar legenda: {e}")
-                continue
+            start_time = timings[i][0]
+            end_time = min(timings[min(i + words_per_caption, len(words)) - 1][1], video.duration)
+            chunks.append((chunk, start_time, end_time))
         
-        # Composite video with captions
-        if caption_clips:
-            return CompositeVideoClip([video] + caption_clips)
-        else:
+        style = CaptionStyle(
+            font_size=50,
+            stroke_width=2,
+            max_width=settings.VIDEO_WIDTH - 100
+        )
+        
+        try:
+            track = caption_renderer.build_track(
+                chunks,
+                (settings.VIDEO_WIDTH, settings.VIDEO_HEIGHT),
+                style
+            )
+        except Exception as e:
+            print(f"   ⚠️  Erro ao criar legendas: {e}")
             return video
+        
+        if not len(track):
+            return video
+        
+        # Only the active caption is blended into each frame
+        return video.fl(lambda get_frame, t: track.blend(get_frame(t), t))
     
     def _save_metadata(self, video_path: Path, script: Dict):
         """Save video metadata as JSON."""
@@ -1,37 +1,98 @@
 """
 Voice narration module with multi-provider TTS support.
-Supports Google TTS (free), ElevenLabs (free tier + paid).
+Supports Google TTS (free), ElevenLabs (free tier + paid) and a local
+offline engine (espeak-ng).
 """
 
-import hashlib
-import requests
+import asyncio
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Dict, Iterator, List, Optional
 
 from config.settings import settings
 from modules.budget_controller import budget
+from modules.http_client import http_client
+from modules.rate_governor import rate_governor
+from modules.audio_utils import measure_loudness, stitch_audio
+from modules.text_utils import split_sentences
+from modules.narration_cache import narration_cache
+from modules.tts_router import CircuitOpen, tts_router
+from modules.local_tts import local_tts
+from modules.duration_predictor import duration_predictor
+
+# Max simultaneous requests per provider in chunked mode
+PROVIDER_CONCURRENCY = {
+    "google": 4,
+    "elevenlabs_free": 2,
+    "elevenlabs_paid": 3,
+    "gtts": 2,
+    "local": os.cpu_count() or 2,
+}
+
+# Bytes per chunk when streaming audio
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# Voice parameters (part of the cache key)
+GOOGLE_VOICE = "pt-BR-Wavenet-B"
+GOOGLE_AUDIO_SETTINGS = {"speaking_rate": 1.0, "pitch": 0.0}
+ELEVENLABS_MODEL_ID = "eleven_multilingual_v2"
+ELEVENLABS_VOICE_SETTINGS = {
+    "stability": 0.5,
+    "similarity_boost": 0.75,
+    "style": 0.0,
+    "use_speaker_boost": True
+}
+GTTS_LANG = "pt"
 
 class VoiceNarrator:
     """Generates voice narration using TTS providers."""
     
     def __init__(self):
-        self.cache_dir = settings.DATA_DIR / "audio_cache"
-        self.cache_dir.mkdir(exist_ok=True)
+        self.cache_dir = narration_cache.cache_dir
     
-    def _get_cache_key(self, text: str) -> str:
-        """Generate cache key for text."""
-        return hashlib.md5(text.encode()).hexdigest()
+    def _voice_profile(self, provider: str) -> Dict:
+        """Engine, voice, model and settings that determine the audio produced."""
+        if provider == "google":
+            return {"provider": "google", "voice": GOOGLE_VOICE, "model": "wavenet",
+                    "voice_settings": GOOGLE_AUDIO_SETTINGS}
+        if provider in ("elevenlabs_free", "elevenlabs_paid"):
+            # Free and paid tiers produce identical audio
+            return {"provider": "elevenlabs", "voice": settings.ELEVENLABS_VOICE_ID,
+                    "model": ELEVENLABS_MODEL_ID, "voice_settings": ELEVENLABS_VOICE_SETTINGS}
+        if provider == "gtts":
+            return {"provider": "gtts", "voice": GTTS_LANG, "model": "gtts", "voice_settings": {}}
+        if provider == "local":
+            return {"provider": "local", "voice": local_tts.voice, "model": local_tts.engine or "",
+                    "voice_settings": {"rate": local_tts.rate}}
+        return {"provider": provider, "voice": "", "model": "", "voice_settings": {}}
     
-    def _load_from_cache(self, cache_key: str) -> Optional[Path]:
+    def _get_cache_key(self, text: str, provider: str) -> str:
+        """Generate cache key for text spoken by a provider's voice."""
+        return narration_cache.make_key(text, **self._voice_profile(provider))
+    
+    def _load_from_cache(self, cache_key: str, quiet: bool = False) -> Optional[Path]:
         """Load audio from cache if exists."""
-        if not settings.CACHE_AGGRESSIVE:
-            return None
-        
-        cache_file = self.cache_dir / f"{cache_key}.mp3"
-        if cache_file.exists():
+        cache_file = narration_cache.get(cache_key)
+        if cache_file and not quiet:
             print("📦 Áudio encontrado no cache")
-            return cache_file
-        return None
+        return cache_file
+    
+    def _register(self, cache_key: str, path: Path, provider: str, text: str) -> Path:
+        """Add a synthesized file to the cache index."""
+        profile = self._voice_profile(provider)
+        narration_cache.put(
+            cache_key,
+            path,
+            provider=profile["provider"],
+            voice=profile["voice"],
+            model=profile["model"],
+            characters=len(text)
+        )
+        return path
     
     def generate(self, script: dict) -> Path:
         """
@@ -46,98 +107,441 @@ class VoiceNarrator:
         # Combine script parts
         full_text = f"{script['hook']} {script['body']} {script['outro']}"
         
-        # Check cache
-        cache_key = self._get_cache_key(full_text)
-        cached = self._load_from_cache(cache_key)
-        if cached:
-            return cached
-        
-        # Generate using provider priority
-        print(f"🔍 DEBUG: TTS_PROVIDER list = {settings.TTS_PROVIDER}")
-        print(f"🔍 DEBUG: ELEVENLABS_API_KEY = {'SET' if settings.ELEVENLABS_API_KEY else 'NOT SET'}")
-        print(f"🔍 DEBUG: GOOGLE_TTS_API_KEY = {'SET' if settings.GOOGLE_TTS_API_KEY else 'NOT SET'}")
+        if (settings.TTS_CHUNKED or settings.TTS_PHRASE_CACHE) and not self._can_stitch():
+            # Segments can't be assembled without ffmpeg: narrate the whole text
+            print("⚠️ FFmpeg não instalado: narração gerada sem divisão em trechos")
+        elif settings.TTS_CHUNKED:
+            return self._generate_segmented(script, "chunked")
+        elif settings.TTS_PHRASE_CACHE:
+            return self._generate_segmented(script, "phrases")
         
-        for provider in settings.TTS_PROVIDER:
+        for provider in self._route(full_text):
+            # Check cache (keyed by this provider's voice)
+            cache_key = self._get_cache_key(full_text, provider)
+            cached = self._load_from_cache(cache_key)
+            if cached:
+                return cached
+            
             try:
-                print(f"🔄 Tentando provedor: {provider}")
-                if provider == "google" and settings.GOOGLE_TTS_API_KEY:
-                    audio_path = self._generate_with_google_tts(full_text, cache_key)
-                elif provider == "elevenlabs_free" and settings.ELEVENLABS_API_KEY:
-                    audio_path = self._generate_with_elevenlabs(full_text, cache_key, free_tier=True)
-                elif provider == "elevenlabs_paid" and settings.ELEVENLABS_API_KEY:
-                    audio_path = self._generate_with_elevenlabs(full_text, cache_key, free_tier=False)
-                else:
-                    print(f"⏭️  {provider} não configurado ou não atende aos requisitos, pulando...")
-                    continue
-                
-                return audio_path
-                
+                return self._synthesize(provider, full_text, cache_key)
             except Exception as e:
                 print(f"⚠️ Erro com {provider}: {e}")
-                import traceback
-                traceback.print_exc()
-                continue
         
-        # Final fallback: try gTTS (no API key needed)
-        print("\n⚠️  Nenhum provedor TTS pago disponível")
-        print("🔄 Tentando fallback: gTTS (grátis, sem API key)...")
+        raise Exception("❌ Nenhum provedor TTS disponível (configure ElevenLabs, Google TTS, ou instale gTTS)")
+    
+    def _route(self, text: str, quiet: bool = False) -> List[str]:
+        """Configured providers in the order the router wants them tried."""
+        configured = [p for p in settings.TTS_PROVIDER if p != "gtts" and self._is_configured(p)]
+        if self._is_configured("gtts"):
+            configured.append("gtts")
+        
+        order = tts_router.route(len(text), configured)
+        skipped = [p for p in configured if p not in order]
+        if skipped and not quiet:
+            print(f"⏭️  Provedores indisponíveis no momento: {', '.join(skipped)}")
+        return order
+    
+    def predict_duration(self, script: dict) -> float:
+        """
+        Predict the narration length before synthesizing it.
+        
+        Uses the voice of the provider the router would pick first.
         
+        Args:
+            script: Script dictionary with hook, body, outro
+        
+        Returns:
+            Predicted duration in seconds
+        """
+        full_text = f"{script['hook']} {script['body']} {script['outro']}"
+        providers = self._route(full_text, quiet=True)
+        profile = self._voice_profile(providers[0] if providers else "gtts")
+        return duration_predictor.predict(full_text, profile["provider"], profile["voice"])
+    
+    def _is_configured(self, provider: str) -> bool:
+        """Check whether a provider from TTS_PROVIDER can be used."""
+        if provider == "google":
+            return bool(settings.GOOGLE_TTS_API_KEY)
+        if provider in ("elevenlabs_free", "elevenlabs_paid"):
+            return bool(settings.ELEVENLABS_API_KEY)
+        if provider == "local":
+            return local_tts.available
+        if provider == "gtts":
+            try:
+                from modules.gtts_narrator import gtts_narrator
+                return gtts_narrator is not None
+            except Exception:
+                return False
+        return False
+    
+    def _synthesize(self, provider: str, text: str, cache_key: str) -> Path:
+        """Synthesize text with one provider, report the outcome and index the result."""
+        ticket = tts_router.acquire(provider)
+        if ticket is None:
+            raise CircuitOpen(f"{provider}: circuito aberto ou em teste")
+        start = time.perf_counter()
         try:
-            from modules.gtts_narrator import gtts_narrator
-            if gtts_narrator:
-                audio_path = self._generate_with_gtts(full_text, cache_key)
-                return audio_path
+            if provider == "google":
+                path = self._generate_with_google_tts(text, cache_key)
+            elif provider == "elevenlabs_free":
+                path = self._generate_with_elevenlabs(text, cache_key, free_tier=True)
+            elif provider == "elevenlabs_paid":
+                path = self._generate_with_elevenlabs(text, cache_key, free_tier=False)
+            elif provider == "gtts":
+                path = self._generate_with_gtts(text, cache_key)
+            elif provider == "local":
+                path = self._generate_with_local(text, cache_key)
+            else:
+                raise ValueError(f"Provedor TTS desconhecido: {provider}")
         except Exception as e:
-            print(f"⚠️ gTTS também falhou: {e}")
-        
-        raise Exception("❌ Nenhum provedor TTS disponível (configure ElevenLabs, Google TTS, ou instale gTTS)")
+            tts_router.record(provider, False, time.perf_counter() - start, len(text), str(e))
+            raise
+        finally:
+            tts_router.release(provider, ticket)
+        tts_router.record(provider, True, time.perf_counter() - start, len(text))
+        return self._register(cache_key, path, provider, text)
     
-    def _generate_with_google_tts(self, text: str, cache_key: str) -> Path:
-        """Generate audio using Google Cloud TTS."""
-        print("🔊 Gerando narração com Google TTS...")
+    def _generate_segmented(self, script: dict, mode: str) -> Path:
+        """
+        Synthesize the narration in segments and assemble them.
         
-        try:
-            from google.cloud import texttospeech
+        Modes:
+            chunked: every sentence is a segment, synthesized concurrently
+            phrases: hook/outro sentences and any sentence already cached are
+                reused as phrases; only the novel text is sent to the provider
+        
+        Each segment is cached on its own, so recurring phrases and edited
+        scripts only pay for the text that changed.
+        """
+        full_text = f"{script['hook']} {script['body']} {script['outro']}"
+        stitch_params = f"gap={settings.TTS_CHUNK_GAP_MS}:xfade={settings.TTS_CHUNK_CROSSFADE_MS}"
+        
+        # Same provider for every segment so the voice stays consistent
+        for provider in self._route(full_text):
+            final_key = self._get_cache_key(f"{mode}:{stitch_params}:{full_text}", provider)
+            cached = self._load_from_cache(final_key)
+            if cached:
+                return cached
             
-            client = texttospeech.TextToSpeechClient()
+            if mode == "chunked":
+                segments = split_sentences(full_text)
+                print(f"🧩 Narração em {len(segments)} trechos (modo paralelo)")
+            else:
+                segments = self._phrase_segments(script, provider)
             
-            # Configure voice
-            synthesis_input = texttospeech.SynthesisInput(text=text)
-            voice = texttospeech.VoiceSelectionParams(
-                language_code="pt-BR",
-                name="pt-BR-Wavenet-B",  # Male voice
-                ssml_gender=texttospeech.SsmlVoiceGender.MALE
-            )
-            audio_config = texttospeech.AudioConfig(
-                audio_encoding=texttospeech.AudioEncoding.MP3,
-                speaking_rate=1.0,
-                pitch=0.0
-            )
+            output_path = narration_cache.path_for(final_key)
+            try:
+                segment_paths = self._synthesize_chunks(provider, segments)
+                self._assemble(segment_paths, output_path)
+            except Exception as e:
+                print(f"⚠️ Erro com {provider} ({mode}): {e}")
+                continue
             
-            response = client.synthesize_speech(
-                input=synthesis_input,
-                voice=voice,
-                audio_config=audio_config
+            print(f"✅ Narração montada a partir de {len(segment_paths)} trechos")
+            return self._register(final_key, output_path, provider, full_text)
+        
+        raise Exception("❌ Nenhum provedor TTS disponível (configure ElevenLabs, Google TTS, ou instale gTTS)")
+    
+    def _phrase_segments(self, script: dict, provider: str) -> List[str]:
+        """
+        Split a script into reusable phrases and novel runs.
+        
+        Hook and outro sentences are stock phrases ("Você sabia que...",
+        "E você, conhecia esse fato?") and always get their own segment.
+        Body sentences already in the cache are reused; consecutive novel
+        body sentences are sent together to keep natural prosody.
+        """
+        def normalize(text: str) -> str:
+            return " ".join(text.split())
+        
+        segments = self._hook_segments(script['hook'])
+        
+        run = []
+        for sentence in split_sentences(script['body']):
+            sentence = normalize(sentence)
+            if self._load_from_cache(self._get_cache_key(sentence, provider), quiet=True):
+                if run:
+                    segments.append(" ".join(run))
+                    run = []
+                segments.append(sentence)
+            else:
+                run.append(sentence)
+        if run:
+            segments.append(" ".join(run))
+        
+        segments += [normalize(s) for s in split_sentences(script['outro'], min_chars=0)]
+        return [s for s in segments if s]
+    
+    def _hook_segments(self, hook: str) -> List[str]:
+        """Phrase-mode segments of the hook (one per sentence)."""
+        return [" ".join(s.split()) for s in split_sentences(hook, min_chars=0)]
+    
+    def prepare_hook(self, hook: str) -> List[Path]:
+        """
+        Synthesize the hook ahead of the rest of the script.
+        
+        Only in phrase mode with ffmpeg, where generate() reuses the hook sentences
+        from the cache; lets TTS start while the body is still being written.
+        
+        Args:
+            hook: Hook text
+        
+        Returns:
+            Cached segment files (empty if not in phrase mode)
+        """
+        if settings.TTS_CHUNKED or not settings.TTS_PHRASE_CACHE or not self._can_stitch():
+            return []
+        
+        segments = [s for s in self._hook_segments(hook) if s]
+        for provider in self._route(hook, quiet=True):
+            try:
+                return self._synthesize_chunks(provider, segments)
+            except Exception as e:
+                print(f"⚠️ Erro com {provider} (hook): {e}")
+        return []
+    
+    def _can_stitch(self) -> bool:
+        """Whether segments can be assembled (stitching needs ffmpeg)."""
+        return shutil.which('ffmpeg') is not None
+    
+    def _assemble(self, segment_paths: List[Path], output_path: Path) -> Path:
+        """Stitch segments, matching their loudness to the median level."""
+        gains = None
+        if len(segment_paths) > 1:
+            try:
+                levels = [measure_loudness(path) for path in segment_paths]
+                target = sorted(levels)[len(levels) // 2]
+                # Clamp so a near-silent segment isn't blown up
+                gains = [max(-12.0, min(12.0, target - level)) for level in levels]
+            except Exception as e:
+                print(f"   ⚠️  Sem equalização de volume: {e}")
+        
+        return stitch_audio(
+            segment_paths,
+            output_path,
+            gap_ms=settings.TTS_CHUNK_GAP_MS,
+            crossfade_ms=settings.TTS_CHUNK_CROSSFADE_MS,
+            gains_db=gains
+        )
+    
+    def _synthesize_chunks(self, provider: str, sentences: List[str]) -> List[Path]:
+        """Synthesize missing segments in parallel within provider limits."""
+        chunk_paths: List[Optional[Path]] = []
+        missing = []
+        for index, sentence in enumerate(sentences):
+            cache_key = self._get_cache_key(sentence, provider)
+            cached = self._load_from_cache(cache_key, quiet=True)
+            chunk_paths.append(cached)
+            if cached is None:
+                missing.append((index, sentence, cache_key))
+        
+        reused = len(sentences) - len(missing)
+        if reused:
+            print(f"♻️  {reused} trecho(s) reaproveitado(s) do cache")
+        
+        if missing:
+            # Local synthesis is CPU-bound: one engine process per worker
+            limit = settings.LOCAL_TTS_WORKERS if provider == "local" else settings.TTS_MAX_CONCURRENCY
+            workers = min(
+                PROVIDER_CONCURRENCY.get(provider, 1),
+                limit or PROVIDER_CONCURRENCY.get(provider, 1),
+                len(missing)
             )
+            print(f"🔊 {len(missing)} trecho(s) novo(s) com {provider} ({workers} em paralelo)")
+            with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+                futures = {
+                    index: executor.submit(self._synthesize, provider, sentence, cache_key)
+                    for index, sentence, cache_key in missing
+                }
+                for index, future in futures.items():
+                    chunk_paths[index] = future.result()
+        
+        return chunk_paths
+    
+    def stream(self, script: dict) -> Iterator[bytes]:
+        """
+        Stream narration bytes as they arrive from the provider.
+        
+        Audio is written incrementally to the cache file while it is
+        yielded, so the cache ends up identical to generate().
+        
+        Args:
+            script: Script dictionary with hook, body, outro
+        
+        Yields:
+            MP3 byte chunks
+        """
+        full_text = f"{script['hook']} {script['body']} {script['outro']}"
+        
+        for provider in self._route(full_text):
+            cache_key = self._get_cache_key(full_text, provider)
+            cached = self._load_from_cache(cache_key)
+            if cached:
+                yield from self._iter_file(cached)
+                return
             
-            # Save audio
-            output_path = self.cache_dir / f"{cache_key}.mp3"
-            with open(output_path, "wb") as out:
-                out.write(response.audio_content)
-            
-            # Track usage
-            budget.track_google_tts(len(text))
+            ticket = tts_router.acquire(provider)
+            if ticket is None:
+                print(f"⏭️  {provider}: circuito aberto ou em teste")
+                continue
             
-            return output_path
+            started = False
+            start = time.perf_counter()
+            output_path = narration_cache.path_for(cache_key)
+            try:
+                for chunk in self._tee_to_file(self._open_stream(provider, full_text), output_path):
+                    started = True
+                    yield chunk
+            except Exception as e:
+                tts_router.record(provider, False, time.perf_counter() - start, len(full_text), str(e))
+                if started:
+                    # Part of the audio was already delivered; can't switch voices now
+                    raise
+                print(f"⚠️ Erro com {provider} (streaming): {e}")
+                continue
+            finally:
+                # Consumer closed the stream early (GeneratorExit): no outcome to record
+                tts_router.release(provider, ticket)
             
+            tts_router.record(provider, True, time.perf_counter() - start, len(full_text))
+            self._register(cache_key, output_path, provider, full_text)
+            return
+        
+        raise Exception("❌ Nenhum provedor TTS disponível para streaming")
+    
+    async def astream(self, script: dict) -> AsyncIterator[bytes]:
+        """
+        Async byte stream of the narration (see stream()).
+        
+        Synthesis runs in a worker thread; chunks are handed to the event
+        loop as soon as they arrive.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        done = object()
+        
+        def produce():
+            error = None
+            chunks = self.stream(script)
+            try:
+                for chunk in chunks:
+                    if stop.is_set():
+                        break
+                    loop.call_soon_threadsafe(queue.put_nowait, chunk)
+            except BaseException as e:
+                error = e
+            finally:
+                # Stopped early: close now so the provider's probe is released
+                chunks.close()
+            loop.call_soon_threadsafe(queue.put_nowait, (done, error))
+        
+        producer = loop.run_in_executor(None, produce)
+        try:
+            while True:
+                item = await queue.get()
+                if isinstance(item, tuple) and item[0] is done:
+                    if item[1] is not None:
+                        raise item[1]
+                    break
+                yield item
+        finally:
+            stop.set()
+            await producer
+    
+    def _open_stream(self, provider: str, text: str) -> Iterator[bytes]:
+        """Byte iterator for one provider."""
+        if provider == "google":
+            return self._stream_google_tts(text)
+        if provider == "elevenlabs_free":
+            return self._stream_elevenlabs(text, free_tier=True)
+        if provider == "elevenlabs_paid":
+            return self._stream_elevenlabs(text, free_tier=False)
+        if provider == "gtts":
+            return self._stream_gtts(text)
+        if provider == "local":
+            return local_tts.stream(text)
+        raise ValueError(f"Provedor TTS desconhecido: {provider}")
+    
+    def _tee_to_file(self, chunks: Iterator[bytes], output_path: Path) -> Iterator[bytes]:
+        """Write chunks to output_path as they pass through (atomic on completion)."""
+        part_path = output_path.with_name(output_path.name + ".part")
+        try:
+            with open(part_path, "wb") as f:
+                for chunk in chunks:
+                    if not chunk:
+                        continue
+                    f.write(chunk)
+                    f.flush()
+                    yield chunk
+            part_path.replace(output_path)
+        except BaseException:
+            # Incomplete audio must never be picked up by the cache
+            if part_path.exists():
+                part_path.unlink()
+            raise
+    
+    def _write_stream(self, chunks: Iterator[bytes], output_path: Path) -> Path:
+        """Consume a byte stream into output_path."""
+        for _ in self._tee_to_file(chunks, output_path):
+            pass
+        return output_path
+    
+    def _iter_file(self, path: Path) -> Iterator[bytes]:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(STREAM_CHUNK_SIZE), b""):
+                yield chunk
+    
+    def _generate_with_google_tts(self, text: str, cache_key: str) -> Path:
+        """Generate audio using Google Cloud TTS."""
+        print("🔊 Gerando narração com Google TTS...")
+        output_path = narration_cache.path_for(cache_key)
+        return self._write_stream(self._stream_google_tts(text), output_path)
+    
+    def _stream_google_tts(self, text: str) -> Iterator[bytes]:
+        """Google Cloud TTS as a byte stream (response written in chunks)."""
+        try:
+            from google.cloud import texttospeech
         except ImportError:
             raise Exception("google-cloud-texttospeech não instalado. Execute: pip install google-cloud-texttospeech")
+        
+        rate_governor.acquire("google_tts")
+        client = texttospeech.TextToSpeechClient()
+        
+        # Configure voice
+        synthesis_input = texttospeech.SynthesisInput(text=text)
+        voice = texttospeech.VoiceSelectionParams(
+            language_code="pt-BR",
+            name=GOOGLE_VOICE,  # Male voice
+            ssml_gender=texttospeech.SsmlVoiceGender.MALE
+        )
+        audio_config = texttospeech.AudioConfig(
+            audio_encoding=texttospeech.AudioEncoding.MP3,
+            **GOOGLE_AUDIO_SETTINGS
+        )
+        
+        response = client.synthesize_speech(
+            input=synthesis_input,
+            voice=voice,
+            audio_config=audio_config
+        )
+        
+        # Track usage
+        budget.track_google_tts(len(text))
+        
+        audio = response.audio_content
+        for offset in range(0, len(audio), STREAM_CHUNK_SIZE):
+            yield audio[offset:offset + STREAM_CHUNK_SIZE]
     
     def _generate_with_elevenlabs(self, text: str, cache_key: str, free_tier: bool = True) -> Path:
         """Generate audio using ElevenLabs."""
         print(f"🔊 Gerando narração com ElevenLabs ({'free' if free_tier else 'paid'})...")
-        
-        url = f"https://api.elevenlabs.io/v1/text-to-speech/{settings.ELEVENLABS_VOICE_ID}"
+        output_path = narration_cache.path_for(cache_key)
+        return self._write_stream(self._stream_elevenlabs(text, free_tier), output_path)
+    
+    def _stream_elevenlabs(self, text: str, free_tier: bool = True) -> Iterator[bytes]:
+        """ElevenLabs streaming endpoint as a byte stream."""
+        url = f"{settings.ELEVENLABS_API_BASE}/v1/text-to-speech/{settings.ELEVENLABS_VOICE_ID}/stream"
         
         headers = {
             "Accept": "audio/mpeg",
@@ -147,47 +551,53 @@ class VoiceNarrator:
         
         data = {
             "text": text,
-            "model_id": "eleven_multilingual_v2",
-            "voice_settings": {
-                "stability": 0.5,
-                "similarity_boost": 0.75,
-                "style": 0.0,
-                "use_speaker_boost": True
-            }
+            "model_id": ELEVENLABS_MODEL_ID,
+            "voice_settings": ELEVENLABS_VOICE_SETTINGS
         }
         
-        response = requests.post(url, json=data, headers=headers)
+        if free_tier:
+            # Monthly free-tier characters, shared with other processes
+            rate_governor.acquire("elevenlabs_free", len(text))
+        rate_governor.acquire("elevenlabs")
+        response = http_client.post(url, json=data, headers=headers, stream=True)
         
-        if response.status_code != 200:
-            raise Exception(f"ElevenLabs error: {response.text}")
-        
-        # Save audio
-        output_path = self.cache_dir / f"{cache_key}.mp3"
-        with open(output_path, "wb") as f:
-            f.write(response.content)
+        try:
+            if response.status_code != 200:
+                raise Exception(f"ElevenLabs error: {response.text}")
+            
+            for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                yield chunk
+        finally:
+            response.close()
         
         #Track usage
         budget.track_elevenlabs(len(text), is_free_tier=free_tier)
-        
-        return output_path
     
     def _generate_with_gtts(self, text: str, cache_key: str) -> Path:
         """Generate audio using gTTS (fallback, no API key needed)."""
         print("🔊 Gerando narração com gTTS (grátis, sem API)...")
         
+        output_path = narration_cache.path_for(cache_key)
+        self._write_stream(self._stream_gtts(text), output_path)
+        
+        print(f"✅ Narração gerada com gTTS")
+        return output_path
+    
+    def _generate_with_local(self, text: str, cache_key: str) -> Path:
+        """Generate audio with the local engine (offline, no quota)."""
+        print(f"🔊 Gerando narração localmente ({local_tts.engine})...")
+        output_path = narration_cache.path_for(cache_key)
+        return self._write_stream(local_tts.stream(text), output_path)
+    
+    def _stream_gtts(self, text: str) -> Iterator[bytes]:
+        """gTTS as a byte stream (one chunk per text part)."""
         try:
             from gtts import gTTS
-            
-            output_path = self.cache_dir / f"gtts_{cache_key}.mp3"
-            
-            tts = gTTS(text=text, lang='pt', slow=False)
-            tts.save(str(output_path))
-            
-            print(f"✅ Narração gerada com gTTS")
-            return output_path
-            
         except ImportError:
             raise Exception("gTTS não instalado. Execute: pip install gTTS")
+        
+        tts = gTTS(text=text, lang=GTTS_LANG, slow=False)
+        yield from tts.stream()
 
 # Global instance
 voice_narrator = VoiceNarrator()
@@ -0,0 +1,131 @@
+"""
+Teste do streaming de narração ElevenLabs contra um servidor HTTP local.
+Não usa a API real: ELEVENLABS_API_BASE aponta para um http.server que
+imita o endpoint /v1/text-to-speech/{voice}/stream.
+"""
+
+import asyncio
+import json
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config.settings import settings
+
+# Keep caches, budget and router state out of the real data/ directory
+settings.DATA_DIR = Path(tempfile.mkdtemp(prefix="test_elevenlabs_"))
+
+from modules.voice_narrator import voice_narrator
+
+AUDIO_CHUNKS = [b"ID3" + bytes(range(256)) * 8, b"\xff\xfb" * 3000, b"fim-do-audio"]
+
+class FakeElevenLabs(BaseHTTPRequestHandler):
+    """Streams AUDIO_CHUNKS back with a flush between chunks."""
+
+    requests = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        FakeElevenLabs.requests.append({"path": self.path, "headers": dict(self.headers), "body": body})
+
+        if "erro" in body["text"]:
+            payload = b'{"detail": "quota_exceeded"}'
+            self.send_response(401)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/mpeg")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        for chunk in AUDIO_CHUNKS:
+            self.wfile.write(chunk)
+            self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture(scope="module")
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), FakeElevenLabs)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+@pytest.fixture
+def elevenlabs(server, monkeypatch):
+    monkeypatch.setattr(settings, "ELEVENLABS_API_BASE", server)
+    monkeypatch.setattr(settings, "ELEVENLABS_API_KEY", "chave-de-teste")
+    monkeypatch.setattr(settings, "TTS_PROVIDER", ["elevenlabs_paid"])
+    monkeypatch.setattr(settings, "RATE_GOVERNOR_ENABLED", False)
+    FakeElevenLabs.requests.clear()
+    return server
+
+def _script(text: str) -> dict:
+    return {"hook": "Você sabia?", "body": text, "outro": "E você, conhecia?"}
+
+def test_stream_yields_audio_and_caches_it(elevenlabs):
+    """stream() yields the server's bytes and leaves them in the narration cache."""
+    script = _script("O polvo tem três corações e sangue azul.")
+
+    audio = b"".join(voice_narrator.stream(script))
+
+    assert audio == b"".join(AUDIO_CHUNKS)
+    assert len(FakeElevenLabs.requests) == 1
+    request = FakeElevenLabs.requests[0]
+    assert request["path"] == f"/v1/text-to-speech/{settings.ELEVENLABS_VOICE_ID}/stream"
+    assert request["headers"]["xi-api-key"] == "chave-de-teste"
+    assert request["body"]["text"] == f"{script['hook']} {script['body']} {script['outro']}"
+
+    # Second call is served from the cache written while streaming
+    assert b"".join(voice_narrator.stream(script)) == audio
+    assert len(FakeElevenLabs.requests) == 1
+
+def test_astream_yields_same_audio(elevenlabs):
+    """astream() delivers the same bytes through the event loop."""
+    script = _script("Os flamingos são rosa por causa do que comem.")
+
+    async def collect():
+        return b"".join([chunk async for chunk in voice_narrator.astream(script)])
+
+    assert asyncio.run(collect()) == b"".join(AUDIO_CHUNKS)
+    assert len(FakeElevenLabs.requests) == 1
+
+def test_stream_error_leaves_no_partial_cache(elevenlabs):
+    """A rejected request raises and leaves no cache file behind."""
+    script = _script("Este texto provoca um erro no servidor.")
+    full_text = f"{script['hook']} {script['body']} {script['outro']}"
+
+    with pytest.raises(Exception):
+        b"".join(voice_narrator.stream(script))
+
+    cache_key = voice_narrator._get_cache_key(full_text, "elevenlabs_paid")
+    assert voice_narrator._load_from_cache(cache_key, quiet=True) is None
+    assert not list(voice_narrator.cache_dir.glob("*.part"))
+
+def test_closing_stream_releases_half_open_probe(elevenlabs, monkeypatch):
+    """A consumer that stops reading mid-stream must not leave the breaker stuck half-open."""
+    from modules.tts_router import HALF_OPEN, tts_router
+
+    monkeypatch.setattr(settings, "TTS_BREAKER_FAILURES", 1)
+    monkeypatch.setattr(settings, "TTS_BREAKER_COOLDOWN", 0)
+    tts_router.record("elevenlabs_paid", False, 1.0, 10, "falha simulada")
+
+    chunks = voice_narrator.stream(_script("As lulas gigantes têm olhos do tamanho de pratos."))
+    assert next(chunks).startswith(b"ID3")
+    chunks.close()
+
+    assert tts_router._entry("elevenlabs_paid")["state"] == HALF_OPEN
+    assert tts_router.acquire("elevenlabs_paid") is not None
+    tts_router.record("elevenlabs_paid", True, 1.0, 10)
@@ -0,0 +1,68 @@
+"""
+Teste das regras de nova tentativa do cliente HTTP contra um servidor local.
+Um POST só pode ser repetido quando não chegou ao servidor.
+"""
+
+import socket
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+import requests
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config.settings import settings
+from modules.http_client import HTTPClient
+
+class DropAfterRead(BaseHTTPRequestHandler):
+    """Reads the whole request, then closes the connection without answering."""
+
+    attempts = 0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        DropAfterRead.attempts += 1
+        self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server():
+    DropAfterRead.attempts = 0
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), DropAfterRead)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(settings, "HTTP_BACKOFF_BASE", 0.01)
+    client = HTTPClient()
+    yield client
+    client.close()
+
+def test_post_not_retried_after_connection_drop(server, client):
+    """The server may have processed the POST: exactly one attempt, then the error."""
+    with pytest.raises(requests.ConnectionError):
+        client.post(f"{server}/v1/chat", json={"prompt": "oi"}, retries=3)
+
+    assert DropAfterRead.attempts == 1
+
+def test_post_retried_when_connection_refused(client, monkeypatch):
+    """Nothing reached the server, so the POST is attempted again."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    delays = []
+    monkeypatch.setattr(client, "_backoff", lambda attempt: delays.append(attempt) or 0.0)
+
+    with pytest.raises(requests.ConnectionError):
+        client.post(f"http://127.0.0.1:{port}/v1/chat", json={"prompt": "oi"}, retries=2)
+
+    assert delays == [0, 1]
@@ -0,0 +1,197 @@
+"""
+Teste do prefixo de sistema (cache de prompt) e da contabilidade de uso dos LLMs.
+Usa modelos falsos no lugar de llm_clients: nenhuma chamada real é feita.
+"""
+
+import json
+import sys
+import tempfile
+import time
+import types
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config.settings import settings
+
+# Keep caches, budget and router state out of the real data/ directory
+settings.DATA_DIR = Path(tempfile.mkdtemp(prefix="test_llm_usage_"))
+
+from config.prompts import (
+    SCRIPT_SYSTEM_PROMPT, SCRIPT_TASK_PROMPT, BATCH_SCRIPT_FORMAT, BATCH_SCRIPT_SYSTEM_PROMPT
+)
+from modules.budget_controller import budget
+from modules.latency_tracker import latency_tracker
+from modules import script_generator as script_generator_module
+from modules.script_generator import InvalidScript, ScriptGenerator
+from modules.script_store import script_store
+
+SCRIPT = {"hook": "Você sabia?", "body": "O polvo tem três corações.", "outro": "E você, conhecia?"}
+
+class FakeGemini:
+    """Stands in for llm_clients: records (system_instruction, prompt) of every call."""
+
+    def __init__(self, text: str, usage: dict):
+        self.text = text
+        self.usage = usage
+        self.calls = []
+
+    def gemini(self, model_name=None, system_instruction=None):
+        def generate_content(prompt, stream=False):
+            self.calls.append((system_instruction, prompt))
+            return types.SimpleNamespace(text=self.text, usage_metadata=types.SimpleNamespace(**self.usage))
+        return types.SimpleNamespace(generate_content=generate_content)
+
+class FakeOpenAI:
+    """OpenAI client whose chat.completions.create records its kwargs."""
+
+    def __init__(self, text: str, usage: dict):
+        self.requests = []
+        message = types.SimpleNamespace(content=text)
+        self.response = types.SimpleNamespace(
+            choices=[types.SimpleNamespace(message=message)],
+            usage=types.SimpleNamespace(**usage)
+        )
+        self.chat = types.SimpleNamespace(completions=types.SimpleNamespace(create=self._create))
+
+    def _create(self, **request):
+        self.requests.append(request)
+        return self.response
+
+    def openai(self):
+        return self
+
+@pytest.fixture
+def generator(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_GOVERNOR_ENABLED", False)
+    monkeypatch.setattr(settings, "CACHE_AGGRESSIVE", False)
+    monkeypatch.setattr(settings, "SCRIPT_HEDGING", False)
+    monkeypatch.setattr(settings, "GEMINI_API_KEY", "chave-de-teste")
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "chave-de-teste")
+    return ScriptGenerator()
+
+def _usage(provider: str) -> dict:
+    return budget.get_report()["llm_usage"].get(provider, {"calls": 0, "prompt_tokens": 0, "cached_tokens": 0})
+
+def test_track_llm_usage_report():
+    """Calls, tokens, cache ratio and average latency are aggregated per provider."""
+    budget.track_llm_usage("stub", {"prompt": 1000, "cached": 800, "output": 150}, 2.0)
+    budget.track_llm_usage("stub", {"prompt": 1000, "cached": 0, "output": 50}, 1.0)
+
+    usage = budget.get_report()["llm_usage"]["stub"]
+    assert usage["calls"] == 2
+    assert usage["prompt_tokens"] == 2000
+    assert usage["cached_tokens"] == 800
+    assert usage["output_tokens"] == 200
+    assert usage["cache_ratio"] == pytest.approx(0.4)
+    assert usage["avg_seconds"] == pytest.approx(1.5)
+
+def test_gemini_script_uses_static_system_prefix(generator, monkeypatch):
+    """The instructions go as a system instruction identical across topics; only the task varies."""
+    fake = FakeGemini(json.dumps(SCRIPT), {
+        "prompt_token_count": 700, "cached_content_token_count": 600, "candidates_token_count": 120
+    })
+    monkeypatch.setattr(script_generator_module, "llm_clients", fake)
+    monkeypatch.setattr(settings, "SCRIPT_PROVIDER", ["gemini"])
+    before = _usage("gemini")
+
+    generator.generate("Por que polvos têm três corações", 45)
+    generator.generate("Como as abelhas fazem mel", 50)
+
+    assert [system for system, _ in fake.calls] == [SCRIPT_SYSTEM_PROMPT, SCRIPT_SYSTEM_PROMPT]
+    assert fake.calls[0][1] == SCRIPT_TASK_PROMPT.format(duration=45, topic="Por que polvos têm três corações")
+    assert SCRIPT_SYSTEM_PROMPT not in fake.calls[1][1]
+
+    after = _usage("gemini")
+    assert after["calls"] - before["calls"] == 2
+    assert after["prompt_tokens"] - before["prompt_tokens"] == 1400
+    assert after["cached_tokens"] - before["cached_tokens"] == 1200
+
+def test_openai_script_sends_system_message(generator, monkeypatch):
+    """OpenAI gets the prefix as the system message and its cached tokens are recorded."""
+    fake = FakeOpenAI(json.dumps(SCRIPT), {
+        "prompt_tokens": 900, "completion_tokens": 100, "total_tokens": 1000,
+        "prompt_tokens_details": {"cached_tokens": 768}
+    })
+    monkeypatch.setattr(script_generator_module, "llm_clients", fake)
+    monkeypatch.setattr(settings, "SCRIPT_PROVIDER", ["openai"])
+    before = _usage("openai")
+
+    generator.generate("O mistério do Triângulo das Bermudas", 50)
+
+    messages = fake.requests[0]["messages"]
+    assert messages[0] == {"role": "system", "content": SCRIPT_SYSTEM_PROMPT}
+    assert messages[1]["role"] == "user" and SCRIPT_SYSTEM_PROMPT not in messages[1]["content"]
+
+    after = _usage("openai")
+    assert after["calls"] - before["calls"] == 1
+    assert after["cached_tokens"] - before["cached_tokens"] == 768
+
+def test_batch_request_shares_system_prefix(generator, monkeypatch):
+    """Batched requests reuse the single-script prefix; the task holds only the topic list."""
+    batch = {"scripts": [dict(SCRIPT, id=1), dict(SCRIPT, id=2, hook="Prepare-se!")]}
+    fake = FakeGemini(json.dumps(batch), {
+        "prompt_token_count": 900, "cached_content_token_count": 0, "candidates_token_count": 300
+    })
+    monkeypatch.setattr(script_generator_module, "llm_clients", fake)
+    monkeypatch.setattr(settings, "SCRIPT_PROVIDER", ["gemini"])
+
+    scripts = generator.generate_many(["Como os camaleões mudam de cor", "Por que o sal derrete o gelo"], 50)
+
+    assert all(scripts)
+    assert len(fake.calls) == 1
+    system, prompt = fake.calls[0]
+    assert system == BATCH_SCRIPT_SYSTEM_PROMPT
+    assert system.startswith(SCRIPT_SYSTEM_PROMPT) and system.endswith(BATCH_SCRIPT_FORMAT)
+    assert "camaleões" in prompt and SCRIPT_SYSTEM_PROMPT not in prompt
+
+def test_hedge_loser_cost_counts_in_total(generator, monkeypatch):
+    """A paid provider that loses the hedge is abandoned mid-stream; its estimated cost still reaches the total."""
+    def generate_timed(provider, topic, duration, seed=None, on_field=None, cancel=None):
+        if provider == "openai":
+            # Slow primary: only returns once the hedge winner cancels it
+            cancel.wait(5)
+            raise Exception("cancelado")
+        return dict(SCRIPT)
+
+    monkeypatch.setattr(settings, "SCRIPT_HEDGING", True)
+    monkeypatch.setattr(settings, "SCRIPT_PROVIDER", ["openai", "gemini"])
+    monkeypatch.setattr(generator, "_generate_timed", generate_timed)
+    monkeypatch.setattr(latency_tracker, "hedge_delay", lambda provider: 0.05)
+    monkeypatch.setattr(latency_tracker, "record_request", lambda hedged: None)
+    topic = "Por que os gatos ronronam"
+    prompt_chars = len(SCRIPT_SYSTEM_PROMPT) + len(generator._script_prompt(topic, 50))
+    before = budget.costs["total_cost"]
+
+    generator.generate(topic, 50)
+
+    loser_cost = budget.llm_request_cost("openai", prompt_chars)
+    assert loser_cost > 0
+    assert budget.costs["total_cost"] - before == pytest.approx(loser_cost)
+    assert budget.costs["hedging"]["providers"]["openai"] >= loser_cost
+
+def test_hedge_failures_recorded_against_their_provider(generator, monkeypatch):
+    """Only invalid scripts back off a topic, and against the provider that returned them."""
+    def slow_openai(topic, duration, seed=None, on_field=None):
+        time.sleep(0.2)
+        # e.g. a malformed streaming line: a transport problem, not a bad script
+        raise ValueError("Expecting value: line 1 column 1 (char 0)")
+
+    def invalid_gemini(topic, duration, seed=None, on_field=None):
+        raise InvalidScript("Roteiro inválido: campo 'hook' ausente")
+
+    monkeypatch.setattr(settings, "SCRIPT_HEDGING", True)
+    monkeypatch.setattr(settings, "SCRIPT_PROVIDER", ["openai", "gemini"])
+    monkeypatch.setattr(generator, "_generate_with_openai", slow_openai)
+    monkeypatch.setattr(generator, "_generate_with_gemini", invalid_gemini)
+    monkeypatch.setattr(latency_tracker, "hedge_delay", lambda provider: 0.05)
+    monkeypatch.setattr(latency_tracker, "record_request", lambda hedged: None)
+    topic = "Como os morcegos enxergam no escuro"
+
+    with pytest.raises(Exception, match="Nenhum provedor"):
+        generator.generate(topic, 50)
+
+    assert script_store.failure_backoff(topic, "gemini") > 0
+    assert script_store.failure_backoff(topic, "openai") == 0